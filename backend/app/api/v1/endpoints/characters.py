@@ -195,6 +195,7 @@ async def generate_main_characters(
     context = await context_service.build_project_context(
         project_id=request.project_id,
         user_id=current_user.id,
+        sections={"project", "characters"},
     )
 
     project_info = context.get("project", {})
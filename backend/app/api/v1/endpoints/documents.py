@@ -562,18 +562,14 @@ async def update_document(
                 chapter_index = int(raw_chapter_index) if raw_chapter_index is not None else None
             except (TypeError, ValueError):
                 chapter_index = None
-            memory_service.update_neo4j(
+            await memory_service.persist_facts(
                 facts,
                 project_id=str(document.project_id),
+                chapter_id=str(document.id),
+                chapter_text=document.content or "",
+                summary=facts.get("summary") or metadata.get("summary"),
                 chapter_index=chapter_index,
             )
-            summary = facts.get("summary") or metadata.get("summary")
-            memory_service.store_style_memory(
-                str(document.project_id),
-                str(document.id),
-                document.content or "",
-                summary,
-            )
         except Exception as exc:
             update_errors.append(f"memory_update_failed: {exc}")
             logger.exception("Memory update failed for document %s", document.id)
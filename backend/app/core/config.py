@@ -222,6 +222,12 @@ class Settings(BaseSettings):
     # Coherence Settings - Phase 4: Features Avancées
     SEMANTIC_VALIDATOR_ENABLED: bool = Field(default=True)
     SEMANTIC_CONFLICT_THRESHOLD: float = Field(default=0.8)
+    # Int8 ONNX encoder; the first use exports the model into the cache dir,
+    # so enable it only after running the export once (see README)
+    SEMANTIC_ONNX_ENABLED: bool = Field(default=False)
+    SEMANTIC_ONNX_CACHE_DIR: str = Field(default="./onnx_models")
+    # Worker processes for large encode batches (0 or 1 encodes in-process)
+    SEMANTIC_ENCODE_WORKERS: int = Field(default=0)
 
     FACT_PROMOTION_THRESHOLD: int = Field(default=3)
     FACT_PROMOTION_SCHEDULE_HOURS: int = Field(default=24)
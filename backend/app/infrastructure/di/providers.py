@@ -4,7 +4,7 @@ from __future__ import annotations
 from app.infrastructure.di.container import Container
 from app.infrastructure.di.scopes import Scope
 from app.core.config import settings
-from app.services.llm_client import DeepSeekClient
+from app.services.llm_client import DeepSeekClient, get_llm_client
 from app.services.memory_service import MemoryService
 from app.services.rag_service import RagService
 from app.services.cache_service import CacheService
@@ -19,7 +19,7 @@ def configure_container(container: Container) -> None:
     """Configure application dependencies."""
 
     # Infrastructure services
-    container.register(DeepSeekClient, lambda c: DeepSeekClient(), Scope.SINGLETON)
+    container.register(DeepSeekClient, lambda c: get_llm_client(), Scope.SINGLETON)
     container.register(CacheService, lambda c: CacheService(), Scope.SINGLETON)
     container.register(RagService, lambda c: RagService(), Scope.SINGLETON)
 
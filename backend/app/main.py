@@ -3,6 +3,7 @@ NovellaForge - Serial Fiction Studio
 Main FastAPI Application
 """
 from contextlib import asynccontextmanager
+import asyncio
 import warnings
 from fastapi import FastAPI, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -20,6 +21,8 @@ from app.db.session import engine
 from app.db.base import Base
 from app.infrastructure.di.providers import get_configured_container
 from app.infrastructure.di.container import Container
+from app.services.llm_client import close_http_clients
+from app.services.memory_service import close_graph_clients, warm_token_encoding
 from app.infrastructure.observability import (
     ObservabilityMiddleware,
     PROMETHEUS_AVAILABLE,
@@ -78,6 +81,8 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created")
 
+    await asyncio.to_thread(warm_token_encoding)
+
     if settings.RAG_PRELOAD_MODELS:
         try:
             from app.services.rag_service import RagService
@@ -90,6 +95,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await close_http_clients()
+    await close_graph_clients()
     Container.reset()
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
 
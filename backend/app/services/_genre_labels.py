@@ -0,0 +1,29 @@
+"""French display labels for project genre codes."""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Mapping
+
+GENRE_LABELS: Mapping[str, str] = MappingProxyType({
+    "werewolf": "loup-garou",
+    "billionaire": "milliardaire",
+    "mafia": "mafia",
+    "fantasy": "fantasy",
+    "vengeance": "vengeance",
+    "romance": "romance",
+    "thriller": "thriller",
+    "fiction": "fiction",
+    "scifi": "science-fiction",
+    "mystery": "mystere",
+    "horror": "horreur",
+    "historical": "historique",
+    "other": "autre",
+})
+
+_UNDERSCORES_TO_SPACES = str.maketrans("_", " ")
+
+
+def genre_label(key: str) -> str:
+    """Return the label for a genre code, spelling unknown codes with spaces."""
+    label = GENRE_LABELS.get(key)
+    return label if label is not None else key.translate(_UNDERSCORES_TO_SPACES)
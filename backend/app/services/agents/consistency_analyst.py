@@ -22,8 +22,7 @@ class ConsistencyAnalyst(BaseAgent):
         if not context:
             return []
 
-        metadata = context.get("metadata") or context.get("project", {}).get("metadata") or {}
-        story_bible = metadata.get("story_bible") or {}
+        story_bible = context.get("story_bible") or {}
         return story_bible.get("intentional_mysteries", [])
 
     def _matches_mystery(
@@ -312,9 +311,11 @@ class ConsistencyAnalyst(BaseAgent):
 
         if context:
             if not memory_context:
-                metadata = context.get("project", {}).get("metadata")
-                if isinstance(metadata, dict):
-                    memory_context = self.memory_service.build_context_block(metadata)
+                continuity = context.get("project", {}).get("continuity")
+                if isinstance(continuity, dict):
+                    memory_context = self.memory_service.build_context_block(
+                        {"continuity": continuity}
+                    )
             if not story_bible:
                 bible = context.get("story_bible")
                 if isinstance(bible, dict):
@@ -362,9 +363,9 @@ class ConsistencyAnalyst(BaseAgent):
                 if isinstance(bible, dict):
                     story_bible = bible
             if not continuity_memory:
-                metadata = context.get("project", {}).get("metadata")
-                if isinstance(metadata, dict):
-                    continuity_memory = metadata.get("continuity") or {}
+                continuity = context.get("project", {}).get("continuity")
+                if isinstance(continuity, dict):
+                    continuity_memory = continuity
 
         return all_chapters, story_bible, continuity_memory
 
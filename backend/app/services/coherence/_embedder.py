@@ -0,0 +1,244 @@
+"""Shared sentence encoder and cached, length-sorted encoding helpers."""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+from app.core.config import settings
+from app.services.coherence._onnx_encoder import ONNX_AVAILABLE, OnnxSentenceEncoder
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None  # type: ignore[assignment,misc]
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    torch = None  # type: ignore[assignment]
+    TORCH_AVAILABLE = False
+
+# Model used by both the semantic validator and the voice analyzer
+DEFAULT_EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# Intra-op threads for CPU inference; more mostly adds contention
+_TORCH_MAX_THREADS = 8
+
+# Loaded models are shared process-wide; loading one costs seconds and ~400MB
+_MODEL_CACHE: Dict[str, Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_NAMES: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+# Below this many texts, a single in-process call beats shipping to workers
+_PARALLEL_MIN_TEXTS = 256
+_ENCODE_POOL: Optional[ProcessPoolExecutor] = None
+_ENCODE_POOL_LOCK = threading.Lock()
+# Set in encode workers so model loading keeps inference on one thread
+_SINGLE_THREADED = False
+
+
+def _get_encode_pool(workers: int) -> ProcessPoolExecutor:
+    global _ENCODE_POOL
+    with _ENCODE_POOL_LOCK:
+        if _ENCODE_POOL is None:
+            # spawn: forking a process with live torch thread pools can deadlock
+            _ENCODE_POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_encode_worker,
+            )
+            atexit.register(_ENCODE_POOL.shutdown, wait=False, cancel_futures=True)
+        return _ENCODE_POOL
+
+
+def _init_encode_worker() -> None:
+    # Workers split the CPUs between them; one thread each avoids oversubscription
+    global _SINGLE_THREADED
+    _SINGLE_THREADED = True
+    if TORCH_AVAILABLE:
+        torch.set_num_threads(1)
+
+
+def _encode_in_worker(model_name: str, texts: List[str], batch_size: int) -> np.ndarray:
+    model = get_shared_embedder(model_name)
+    with _inference_mode():
+        return np.asarray(model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ))
+
+
+def _encode_parallel(
+    model_name: str,
+    texts: List[str],
+    batch_size: int,
+    workers: int,
+) -> np.ndarray:
+    """Encode contiguous slices of length-sorted texts across worker processes."""
+    pool = _get_encode_pool(workers)
+    bounds = np.linspace(0, len(texts), workers + 1, dtype=int)
+    futures = [
+        pool.submit(_encode_in_worker, model_name, texts[start:end], batch_size)
+        for start, end in zip(bounds[:-1], bounds[1:])
+        if end > start
+    ]
+    return np.concatenate([future.result() for future in futures])
+
+
+# Per-model LRU of text digest -> normalized embedding, dropped with the model
+_EMBEDDING_CACHE_SIZE = 4096
+_EMBEDDING_CACHES: "weakref.WeakKeyDictionary[Any, LRUCache]" = weakref.WeakKeyDictionary()
+
+
+def get_shared_embedder(model_name: str) -> Any:
+    """
+    Return the process-wide sentence encoder for ``model_name``.
+
+    Prefers the int8 ONNX Runtime encoder when optimum is installed and
+    enabled, and falls back to the PyTorch sentence transformer.
+
+    Raises:
+        RuntimeError: If no encoder backend is installed.
+    """
+    model = _MODEL_CACHE.get(model_name)
+    if model is not None:
+        return model
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_name)
+        if model is None:
+            model = _load_model(model_name)
+            _MODEL_CACHE[model_name] = model
+            _MODEL_NAMES[model] = model_name
+    return model
+
+
+def _load_model(model_name: str) -> Any:
+    if settings.SEMANTIC_ONNX_ENABLED and ONNX_AVAILABLE:
+        try:
+            model = OnnxSentenceEncoder(
+                model_name,
+                settings.SEMANTIC_ONNX_CACHE_DIR,
+                intra_op_num_threads=1 if _SINGLE_THREADED else None,
+            )
+            logger.info(f"Loaded int8 ONNX sentence encoder: {model_name}")
+            return model
+        except Exception as e:
+            logger.warning(f"ONNX encoder unavailable, using PyTorch: {e}")
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        raise RuntimeError("sentence-transformers not installed")
+    if not _SINGLE_THREADED:
+        _configure_torch()
+    model = SentenceTransformer(model_name)
+    model.eval()
+    if torch.cuda.is_available():
+        model.half()
+    logger.info(f"Loaded sentence transformer model: {model_name}")
+    return model
+
+
+def _configure_torch() -> None:
+    """Size torch thread pools to the CPUs this process may actually use."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    torch.set_num_threads(min(_TORCH_MAX_THREADS, cpus))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first inter-op parallel work
+        pass
+
+
+def _inference_mode() -> Any:
+    if TORCH_AVAILABLE:
+        return torch.inference_mode()
+    return contextlib.nullcontext()
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def encode_cached(model: Any, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """
+    Encode texts like ``encode_sorted``, reusing embeddings of texts seen before.
+
+    Established facts and validated dialogues are re-sent on every chapter, so
+    only texts missing from the model's LRU cache reach the encoder.
+    """
+    cache = _EMBEDDING_CACHES.get(model)
+    if cache is None:
+        cache = LRUCache(maxsize=_EMBEDDING_CACHE_SIZE)
+        _EMBEDDING_CACHES[model] = cache
+
+    keys = [_text_key(text) for text in texts]
+    found: Dict[bytes, np.ndarray] = {}
+    missing: Dict[bytes, str] = {}
+    for key, text in zip(keys, texts):
+        if key in found or key in missing:
+            continue
+        vector = cache.get(key)
+        if vector is None:
+            missing[key] = text
+        else:
+            found[key] = vector
+
+    if missing:
+        vectors = encode_sorted(model, list(missing.values()), batch_size=batch_size)
+        for key, vector in zip(missing, vectors):
+            found[key] = vector
+            cache[key] = vector
+
+    return np.stack([found[key] for key in keys])
+
+
+def encode_sorted(model: Any, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """
+    Encode texts in length-homogeneous batches and restore the input order.
+
+    Batches are padded to their longest member, so grouping texts of similar
+    length keeps short dialogues from paying for long facts.
+
+    Args:
+        model: Sentence encoder exposing ``encode``.
+        texts: Texts to embed.
+        batch_size: Encoder batch size.
+
+    Returns:
+        Array of L2-normalized embeddings aligned with ``texts``.
+    """
+    order = np.argsort([len(text) for text in texts], kind="stable")
+    sorted_texts = [texts[i] for i in order]
+
+    model_name = _MODEL_NAMES.get(model)
+    workers = settings.SEMANTIC_ENCODE_WORKERS
+    if model_name and workers > 1 and len(texts) >= _PARALLEL_MIN_TEXTS:
+        embeddings = _encode_parallel(model_name, sorted_texts, batch_size, workers)
+    else:
+        with _inference_mode():
+            embeddings = model.encode(
+                sorted_texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+    return np.asarray(embeddings)[np.argsort(order)]
@@ -0,0 +1,131 @@
+"""Int8-quantized ONNX Runtime sentence encoder for the coherence analyzers."""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+_QUANTIZED_FILE = "model_quantized.onnx"
+_MAX_SEQ_LENGTH = 128
+
+
+class OnnxSentenceEncoder:
+    """
+    Mean-pooling sentence encoder running an int8 ONNX export on CPU.
+
+    Exposes the subset of ``SentenceTransformer.encode`` used by the
+    coherence analyzers. The export and dynamic quantization run once and
+    are kept under ``cache_dir``.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        intra_op_num_threads: Optional[int] = None,
+    ) -> None:
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("optimum[onnxruntime] not installed")
+
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        quantized_dir = Path(cache_dir) / model_id.replace("/", "__")
+
+        if not (quantized_dir / _QUANTIZED_FILE).exists():
+            _export_quantized(model_id, quantized_dir)
+
+        session_options = onnxruntime.SessionOptions()
+        if intra_op_num_threads:
+            session_options.intra_op_num_threads = intra_op_num_threads
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            quantized_dir,
+            file_name=_QUANTIZED_FILE,
+            provider="CPUExecutionProvider",
+            session_options=session_options,
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """Embed texts as mean-pooled token embeddings."""
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=_MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            outputs = self.model(**inputs)
+            batches.append(self._mean_pool(
+                np.asarray(outputs.last_hidden_state), inputs["attention_mask"]
+            ))
+
+        embeddings = np.concatenate(batches) if batches else np.zeros((0, 0), np.float32)
+        if normalize_embeddings and len(embeddings):
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True).clip(min=1e-12)
+        return embeddings
+
+    @staticmethod
+    def _mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings.astype(np.float32) * mask).sum(axis=1)
+        return summed / mask.sum(axis=1).clip(min=1e-9)
+
+
+def _export_quantized(model_id: str, quantized_dir: Path) -> None:
+    """
+    Export and quantize ``model_id`` into ``quantized_dir`` atomically.
+
+    The export is built in a temporary sibling directory and moved into place
+    only once the tokenizer is saved, so a crashed or concurrent export never
+    leaves a half-written model behind.
+    """
+    logger.info(f"Exporting {model_id} to int8 ONNX in {quantized_dir}")
+    quantized_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(
+        prefix=f".{quantized_dir.name}-", dir=quantized_dir.parent
+    ))
+    try:
+        exported = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+        quantizer = ORTQuantizer.from_pretrained(exported)
+        quantizer.quantize(
+            save_dir=staging_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(
+                is_static=False, per_channel=False
+            ),
+        )
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(staging_dir)
+
+        if quantized_dir.exists() and not (quantized_dir / _QUANTIZED_FILE).exists():
+            # Leftover from an export written in place before this was atomic
+            shutil.rmtree(quantized_dir, ignore_errors=True)
+        try:
+            os.replace(staging_dir, quantized_dir)
+        except OSError:
+            # Another worker finished its export first; keep that one
+            if not (quantized_dir / _QUANTIZED_FILE).exists():
+                raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
@@ -0,0 +1,95 @@
+"""Vector similarity helpers shared by the coherence analyzers."""
+from __future__ import annotations
+
+import numpy as np
+
+# SimSIMD dispatches to AVX-512/AVX2/NEON kernels; NumPy is the fallback.
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    simsimd = None  # type: ignore[assignment]
+    SIMSIMD_AVAILABLE = False
+
+
+def cosine_similarity_matrix(
+    left: np.ndarray,
+    right: np.ndarray,
+    normalized: bool = False,
+) -> np.ndarray:
+    """
+    Compute pairwise cosine similarities between two sets of embeddings.
+
+    Args:
+        left: Array of shape (K, D).
+        right: Array of shape (N, D).
+        normalized: True when both inputs are already L2-normalized, in which
+            case cosine reduces to a single matrix product.
+
+    Returns:
+        Array of shape (K, N) with cosine similarities.
+    """
+    left = np.ascontiguousarray(np.atleast_2d(left), dtype=np.float32)
+    right = np.ascontiguousarray(np.atleast_2d(right), dtype=np.float32)
+
+    if normalized:
+        return left @ right.T
+
+    if SIMSIMD_AVAILABLE:
+        distances = np.asarray(simsimd.cdist(left, right, metric="cosine"))
+        return 1.0 - distances
+
+    # One GEMM, then scale rows/columns in place by squared norms from einsum
+    # rather than materializing normalized copies of both inputs
+    sims = left @ right.T
+    sims /= np.sqrt(np.einsum("ij,ij->i", left, left) + 1e-12)[:, None]
+    sims /= np.sqrt(np.einsum("ij,ij->i", right, right) + 1e-12)[None, :]
+    return sims
+
+
+# Unit vectors scaled to int8; the margin absorbs the rounding error of the
+# approximate int8 dot so pairs near the threshold still get an exact score
+_INT8_SCALE = 127.0
+_INT8_MARGIN = 0.05
+# Below this many pairs the exact float32 product is already cheap
+_INT8_MIN_PAIRS = 16384
+
+
+def quantize_int8(embeddings: np.ndarray) -> np.ndarray:
+    """Scalar-quantize L2-normalized embeddings to int8."""
+    scaled = np.rint(np.asarray(embeddings, dtype=np.float32) * _INT8_SCALE)
+    return np.clip(scaled, -_INT8_SCALE, _INT8_SCALE).astype(np.int8)
+
+
+def thresholded_similarity_matrix(
+    left: np.ndarray,
+    right: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """
+    Cosine similarities of L2-normalized embeddings, exact above ``threshold``.
+
+    Large matrices are first scored with an int8 dot product; only pairs
+    within a margin of the threshold are recomputed in float32. Entries of
+    the remaining pairs are approximate and below the threshold.
+
+    Args:
+        left: Normalized array of shape (K, D).
+        right: Normalized array of shape (N, D).
+        threshold: Similarity the caller filters on.
+
+    Returns:
+        Array of shape (K, N).
+    """
+    left = np.ascontiguousarray(np.atleast_2d(left), dtype=np.float32)
+    right = np.ascontiguousarray(np.atleast_2d(right), dtype=np.float32)
+    if not SIMSIMD_AVAILABLE or left.shape[0] * right.shape[0] < _INT8_MIN_PAIRS:
+        return left @ right.T
+
+    approx = np.asarray(
+        simsimd.cdist(quantize_int8(left), quantize_int8(right), metric="dot"),
+        dtype=np.float32,
+    ) / (_INT8_SCALE * _INT8_SCALE)
+    rows, cols = np.nonzero(approx >= threshold - _INT8_MARGIN)
+    approx[rows, cols] = np.einsum("ij,ij->i", left[rows], right[cols])
+    return approx
@@ -1,12 +1,13 @@
 """POV Validator - Validate point of view consistency."""
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 from app.core.config import settings
-from app.services.llm_client import DeepSeekClient
+from app.services.llm_client import DeepSeekClient, get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ class POVValidator:
     }
 
     def __init__(self, llm_client: Optional[DeepSeekClient] = None) -> None:
-        self.llm_client = llm_client or DeepSeekClient()
+        self.llm_client = llm_client or get_llm_client()
         self.enabled = settings.POV_VALIDATOR_ENABLED
         self.default_type = settings.POV_DEFAULT_TYPE
 
@@ -119,14 +120,15 @@ Retourne JSON :
             temperature=0.2,
             max_tokens=1200,
             response_format={"type": "json_object"},
+            top_p=0.9,
         )
 
         try:
-            result = json.loads(response)
+            result = orjson.loads(response)
             result["pov_character"] = pov_character
             result["pov_type"] = pov_type
             return result
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error("Failed to parse POV validation response")
             return {
                 "pov_character": pov_character,
@@ -173,13 +175,14 @@ Retourne JSON :
         response = await self.llm_client.chat(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
-            max_tokens=300,
+            max_tokens=150,
             response_format={"type": "json_object"},
+            top_p=0.9,
         )
 
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
             return {
                 "pov_type": "unknown",
                 "pov_character": None,
@@ -6,15 +6,32 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from cachetools import TTLCache
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.document import Document, DocumentType
-from app.services.llm_client import DeepSeekClient
+from app.models.project import Project
+from app.services.llm_client import DeepSeekClient, get_llm_client
 
 logger = logging.getLogger(__name__)
 
+# Chapters shorter than this are used verbatim as their own summary.
+SHORT_CHAPTER_CHARS = 400
+SHORT_CHAPTER_SUMMARY_CHARS = 300
+# Rough French word-to-token ratio used to derive output caps from word targets.
+TOKENS_PER_WORD = 1.5
+
+# (project_id, chapter_index) -> {"index", "title", "summary"} for summarized chapters.
+_CHAPTER_SUMMARY_CACHE: "TTLCache[tuple, Dict[str, Any]]" = TTLCache(maxsize=4096, ttl=600)
+
+
+def invalidate_chapter_summaries(project_id: UUID) -> None:
+    """Drop cached chapter summaries for a project after its chapters change."""
+    for key in [key for key in list(_CHAPTER_SUMMARY_CACHE.keys()) if key[0] == project_id]:
+        _CHAPTER_SUMMARY_CACHE.pop(key, None)
+
 
 class RecursiveMemory:
     """
@@ -31,7 +48,7 @@ class RecursiveMemory:
         llm_client: Optional[DeepSeekClient] = None,
     ) -> None:
         self.db = db
-        self.llm_client = llm_client or DeepSeekClient()
+        self.llm_client = llm_client or get_llm_client()
 
         # Configuration
         self.recent_chapters_count = settings.RECURSIVE_MEMORY_RECENT_CHAPTERS
@@ -186,6 +203,13 @@ class RecursiveMemory:
         # Query documents for recent chapters
         start_index = max(1, chapter_index - self.recent_chapters_count)
 
+        cached = [
+            _CHAPTER_SUMMARY_CACHE.get((project_id, index))
+            for index in range(start_index, chapter_index)
+        ]
+        if cached and all(cached):
+            return [dict(entry) for entry in cached]
+
         result = await self.db.execute(
             select(Document).where(
                 Document.project_id == project_id,
@@ -207,11 +231,13 @@ class RecursiveMemory:
                 await self._store_chapter_summary(project_id, doc.order_index, summary)
 
             if summary:
-                summaries.append({
+                entry = {
                     "index": doc.order_index,
                     "title": doc.title,
                     "summary": summary,
-                })
+                }
+                _CHAPTER_SUMMARY_CACHE[(project_id, doc.order_index)] = entry
+                summaries.append(dict(entry))
 
         return summaries
 
@@ -236,6 +262,12 @@ class RecursiveMemory:
             metadata["summary"] = summary
             doc.document_metadata = metadata
             await self.db.commit()
+            if summary:
+                _CHAPTER_SUMMARY_CACHE[(project_id, chapter_index)] = {
+                    "index": chapter_index,
+                    "title": doc.title,
+                    "summary": summary,
+                }
 
     async def _should_update_arc_summary(
         self,
@@ -354,6 +386,9 @@ class RecursiveMemory:
 
     async def _generate_chapter_summary(self, chapter_text: str) -> str:
         """Generate a summary for a chapter."""
+        if len(chapter_text) < SHORT_CHAPTER_CHARS:
+            return chapter_text.strip()[:SHORT_CHAPTER_SUMMARY_CHARS]
+
         prompt = f"""Résume ce chapitre en 2-3 phrases, en capturant :
 - Les événements principaux
 - Les évolutions des personnages
@@ -367,7 +402,8 @@ Résumé (2-3 phrases) :"""
         response = await self.llm_client.chat(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
-            max_tokens=200,
+            max_tokens=120,
+            stop=["\n\n\n"],
         )
         return response.strip()
 
@@ -378,9 +414,12 @@ Résumé (2-3 phrases) :"""
         chapter_summaries: List[str],
     ) -> str:
         """Generate a summary for a narrative arc."""
+        if len(chapter_summaries) < 2:
+            return " ".join(chapter_summaries)
+
         chapters_text = "\n".join(chapter_summaries)
 
-        prompt = f"""Résume cet arc narratif en environ {self.arc_summary_words} mots.
+        prompt = f"""Résume cet arc narratif de façon concise.
 
 Titre de l'arc : {arc_title}
 Émotion cible : {arc_target_emotion}
@@ -393,7 +432,7 @@ Résumé de l'arc (capture la progression narrative, les conflits, les résoluti
         response = await self.llm_client.chat(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.4,
-            max_tokens=800,
+            max_tokens=int(self.arc_summary_words * TOKENS_PER_WORD),
         )
         return response.strip()
 
@@ -405,7 +444,7 @@ Résumé de l'arc (capture la progression narrative, les conflits, les résoluti
         """Generate global synopsis from arc summaries."""
         arcs_text = "\n\n".join([f"Arc {i+1}: {s}" for i, s in enumerate(arc_summaries)])
 
-        prompt = f"""Génère un synopsis global du roman en environ {self.global_synopsis_words} mots.
+        prompt = f"""Génère un synopsis global et concis du roman.
 
 Prémisse : {premise}
 
@@ -417,14 +456,12 @@ Synopsis global (couvre l'intrigue principale, les personnages clés, les thème
         response = await self.llm_client.chat(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.4,
-            max_tokens=1500,
+            max_tokens=int(self.global_synopsis_words * TOKENS_PER_WORD),
         )
         return response.strip()
 
     async def _fetch_project_metadata(self, project_id: UUID) -> Dict[str, Any]:
         """Fetch project metadata from database."""
-        from app.models.project import Project
-
         result = await self.db.execute(
             select(Project).where(Project.id == project_id)
         )
@@ -441,8 +478,6 @@ Synopsis global (couvre l'intrigue principale, les personnages clés, les thème
         summary: str,
     ) -> None:
         """Store arc summary in project metadata."""
-        from app.models.project import Project
-
         result = await self.db.execute(
             select(Project).where(Project.id == project_id)
         )
@@ -465,8 +500,6 @@ Synopsis global (couvre l'intrigue principale, les personnages clés, les thème
         synopsis: str,
     ) -> None:
         """Store global synopsis in project metadata."""
-        from app.models.project import Project
-
         result = await self.db.execute(
             select(Project).where(Project.id == project_id)
         )
@@ -8,16 +8,77 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from app.core.config import settings
+from app.services.coherence._embedder import (
+    DEFAULT_EMBEDDING_MODEL,
+    SENTENCE_TRANSFORMERS_AVAILABLE,
+    encode_cached,
+    get_shared_embedder,
+)
+from app.services.coherence._similarity import thresholded_similarity_matrix
 
 logger = logging.getLogger(__name__)
 
-# Try to import sentence-transformers
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
+    logger.warning("sentence-transformers not installed. Semantic validation disabled.")
+
+# Aho-Corasick scans a fact once for every contradiction token
 try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    logger.warning("sentence-transformers not installed. Semantic validation disabled.")
+    ahocorasick = None  # type: ignore[assignment]
+    AHOCORASICK_AVAILABLE = False
+
+_SENTENCE_RE = re.compile(r'[^.!?]{10,}')
+
+# Likely factual statement: a proper noun not at sentence start, a being/state
+# verb, or a frequency adverb. One alternation means one scan per sentence.
+_FACT_MARKER_RE = re.compile(
+    r'(?<!^)\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+'
+    r'|(?i:\b(?:est|était|sont|étaient|a|avait|possède|déteste|aime)\b)'
+    r'|(?i:\b(?:toujours|jamais|souvent|parfois)\b)'
+)
+
+# Capitalized words, taken as the subjects a fact talks about
+_PROPER_NOUN_RE = re.compile(r'\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+\b')
+
+# Default contradiction patterns (French)
+_DEFAULT_CONTRADICTION_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("vivant", "mort"),
+    ("aime", "déteste"),
+    ("ami", "ennemi"),
+    ("présent", "absent"),
+    ("possède", "a perdu"),
+    ("connaît", "ignore"),
+    ("jeune", "vieux"),
+    ("riche", "pauvre"),
+    ("grand", "petit"),
+    ("fort", "faible"),
+    ("marié", "célibataire"),
+    ("innocent", "coupable"),
+    ("confiance", "méfiance"),
+    ("ouvert", "fermé"),
+    ("jour", "nuit"),
+)
+
+# Bits 2*i and 2*i + 1 flag the two sides of contradiction pattern i
+_AUTOMATON_CACHE: Dict[Tuple[Tuple[str, str], ...], Any] = {}
+
+
+def _get_automaton(patterns: Tuple[Tuple[str, str], ...]) -> Any:
+    """Build (once per pattern set) an automaton mapping tokens to their bits."""
+    automaton = _AUTOMATON_CACHE.get(patterns)
+    if automaton is None:
+        bits: Dict[str, int] = {}
+        for i, pair in enumerate(patterns):
+            for side, token in enumerate(pair):
+                bits[token] = bits.get(token, 0) | 1 << (2 * i + side)
+        automaton = ahocorasick.Automaton()
+        for token, value in bits.items():
+            automaton.add_word(token, value)
+        automaton.make_automaton()
+        _AUTOMATON_CACHE[patterns] = automaton
+    return automaton
 
 
 class SemanticValidator:
@@ -28,7 +89,7 @@ class SemanticValidator:
     incompatible, which LLM analysis might miss.
     """
 
-    def __init__(self, model_name: str = "paraphrase-multilingual-MiniLM-L12-v2") -> None:
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL) -> None:
         """
         Initialize the semantic validator.
 
@@ -45,8 +106,7 @@ class SemanticValidator:
 
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.model = SentenceTransformer(model_name)
-                logger.info(f"Loaded sentence transformer model: {model_name}")
+                self.model = get_shared_embedder(model_name)
             except Exception as e:
                 logger.error(f"Failed to load sentence transformer: {e}")
 
@@ -60,28 +120,15 @@ class SemanticValidator:
         Returns:
             List of factual statements.
         """
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-
-        facts = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 10:
-                continue
-
-            # Filter for likely factual statements
-            # (contains names, descriptions, states, actions)
-            if any([
-                # Contains a proper noun (capitalized word not at start)
-                re.search(r'(?<!^)\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+', sentence),
-                # Contains "est" or "était" (being verbs in French)
-                re.search(r'\b(est|était|sont|étaient|a|avait|possède|déteste|aime)\b', sentence, re.I),
-                # Contains descriptive patterns
-                re.search(r'\b(toujours|jamais|souvent|parfois)\b', sentence, re.I),
-            ]):
-                facts.append(sentence)
-
-        return facts
+        # Sentences of at least 10 characters; shorter ones never reach Python
+        sentences = (match.group().strip() for match in _SENTENCE_RE.finditer(text))
+
+        # Keep likely factual statements (names, descriptions, states, actions)
+        return [
+            sentence
+            for sentence in sentences
+            if len(sentence) >= 10 and _FACT_MARKER_RE.search(sentence)
+        ]
 
     def embed(self, texts: List[str]) -> Optional[np.ndarray]:
         """
@@ -91,55 +138,17 @@ class SemanticValidator:
             texts: List of texts to embed.
 
         Returns:
-            Numpy array of embeddings or None if model not available.
+            Numpy array of L2-normalized embeddings or None if model not available.
         """
         if not self.model or not texts:
             return None
 
         try:
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
-            return embeddings
+            return encode_cached(self.model, texts)
         except Exception as e:
             logger.error(f"Embedding error: {e}")
             return None
 
-    def find_similar_facts(
-        self,
-        new_fact: str,
-        new_embedding: np.ndarray,
-        established_facts: List[str],
-        established_embeddings: np.ndarray,
-        threshold: float = 0.7,
-    ) -> List[Tuple[str, float]]:
-        """
-        Find established facts similar to a new fact.
-
-        Args:
-            new_fact: The new fact to compare.
-            new_embedding: Embedding of the new fact.
-            established_facts: List of established facts.
-            established_embeddings: Embeddings of established facts.
-            threshold: Minimum similarity threshold.
-
-        Returns:
-            List of (fact, similarity_score) tuples.
-        """
-        if established_embeddings is None or len(established_embeddings) == 0:
-            return []
-
-        # Compute cosine similarities
-        similarities = self._cosine_similarity(new_embedding, established_embeddings)
-
-        # Find facts above threshold
-        similar = []
-        for i, sim in enumerate(similarities):
-            if sim >= threshold:
-                similar.append((established_facts[i], float(sim)))
-
-        # Sort by similarity descending
-        similar.sort(key=lambda x: x[1], reverse=True)
-        return similar
-
     def detect_contradictions(
         self,
         new_facts: List[str],
@@ -169,86 +178,80 @@ class SemanticValidator:
         if similarity_threshold is None:
             similarity_threshold = settings.SEMANTIC_CONFLICT_THRESHOLD
 
-        # Default contradiction patterns (French)
         if contradiction_patterns is None:
-            contradiction_patterns = [
-                ("vivant", "mort"),
-                ("aime", "déteste"),
-                ("ami", "ennemi"),
-                ("présent", "absent"),
-                ("possède", "a perdu"),
-                ("connaît", "ignore"),
-                ("jeune", "vieux"),
-                ("riche", "pauvre"),
-                ("grand", "petit"),
-                ("fort", "faible"),
-                ("marié", "célibataire"),
-                ("innocent", "coupable"),
-                ("confiance", "méfiance"),
-                ("ouvert", "fermé"),
-                ("jour", "nuit"),
-            ]
-
-        # Embed all facts
-        new_embeddings = self.embed(new_facts)
-        established_embeddings = self.embed(established_facts)
-
-        if new_embeddings is None or established_embeddings is None:
+            patterns = _DEFAULT_CONTRADICTION_PATTERNS
+        else:
+            patterns = tuple(tuple(pair) for pair in contradiction_patterns)
+
+        # One pattern scan per fact, then opposed patterns for all pairs at once
+        pattern_hits = self._pattern_hit_matrix(
+            self._pattern_masks(new_facts, patterns),
+            self._pattern_masks(established_facts, patterns),
+            patterns,
+        )
+
+        # Without a shared subject or an opposed pattern no pair can be flagged,
+        # so skip the forward pass altogether
+        new_subjects = set(_PROPER_NOUN_RE.findall(" ".join(new_facts)))
+        established_subjects = set(_PROPER_NOUN_RE.findall(" ".join(established_facts)))
+        if new_subjects.isdisjoint(established_subjects) and not pattern_hits.any():
             return []
 
-        contradictions = []
+        # Embed all facts in a single forward pass
+        embeddings = self.embed(new_facts + established_facts)
 
-        for i, new_fact in enumerate(new_facts):
-            new_emb = new_embeddings[i:i+1]
+        if embeddings is None:
+            return []
 
-            # Find similar established facts
-            similar = self.find_similar_facts(
-                new_fact, new_emb, established_facts, established_embeddings,
-                threshold=similarity_threshold
-            )
+        new_embeddings = embeddings[:len(new_facts)]
+        established_embeddings = embeddings[len(new_facts):]
 
-            for est_fact, similarity in similar:
-                # Check for contradiction patterns
-                is_contradiction, pattern = self._check_contradiction_patterns(
-                    new_fact, est_fact, contradiction_patterns
-                )
+        contradictions = []
 
-                if is_contradiction:
+        # One similarity matrix for all (new, established) pairs
+        similarities = thresholded_similarity_matrix(
+            new_embeddings, established_embeddings, similarity_threshold
+        )
+
+        # Per new fact, related established facts by decreasing similarity
+        candidates = []
+        for i, row in enumerate(similarities):
+            related = np.flatnonzero(row >= similarity_threshold)
+            for j in related[np.argsort(-row[related], kind="stable")]:
+                candidates.append((i, j, float(row[j])))
+
+        for i, j, similarity in candidates:
+            new_fact = new_facts[i]
+            est_fact = established_facts[j]
+
+            # Check for contradiction patterns
+            pattern = self._first_pattern(int(pattern_hits[i, j]), patterns)
+
+            if pattern is not None:
+                contradictions.append({
+                    "new_fact": new_fact,
+                    "established_fact": est_fact,
+                    "similarity_score": similarity,
+                    "contradiction_type": "pattern_match",
+                    "pattern": pattern,
+                    "confidence": min(0.95, similarity + 0.1),
+                    "severity": "high",
+                })
+            elif similarity > 0.85:
+                # Very high similarity but different - might be contradiction
+                if self._facts_differ(new_fact, est_fact):
                     contradictions.append({
                         "new_fact": new_fact,
                         "established_fact": est_fact,
                         "similarity_score": similarity,
-                        "contradiction_type": "pattern_match",
-                        "pattern": pattern,
-                        "confidence": min(0.95, similarity + 0.1),
-                        "severity": "high",
+                        "contradiction_type": "semantic_conflict",
+                        "pattern": None,
+                        "confidence": similarity * 0.7,
+                        "severity": "medium",
                     })
-                elif similarity > 0.85:
-                    # Very high similarity but different - might be contradiction
-                    if self._facts_differ(new_fact, est_fact):
-                        contradictions.append({
-                            "new_fact": new_fact,
-                            "established_fact": est_fact,
-                            "similarity_score": similarity,
-                            "contradiction_type": "semantic_conflict",
-                            "pattern": None,
-                            "confidence": similarity * 0.7,
-                            "severity": "medium",
-                        })
 
         return contradictions
 
-    def _cosine_similarity(
-        self, embedding: np.ndarray, embeddings: np.ndarray
-    ) -> np.ndarray:
-        """Compute cosine similarity between one embedding and many."""
-        # Normalize
-        embedding = embedding / np.linalg.norm(embedding, axis=-1, keepdims=True)
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=-1, keepdims=True)
-
-        # Compute similarity
-        return np.dot(embedding, embeddings.T).flatten()
-
     def _check_contradiction_patterns(
         self,
         fact1: str,
@@ -256,25 +259,76 @@ class SemanticValidator:
         patterns: List[Tuple[str, str]],
     ) -> Tuple[bool, Optional[Tuple[str, str]]]:
         """Check if two facts contain contradictory patterns."""
-        f1_lower = fact1.lower()
-        f2_lower = fact2.lower()
+        patterns = tuple(tuple(pair) for pair in patterns)
+        mask1, mask2 = self._pattern_masks([fact1, fact2], patterns)
+        hits = self._pattern_hit_matrix([mask1], [mask2], patterns)
+        pattern = self._first_pattern(int(hits[0, 0]), patterns)
+        return pattern is not None, pattern
 
-        for p1, p2 in patterns:
-            # Check if one fact has p1 and other has p2
-            if (p1 in f1_lower and p2 in f2_lower) or (p2 in f1_lower and p1 in f2_lower):
-                return True, (p1, p2)
+    def _pattern_masks(
+        self,
+        facts: List[str],
+        patterns: Tuple[Tuple[str, str], ...],
+    ) -> List[int]:
+        """Compute, for each fact, the bitmask of pattern tokens it contains."""
+        masks = []
+        if AHOCORASICK_AVAILABLE:
+            automaton = _get_automaton(patterns)
+            for fact in facts:
+                mask = 0
+                for _, bits in automaton.iter(fact.lower()):
+                    mask |= bits
+                masks.append(mask)
+            return masks
+
+        for fact in facts:
+            lower = fact.lower()
+            mask = 0
+            for i, pair in enumerate(patterns):
+                for side, token in enumerate(pair):
+                    if token in lower:
+                        mask |= 1 << (2 * i + side)
+            masks.append(mask)
+        return masks
+
+    def _pattern_hit_matrix(
+        self,
+        masks1: List[int],
+        masks2: List[int],
+        patterns: Tuple[Tuple[str, str], ...],
+    ) -> np.ndarray:
+        """
+        Compute, for every pair of facts, the bits of patterns they oppose.
 
-        return False, None
+        Bit 2*i is set when pattern i has one side in each fact. Masks fit in
+        uint64 for up to 32 patterns; larger sets fall back to Python ints.
+        """
+        # Keep only even bits: side 0 of pattern i in one fact, side 1 in the other
+        even: Any = int("01" * len(patterns), 2) if patterns else 0
+        one: Any = 1
+        dtype: Any = object
+        if len(patterns) <= 32:
+            dtype, one, even = np.uint64, np.uint64(1), np.uint64(even)
+        left = np.array(masks1, dtype=dtype)[:, None]
+        right = np.array(masks2, dtype=dtype)[None, :]
+        return ((left & (right >> one)) | ((left >> one) & right)) & even
+
+    def _first_pattern(
+        self,
+        hits: int,
+        patterns: Tuple[Tuple[str, str], ...],
+    ) -> Optional[Tuple[str, str]]:
+        """Return the first pattern, in list order, flagged in ``hits``."""
+        if not hits:
+            return None
+        return patterns[((hits & -hits).bit_length() - 1) // 2]
 
     def _facts_differ(self, fact1: str, fact2: str) -> bool:
         """Check if two similar facts say different things."""
         # Extract potential subjects (capitalized words)
-        subjects1 = set(re.findall(r'\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+\b', fact1))
-        subjects2 = set(re.findall(r'\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+\b', fact2))
-
-        common_subjects = subjects1 & subjects2
+        subjects1 = set(_PROPER_NOUN_RE.findall(fact1))
 
-        if not common_subjects:
+        if subjects1.isdisjoint(_PROPER_NOUN_RE.findall(fact2)):
             return False
 
         # If they share subjects but aren't nearly identical, they might conflict
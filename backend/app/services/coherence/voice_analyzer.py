@@ -3,23 +3,44 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from app.core.config import settings
+from app.services.coherence._embedder import (
+    DEFAULT_EMBEDDING_MODEL,
+    SENTENCE_TRANSFORMERS_AVAILABLE,
+    encode_cached,
+    get_shared_embedder,
+)
+from app.services.coherence._similarity import cosine_similarity_matrix
 from app.services.memory_service import MemoryService
 
 logger = logging.getLogger(__name__)
 
-# Try to import sentence-transformers
-try:
-    from sentence_transformers import SentenceTransformer
-    EMBEDDINGS_AVAILABLE = True
-except ImportError:
-    EMBEDDINGS_AVAILABLE = False
+EMBEDDINGS_AVAILABLE = SENTENCE_TRANSFORMERS_AVAILABLE
+if not EMBEDDINGS_AVAILABLE:
     logger.warning("sentence-transformers not installed. Voice analysis limited.")
 
+# Dialogue markers: "text", « text », — text, - Text
+_DIALOGUE_PATTERNS = (
+    re.compile(r'"([^"]+)"'),
+    re.compile(r'«\s*([^»]+)\s*»'),
+    re.compile(r'—\s*([^—\n]+)'),
+    re.compile(r'-\s+([A-Z][^-\n]+)'),
+)
+
+# Speaker named just before a dialogue (French speech verbs)
+_SPEAKER_RE = re.compile(
+    r'(\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+)\s+(?:dit|demanda|répondit|murmura|cria|chuchota'
+    r'|expliqua|ajouta|déclara|s\'exclama|protesta|affirma)'
+)
+
+# Words of four letters or more, punctuation and digits excluded
+_LONG_WORD_RE = re.compile(r'\b[^\W\d_]{4,}\b')
+
 
 class VoiceConsistencyAnalyzer:
     """
@@ -29,7 +50,7 @@ class VoiceConsistencyAnalyzer:
 
     def __init__(
         self,
-        model_name: str = "paraphrase-multilingual-MiniLM-L12-v2",
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
         memory_service: Optional[MemoryService] = None,
     ) -> None:
         self.memory_service = memory_service or MemoryService()
@@ -44,8 +65,8 @@ class VoiceConsistencyAnalyzer:
 
         if EMBEDDINGS_AVAILABLE:
             try:
-                self.model = SentenceTransformer(model_name)
-                logger.info(f"Voice analyzer loaded model: {model_name}")
+                self.model = get_shared_embedder(model_name)
+                logger.info(f"Voice analyzer using model: {model_name}")
             except Exception as e:
                 logger.error(f"Failed to load model: {e}")
 
@@ -53,7 +74,7 @@ class VoiceConsistencyAnalyzer:
         self,
         text: str,
         character_name: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[List[str], List[Optional[str]], np.ndarray]:
         """
         Extract dialogues from text, optionally filtering by character.
 
@@ -62,23 +83,15 @@ class VoiceConsistencyAnalyzer:
             character_name: Optional character to filter for.
 
         Returns:
-            List of dialogue entries with speaker and content.
+            Parallel (dialogues, speakers, positions) sequences.
         """
-        dialogues = []
-
-        # Pattern for dialogues: "text" or « text » or — text
-        patterns = [
-            r'"([^"]+)"',  # "dialogue"
-            r'«\s*([^»]+)\s*»',  # « dialogue »
-            r'—\s*([^—\n]+)',  # — dialogue
-            r'-\s+([A-Z][^-\n]+)',  # - Dialogue starting with capital
-        ]
-
-        # Pattern to detect speaker before dialogue (French verbs)
-        speaker_pattern = r'(\b[A-Z][a-zàâäéèêëïîôùûüÿœæç]+)\s+(?:dit|demanda|répondit|murmura|cria|chuchota|expliqua|ajouta|déclara|s\'exclama|protesta|affirma)'
+        dialogues: List[str] = []
+        speakers: List[Optional[str]] = []
+        positions: List[int] = []
+        character_lower = character_name.lower() if character_name else None
 
-        for pattern in patterns:
-            for match in re.finditer(pattern, text):
+        for pattern in _DIALOGUE_PATTERNS:
+            for match in pattern.finditer(text):
                 dialogue = match.group(1).strip()
                 if len(dialogue) < 5:
                     continue
@@ -88,28 +101,28 @@ class VoiceConsistencyAnalyzer:
                 context_start = max(0, match.start() - 100)
                 context = text[context_start:match.start()]
 
-                speaker_match = re.search(speaker_pattern, context)
+                speaker_match = _SPEAKER_RE.search(context)
                 if speaker_match:
                     speaker = speaker_match.group(1)
 
                 # Filter by character if specified
-                if character_name and speaker:
-                    if speaker.lower() != character_name.lower():
-                        continue
+                if character_lower and speaker and speaker.lower() != character_lower:
+                    continue
 
-                dialogues.append({
-                    "speaker": speaker,
-                    "dialogue": dialogue,
-                    "position": match.start(),
-                })
+                dialogues.append(dialogue)
+                speakers.append(speaker)
+                positions.append(match.start())
 
-        return dialogues
+        return dialogues, speakers, np.array(positions, dtype=np.int64)
 
     async def analyze_voice_consistency(
         self,
         character_name: str,
         new_dialogues: List[str],
         project_id: str,
+        validated_dialogues: Optional[List[str]] = None,
+        new_embeddings: Optional[np.ndarray] = None,
+        validated_embeddings: Optional[np.ndarray] = None,
     ) -> Dict[str, Any]:
         """
         Analyze voice consistency for a character.
@@ -118,6 +131,9 @@ class VoiceConsistencyAnalyzer:
             character_name: Name of the character.
             new_dialogues: New dialogues to analyze.
             project_id: Project identifier.
+            validated_dialogues: Pre-fetched reference dialogues (fetched if None).
+            new_embeddings: Pre-computed embeddings of new_dialogues.
+            validated_embeddings: Pre-computed embeddings of validated_dialogues.
 
         Returns:
             Voice consistency analysis.
@@ -138,12 +154,11 @@ class VoiceConsistencyAnalyzer:
                 "reason": "No model or dialogues available",
             }
 
-        # Retrieve validated dialogues from ChromaDB
-        validated_dialogues = self.memory_service.retrieve_style_memory(
-            project_id=project_id,
-            query=f"dialogues de {character_name}",
-            top_k=20,
-        )
+        # Retrieve validated dialogues (and stored embeddings) from ChromaDB
+        if validated_dialogues is None:
+            validated_dialogues, validated_embeddings = self._retrieve_references(
+                project_id, character_name
+            )
 
         if not validated_dialogues or len(validated_dialogues) < self.min_dialogues:
             return {
@@ -153,29 +168,30 @@ class VoiceConsistencyAnalyzer:
                 "reason": "Insufficient historical dialogues",
             }
 
-        # Embed dialogues
-        new_embeddings = self.model.encode(new_dialogues, convert_to_numpy=True)
-        validated_embeddings = self.model.encode(validated_dialogues, convert_to_numpy=True)
-
-        # Compute average similarity
-        similarities = []
-        outliers = []
-
-        for i, new_emb in enumerate(new_embeddings):
-            # Compute cosine similarity with all validated
-            sims = self._cosine_similarity(new_emb, validated_embeddings)
-            avg_sim = float(np.mean(sims))
-            max_sim = float(np.max(sims))
-
-            similarities.append(avg_sim)
-
-            # Flag outliers
-            if avg_sim < self.threshold:
-                outliers.append({
-                    "dialogue": new_dialogues[i],
-                    "avg_similarity": avg_sim,
-                    "max_similarity": max_sim,
-                })
+        # Embed whatever is missing in a single forward pass
+        if new_embeddings is None and validated_embeddings is None:
+            embeddings = self._encode(new_dialogues + validated_dialogues)
+            new_embeddings = embeddings[:len(new_dialogues)]
+            validated_embeddings = embeddings[len(new_dialogues):]
+        elif new_embeddings is None:
+            new_embeddings = self._encode(new_dialogues)
+        if validated_embeddings is None or validated_embeddings.shape[-1] != new_embeddings.shape[-1]:
+            validated_embeddings = self._encode(validated_dialogues)
+
+        # Cosine similarity of every new dialogue against all validated ones
+        sims = cosine_similarity_matrix(new_embeddings, validated_embeddings, normalized=True)
+        avg_sims = sims.mean(axis=1)
+        max_sims = sims.max(axis=1)
+
+        similarities = [float(avg_sim) for avg_sim in avg_sims]
+        outliers = [
+            {
+                "dialogue": new_dialogues[i],
+                "avg_similarity": float(avg_sims[i]),
+                "max_similarity": float(max_sims[i]),
+            }
+            for i in np.flatnonzero(avg_sims < self.threshold)
+        ]
 
         overall_score = float(np.mean(similarities))
         drift_detected = overall_score < self.threshold
@@ -213,24 +229,85 @@ class VoiceConsistencyAnalyzer:
 
         results = {}
 
+        # Extract once, then keep per character its own and unattributed lines
+        dialogues, speakers, _ = self.extract_dialogues(chapter_text)
+        speakers_lower = [speaker.lower() if speaker else None for speaker in speakers]
+        chapter_dialogues: Dict[str, List[str]] = {}
         for character in known_characters:
-            dialogues = self.extract_dialogues(chapter_text, character)
-
-            if not dialogues:
+            character_lower = character.lower()
+            selected = [
+                dialogue
+                for dialogue, speaker in zip(dialogues, speakers_lower)
+                if speaker is None or speaker == character_lower
+            ]
+            if selected:
+                chapter_dialogues[character] = selected
+
+        if not chapter_dialogues:
+            return results
+
+        references: Dict[str, Tuple[List[str], Optional[np.ndarray]]] = {}
+        if self.model:
+            # One Chroma round trip for every character of the chapter
+            characters = list(chapter_dialogues)
+            references = dict(zip(
+                characters,
+                self.memory_service.retrieve_style_embeddings_batch(
+                    project_id=project_id,
+                    queries=[f"dialogues de {character}" for character in characters],
+                    top_k=20,
+                ),
+            ))
+
+        # Encode every new dialogue, and every reference dialogue without a
+        # stored embedding, in one call
+        texts: List[str] = []
+        spans: Dict[str, Tuple[int, int, int]] = {}
+        for character, dialogues in chapter_dialogues.items():
+            reference, stored = references.get(character, ([], None))
+            if len(reference) < self.min_dialogues:
                 continue
-
-            dialogue_texts = [d["dialogue"] for d in dialogues]
-
-            analysis = await self.analyze_voice_consistency(
+            start = len(texts)
+            texts.extend(dialogues)
+            if stored is None:
+                texts.extend(reference)
+            spans[character] = (start, start + len(dialogues), len(texts))
+        embeddings = self._encode(texts) if texts else None
+
+        for character, dialogues in chapter_dialogues.items():
+            reference, stored = references.get(character, (None, None))
+            new_embeddings, validated_embeddings = None, stored
+            if embeddings is not None and character in spans:
+                start, middle, end = spans[character]
+                new_embeddings = embeddings[start:middle]
+                if stored is None:
+                    validated_embeddings = embeddings[middle:end]
+
+            results[character] = await self.analyze_voice_consistency(
                 character_name=character,
-                new_dialogues=dialogue_texts,
+                new_dialogues=dialogues,
                 project_id=project_id,
+                validated_dialogues=reference,
+                new_embeddings=new_embeddings,
+                validated_embeddings=validated_embeddings,
             )
 
-            results[character] = analysis
-
         return results
 
+    def _retrieve_references(
+        self, project_id: str, character_name: str
+    ) -> Tuple[List[str], Optional[np.ndarray]]:
+        """Fetch reference dialogues and their stored embeddings for a character."""
+        return self.memory_service.retrieve_style_embeddings(
+            project_id=project_id,
+            query=f"dialogues de {character_name}",
+            top_k=20,
+        )
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as L2-normalized vectors, reusing cached embeddings."""
+        return encode_cached(self.model, texts)
+
     def store_validated_dialogues(
         self,
         character_name: str,
@@ -250,28 +327,27 @@ class VoiceConsistencyAnalyzer:
         if not dialogues:
             return
 
-        for dialogue in dialogues:
-            self.memory_service.store_style_memory(
-                project_id=project_id,
-                content=dialogue,
-                metadata={
-                    "type": "dialogue",
-                    "character": character_name,
-                    "chapter_index": chapter_index,
-                    "validated": True,
-                },
-            )
-
-    def _cosine_similarity(
-        self, embedding: np.ndarray, embeddings: np.ndarray
-    ) -> np.ndarray:
-        """Compute cosine similarity between one embedding and many."""
-        # Normalize
-        embedding = embedding / np.linalg.norm(embedding)
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=-1, keepdims=True)
-
-        # Compute similarity
-        return np.dot(embeddings, embedding)
+        # Store unit-normalized embeddings so later analyses skip re-encoding
+        embeddings = self._encode(dialogues) if self.model else None
+
+        self.memory_service.store_style_memory_batch(
+            project_id,
+            [
+                {
+                    "chapter_id": f"dialogue-{chapter_index}-{character_name}-{i}",
+                    "chapter_text": dialogue,
+                    "summary": None,
+                    "metadata": {
+                        "type": "dialogue",
+                        "character": character_name,
+                        "chapter_index": chapter_index,
+                        "validated": True,
+                    },
+                    "embedding": embeddings[i] if embeddings is not None else None,
+                }
+                for i, dialogue in enumerate(dialogues)
+            ],
+        )
 
     def analyze_dialogue_patterns(
         self,
@@ -290,21 +366,16 @@ class VoiceConsistencyAnalyzer:
             return {}
 
         # Compute basic statistics
-        lengths = [len(d.split()) for d in dialogues]
-        avg_length = np.mean(lengths)
+        lengths = np.fromiter((len(d.split()) for d in dialogues), dtype=np.int32, count=len(dialogues))
+        avg_length = lengths.mean()
 
         # Count punctuation patterns
-        question_count = sum(1 for d in dialogues if "?" in d)
-        exclamation_count = sum(1 for d in dialogues if "!" in d)
-
-        # Count common words
-        all_words = " ".join(dialogues).lower().split()
-        word_freq = {}
-        for word in all_words:
-            if len(word) > 3:  # Skip short words
-                word_freq[word] = word_freq.get(word, 0) + 1
+        question_count = sum("?" in d for d in dialogues)
+        exclamation_count = sum("!" in d for d in dialogues)
 
-        top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Count common words, skipping short ones inside the regex engine
+        word_freq = Counter(_LONG_WORD_RE.findall(" ".join(dialogues).lower()))
+        top_words = word_freq.most_common(10)
 
         return {
             "total_dialogues": len(dialogues),
@@ -1,9 +1,14 @@
 """Project context builder for writing and agents."""
-from typing import Dict, Any, List, Optional
+from io import StringIO
+from operator import attrgetter
+from typing import AbstractSet, Dict, Any, Iterable, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+import orjson
+from cachetools import TTLCache
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from app.models.project import Project
@@ -11,6 +16,29 @@ from app.models.document import Document
 from app.models.character import Character
 
 
+# Raw project metadata keys still exposed under "project.metadata"; everything
+# else is already returned as an explicit field of the context
+_CONTEXT_METADATA_KEYS = ("chapter_word_range", "pregenerated_plans", "tracked_contradictions")
+
+# Sections a caller can request; "project" (with metadata, constraints, story
+# bible and instructions) is always built
+CONTEXT_SECTIONS = frozenset({"project", "documents", "characters"})
+
+# Serialized contexts keyed on (project, user, preview size, sections, version probe)
+_PROJECT_CONTEXT_CACHE: TTLCache = TTLCache(maxsize=256, ttl=60)
+
+
+def _child_stat(aggregate: Any, project_column: Any) -> Any:
+    """Correlated scalar subquery aggregating a child table of the project."""
+    return select(aggregate).where(project_column == Project.id).scalar_subquery()
+
+
+def _normalize_sections(sections: Optional[AbstractSet[str]]) -> frozenset:
+    if not sections:
+        return CONTEXT_SECTIONS
+    return frozenset(sections) | {"project"}
+
+
 class ProjectContextService:
     """Build a structured context pack from project data."""
 
@@ -22,10 +50,85 @@ class ProjectContextService:
         project_id: UUID,
         user_id: UUID,
         document_preview_chars: int = 800,
+        sections: Optional[AbstractSet[str]] = None,
     ) -> Dict[str, Any]:
-        """Collect project, characters, documents, and constraints."""
+        """
+        Collect project, characters, documents, and constraints.
+
+        Callers that only need part of the context pass ``sections``; the
+        documents and characters left out are neither loaded nor serialized
+        and come back as empty lists.
+        """
+        sections = _normalize_sections(sections)
+        cache_key = await self._context_cache_key(
+            project_id, user_id, document_preview_chars, sections
+        )
+        cached = _PROJECT_CONTEXT_CACHE.get(cache_key)
+        if cached is not None:
+            # Each caller gets its own copy to mutate
+            return orjson.loads(cached)
+
+        context = await self._load_project_context(
+            project_id, user_id, document_preview_chars, sections
+        )
+        try:
+            _PROJECT_CONTEXT_CACHE[cache_key] = orjson.dumps(context)
+        except TypeError:
+            pass
+        return context
+
+    async def _context_cache_key(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        document_preview_chars: int,
+        sections: frozenset,
+    ) -> tuple:
+        # Cheap version probe: any write to the project, its documents or its
+        # characters changes one of these values and so the cache key
+        version_result = await self.db.execute(
+            select(
+                Project.updated_at,
+                _child_stat(func.count(Document.id), Document.project_id),
+                _child_stat(func.max(Document.updated_at), Document.project_id),
+                _child_stat(func.count(Character.id), Character.project_id),
+                _child_stat(func.max(Character.updated_at), Character.project_id),
+            ).where(
+                Project.id == project_id,
+                Project.owner_id == user_id,
+            )
+        )
+        version = version_result.one_or_none()
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found or access denied",
+            )
+        return (
+            str(project_id),
+            str(user_id),
+            document_preview_chars,
+            tuple(sorted(sections)),
+            tuple(version),
+        )
+
+    async def _load_project_context(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        document_preview_chars: int,
+        sections: frozenset,
+    ) -> Dict[str, Any]:
+        # Requested documents and characters are eager-loaded by the same execute call
+        loaders = []
+        if "documents" in sections:
+            loaders.append(selectinload(Project.documents))
+        if "characters" in sections:
+            loaders.append(selectinload(Project.characters))
         project_result = await self.db.execute(
-            select(Project).where(
+            select(Project)
+            .options(*loaders)
+            .where(
                 Project.id == project_id,
                 Project.owner_id == user_id,
             )
@@ -37,44 +140,40 @@ class ProjectContextService:
                 detail="Project not found or access denied",
             )
 
-        documents_result = await self.db.execute(
-            select(Document).where(Document.project_id == project_id).order_by(Document.order_index.asc())
+        documents = (
+            sorted(project.documents, key=attrgetter("order_index"))
+            if "documents" in sections
+            else []
         )
-        documents = documents_result.scalars().all()
+        characters = project.characters if "characters" in sections else []
 
-        characters_result = await self.db.execute(
-            select(Character).where(Character.project_id == project_id)
-        )
-        characters = characters_result.scalars().all()
+        raw_metadata = project.project_metadata
+        project_metadata: Dict[str, Any] = raw_metadata if isinstance(raw_metadata, dict) else {}
 
-        project_metadata = project.project_metadata or {}
         concept = None
+        concept_entry = project_metadata.get("concept")
+        if isinstance(concept_entry, dict):
+            concept = concept_entry.get("data") or (
+                concept_entry
+                if any(key in concept_entry for key in ("premise", "tone", "tropes", "emotional_orientation"))
+                else None
+            )
         plan = None
-        continuity: Dict[str, Any] = {}
-        recent_chapter_summaries: List[str] = []
-        story_bible: Dict[str, Any] = {}
-        if isinstance(project_metadata, dict):
-            concept_entry = project_metadata.get("concept")
-            plan_entry = project_metadata.get("plan")
-            if isinstance(concept_entry, dict):
-                concept = concept_entry.get("data") or (
-                    concept_entry
-                    if any(key in concept_entry for key in ("premise", "tone", "tropes", "emotional_orientation"))
-                    else None
-                )
-            if isinstance(plan_entry, dict):
-                plan = plan_entry.get("data") if isinstance(plan_entry.get("data"), dict) else (
-                    plan_entry
-                    if any(key in plan_entry for key in ("chapters", "arcs", "global_summary"))
-                    else None
-                )
-            continuity = project_metadata.get("continuity") or {}
-            recent_chapter_summaries = project_metadata.get("recent_chapter_summaries") or []
-            story_bible = project_metadata.get("story_bible") or {}
-            if not isinstance(story_bible, dict):
-                story_bible = {}
-        constraints = project_metadata.get("constraints") if isinstance(project_metadata, dict) else None
-        instructions_raw = project_metadata.get("instructions") if isinstance(project_metadata, dict) else None
+        plan_entry = project_metadata.get("plan")
+        if isinstance(plan_entry, dict):
+            plan_data = plan_entry.get("data")
+            plan = plan_data if isinstance(plan_data, dict) else (
+                plan_entry
+                if any(key in plan_entry for key in ("chapters", "arcs", "global_summary"))
+                else None
+            )
+        continuity = project_metadata.get("continuity") or {}
+        recent_chapter_summaries = project_metadata.get("recent_chapter_summaries") or []
+        story_bible = project_metadata.get("story_bible")
+        if not isinstance(story_bible, dict):
+            story_bible = {}
+        constraints = project_metadata.get("constraints")
+        instructions_raw = project_metadata.get("instructions")
         instructions = []
         if isinstance(instructions_raw, list):
             for item in instructions_raw:
@@ -107,7 +206,11 @@ class ProjectContextService:
                 "plan": plan,
                 "continuity": continuity,
                 "recent_chapter_summaries": recent_chapter_summaries,
-                "metadata": project_metadata,
+                "metadata": {
+                    key: project_metadata[key]
+                    for key in _CONTEXT_METADATA_KEYS
+                    if key in project_metadata
+                },
             },
             "constraints": constraints or {},
             "instructions": instructions,
@@ -147,7 +250,7 @@ class SmartContextTruncator:
         memory: Dict[str, Any],
         max_chars: int = 4000,
         current_chapter: int = 0,
-        mentioned_characters: Optional[List[str]] = None
+        mentioned_characters: Optional[Iterable[str]] = None
     ) -> str:
         """
         Prioritize:
@@ -156,14 +259,21 @@ class SmartContextTruncator:
         3. Active relations
         4. Unresolved threads
         """
+        characters = memory.get('characters') or []
+        events = memory.get('events') or []
+        relations = memory.get('relations') or []
+        if not (characters or events or relations):
+            return ""
+
         sections = []
         char_budget = max_chars
+        mentioned = frozenset(mentioned_characters or ())
 
         # 1. Mentioned characters (high priority)
-        if mentioned_characters:
+        if mentioned:
             priority_chars = [
-                c for c in memory.get('characters', [])
-                if isinstance(c, dict) and c.get('name') in mentioned_characters
+                c for c in characters
+                if isinstance(c, dict) and c.get('name') in mentioned
             ]
             char_section = SmartContextTruncator._format_characters(priority_chars)
             if char_section:
@@ -172,7 +282,7 @@ class SmartContextTruncator:
 
         # 2. Recent events (last 5 chapters)
         recent_events = [
-            e for e in memory.get('events', [])
+            e for e in events
             if isinstance(e, dict) and int(e.get('chapter_index', 0) or 0) >= current_chapter - 5
         ]
         events_section = SmartContextTruncator._format_events(recent_events)
@@ -180,15 +290,13 @@ class SmartContextTruncator:
             sections.append(("EVENEMENTS RECENTS", events_section[:max(500, char_budget // 3)]))
 
         # 3. Active relations
-        relations_section = SmartContextTruncator._format_relations(
-            memory.get('relations', [])
-        )
+        relations_section = SmartContextTruncator._format_relations(relations)
         if relations_section:
             sections.append(("RELATIONS", relations_section[:max(500, char_budget // 4)]))
 
         # 4. Unresolved threads
         unresolved = [
-            e for e in memory.get('events', [])
+            e for e in events
             if isinstance(e, dict) and e.get('unresolved_threads')
         ]
         if unresolved:
@@ -237,19 +345,27 @@ class SmartContextTruncator:
 
     @staticmethod
     def _build_output(sections: List[tuple], max_chars: int) -> str:
-        output = []
+        output = StringIO()
         remaining = max_chars
+        separator = ""
 
         for title, content in sections:
             if not content or remaining <= 0:
                 continue
-            section_text = f"### {title}\n{content}\n"
-            if len(section_text) <= remaining:
-                output.append(section_text)
-                remaining -= len(section_text)
+            output.write(separator)
+            separator = "\n"
+            # "### " + title + "\n" + content + "\n"
+            section_len = len(title) + len(content) + 6
+            if section_len <= remaining:
+                output.write("### ")
+                output.write(title)
+                output.write("\n")
+                output.write(content)
+                output.write("\n")
+                remaining -= section_len
             else:
-                truncated = section_text[:remaining-3] + "..."
-                output.append(truncated)
+                # Only the section that overflows is materialized and cut
+                output.write(f"### {title}\n{content}\n"[:remaining-3] + "...")
                 break
 
-        return "\n".join(output)
+        return output.getvalue()
@@ -8,6 +8,7 @@ from fastapi import HTTPException, status
 from app.models.document import Document, DocumentType
 from app.models.project import Project
 from app.schemas.document import DocumentCreate, DocumentUpdate
+from app.services.coherence.recursive_memory import invalidate_chapter_summaries
 
 
 class DocumentService:
@@ -234,6 +235,7 @@ class DocumentService:
 
         await self.db.commit()
         await self.db.refresh(document)
+        invalidate_chapter_summaries(document.project_id)
 
         # Update project word count
         await self._update_project_word_count(document.project_id)
@@ -259,6 +261,7 @@ class DocumentService:
 
         await self.db.delete(document)
         await self.db.commit()
+        invalidate_chapter_summaries(project_id)
 
         # Update project word count
         await self._update_project_word_count(project_id)
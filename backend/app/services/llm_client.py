@@ -1,7 +1,11 @@
 """LLM client wrapper for DeepSeek API."""
 from typing import List, Dict, Optional, Any, AsyncIterator
-import json
+import asyncio
+import weakref
+from io import StringIO
+
 import httpx
+import orjson
 from httpx import ReadTimeout
 
 from app.core.config import settings
@@ -24,6 +28,10 @@ class DeepSeekClient:
         self.timeout = timeout or settings.DEEPSEEK_TIMEOUT
         self._client = client
 
+    def _http(self) -> httpx.AsyncClient:
+        """Return the injected HTTP client or the pooled one of this event loop."""
+        return self._client or _get_http_client()
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -32,6 +40,8 @@ class DeepSeekClient:
         model: Optional[str] = None,
         response_format: Optional[Dict[str, Any]] = None,
         return_full: bool = False,
+        stop: Optional[List[str]] = None,
+        top_p: Optional[float] = None,
     ) -> Any:
         """Call DeepSeek chat completions and return the assistant content."""
         payload = {
@@ -42,6 +52,10 @@ class DeepSeekClient:
         }
         if response_format:
             payload["response_format"] = response_format
+        if stop:
+            payload["stop"] = stop
+        if top_p is not None:
+            payload["top_p"] = top_p
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -49,20 +63,12 @@ class DeepSeekClient:
 
         timeout = httpx.Timeout(self.timeout, read=self.timeout)
         try:
-            if self._client is None:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.post(
-                        f"{self.base_url}/chat/completions",
-                        headers=headers,
-                        json=payload,
-                    )
-            else:
-                response = await self._client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=timeout,
-                )
+            response = await self._http().post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=timeout,
+            )
             if response.status_code != 200:
                 raise RuntimeError(f"DeepSeek API error: {response.text}")
         except ReadTimeout:
@@ -72,7 +78,7 @@ class DeepSeekClient:
                 "DeepSeek connection error. Please retry in a moment."
             ) from exc
 
-        result = response.json()
+        result = orjson.loads(response.content)
         message = result["choices"][0]["message"]
         if return_full:
             return message
@@ -100,60 +106,32 @@ class DeepSeekClient:
 
         timeout = httpx.Timeout(self.timeout, read=self.timeout)
         try:
-            if self._client is None:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    async with client.stream(
-                        "POST",
-                        f"{self.base_url}/chat/completions",
-                        headers=headers,
-                        json=payload,
-                    ) as response:
-                        if response.status_code != 200:
-                            error_text = await response.aread()
-                            raise RuntimeError(f"DeepSeek API error: {error_text.decode()}")
-
-                        async for line in response.aiter_lines():
-                            if not line:
-                                continue
-                            if line.startswith("data: "):
-                                data = line[6:]
-                                if data == "[DONE]":
-                                    break
-                                try:
-                                    chunk = json.loads(data)
-                                    delta = chunk.get("choices", [{}])[0].get("delta", {})
-                                    content = delta.get("content")
-                                    if content:
-                                        yield content
-                                except json.JSONDecodeError:
-                                    continue
-            else:
-                async with self._client.stream(
-                    "POST",
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=timeout,
-                ) as response:
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        raise RuntimeError(f"DeepSeek API error: {error_text.decode()}")
-
-                    async for line in response.aiter_lines():
-                        if not line:
+            async with self._http().stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=timeout,
+            ) as response:
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    raise RuntimeError(f"DeepSeek API error: {error_text.decode()}")
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    if line.startswith("data: "):
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+                        try:
+                            chunk = orjson.loads(data)
+                            delta = chunk.get("choices", [{}])[0].get("delta", {})
+                            content = delta.get("content")
+                            if content:
+                                yield content
+                        except orjson.JSONDecodeError:
                             continue
-                        if line.startswith("data: "):
-                            data = line[6:]
-                            if data == "[DONE]":
-                                break
-                            try:
-                                chunk = json.loads(data)
-                                delta = chunk.get("choices", [{}])[0].get("delta", {})
-                                content = delta.get("content")
-                                if content:
-                                    yield content
-                            except json.JSONDecodeError:
-                                continue
         except ReadTimeout:
             raise
         except httpx.HTTPError as exc:
@@ -172,7 +150,8 @@ class DeepSeekClient:
         Stream chat and collect full response.
 
         Returns a StreamCollector: iterate with ``async for chunk in collector``,
-        then access ``collector.full_content`` after iteration completes.
+        then access ``collector.full_content`` after iteration completes, or
+        ``await collector.full()`` to drain the rest of the stream.
         """
         return StreamCollector(self, messages, temperature, max_tokens, model)
 
@@ -193,14 +172,24 @@ class StreamCollector:
         self._temperature = temperature
         self._max_tokens = max_tokens
         self._model = model
-        self._collected: List[str] = []
+        self._buffer = StringIO()
+        self._stream: Optional[AsyncIterator[str]] = None
 
     @property
     def full_content(self) -> str:
-        return "".join(self._collected)
+        return self._buffer.getvalue()
 
-    def __aiter__(self):
-        return self._iterate()
+    def __aiter__(self) -> AsyncIterator[str]:
+        # A single underlying stream, so full() resumes a partial iteration
+        if self._stream is None:
+            self._stream = self._iterate()
+        return self._stream
+
+    async def full(self) -> str:
+        """Consume any remaining chunks and return the complete response."""
+        async for _ in self:
+            pass
+        return self.full_content
 
     async def _iterate(self) -> AsyncIterator[str]:
         async for chunk in self._client.chat_stream(
@@ -209,5 +198,42 @@ class StreamCollector:
             max_tokens=self._max_tokens,
             model=self._model,
         ):
-            self._collected.append(chunk)
+            self._buffer.write(chunk)
             yield chunk
+
+
+# Pooled HTTP/2 clients, one per event loop: connections cannot cross loops,
+# and Celery tasks run each job in a fresh loop
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the pooled HTTP client of the running event loop."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+_shared_client: Optional[DeepSeekClient] = None
+
+
+def get_llm_client() -> DeepSeekClient:
+    """Return a process-wide DeepSeek client backed by the pooled HTTP/2 connections."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = DeepSeekClient()
+    return _shared_client
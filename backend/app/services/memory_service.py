@@ -1,32 +1,42 @@
 """Memory and continuity service for long-form novels."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
 import asyncio
-import json
+import base64
+import copy
+import hashlib
 import logging
+import threading
 import warnings
+import weakref
 
-from app.core.config import settings
+import numpy as np
+import orjson
+from cachetools import TTLCache
 
-# Suppress Neo4j warnings about missing property keys in schema
-# These occur when querying for properties that don't exist yet in the graph
-warnings.filterwarnings(
-    "ignore",
-    category=UserWarning,
-    module="neo4j",
-    message=".*property key.*not in the database.*",
-)
+from app.core.config import settings
 from app.services.llm_client import DeepSeekClient
 
 try:
     from neo4j import GraphDatabase as Neo4jGraphDatabase  # type: ignore[import-not-found]
+    from neo4j import RoutingControl  # type: ignore[import-not-found]
+    _READ_ROUTING: Any = RoutingControl.READ
 except ImportError:  # pragma: no cover - optional dependency
     Neo4jGraphDatabase = None  # type: ignore[assignment]
+    _READ_ROUTING = "r"
 
 GraphDatabase: Optional[Any] = Neo4jGraphDatabase
 
+try:
+    from app.infrastructure.neo4j_client import AsyncNeo4jClient
+except ImportError:  # pragma: no cover - optional dependency
+    AsyncNeo4jClient = None  # type: ignore[assignment,misc]
+
 try:
     import chromadb as chromadb_module
 except ImportError:  # pragma: no cover - optional dependency
@@ -39,16 +49,448 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     ChromaSettings = None  # type: ignore[assignment]
 
+try:
+    import tiktoken  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None  # type: ignore[assignment]
+
 
 logger = logging.getLogger(__name__)
 
 OBJECT_STATUSES = ["possessed", "lost", "destroyed", "hidden", "transferred"]
 CHARACTER_LOCATIONS = ["known", "unknown", "traveling"]
 
-_NEO4J_CACHE: dict = {}
-_NEO4J_CACHE_TTL = timedelta(minutes=10)
-_NEO4J_CACHE_LOCK = asyncio.Lock()
-_NEO4J_SCHEMA_READY = False
+# Graph read results; checks also run in worker threads, hence the lock.
+# _GRAPH_VERSIONS only tracks writes made by this process, so graph writes
+# from other processes (Celery workers, other API replicas) go unseen until
+# entries expire. The TTL is therefore kept to roughly one validation pass:
+# long enough for preload() to serve the checks that follow it.
+_NEO4J_CACHE_TTL = timedelta(seconds=10)
+_NEO4J_CACHE_MAX_ENTRIES = 2048
+_NEO4J_CACHE: TTLCache = TTLCache(
+    maxsize=_NEO4J_CACHE_MAX_ENTRIES, ttl=_NEO4J_CACHE_TTL.total_seconds()
+)
+_NEO4J_CACHE_LOCK = threading.Lock()
+_CACHE_MISS = object()
+# Bumped on every graph write so cached reads of a project go stale
+_GRAPH_VERSIONS: Dict[Optional[str], int] = {}
+# Drivers (by id) whose schema statements already ran, so DI'd service
+# instances sharing a driver do not repeat them
+_NEO4J_SCHEMA_READY: set = set()
+_NEO4J_SCHEMA_LOCK = threading.Lock()
+_NEO4J_SCHEMA_STATEMENTS = (
+    "CREATE INDEX event_project_id IF NOT EXISTS FOR (e:Event) ON (e.project_id)",
+    "CREATE INDEX event_unresolved IF NOT EXISTS FOR (e:Event) ON (e.unresolved)",
+    "CREATE INDEX event_last_mentioned IF NOT EXISTS FOR (e:Event) ON (e.last_mentioned_chapter)",
+    # Covers the orphaned-thread filter: project, unresolved flag, then range on chapter
+    "CREATE INDEX event_unresolved_cutoff IF NOT EXISTS "
+    "FOR (e:Event) ON (e.project_id, e.unresolved, e.last_mentioned_chapter)",
+    # Every project-scoped MERGE and lookup matches on both name and project_id
+    "CREATE INDEX character_name_project IF NOT EXISTS "
+    "FOR (c:Character) ON (c.name, c.project_id)",
+    "CREATE INDEX object_name_project IF NOT EXISTS FOR (o:Object) ON (o.name, o.project_id)",
+    "CREATE INDEX location_name_project IF NOT EXISTS "
+    "FOR (l:Location) ON (l.name, l.project_id)",
+    "CREATE INDEX event_name_project IF NOT EXISTS FOR (e:Event) ON (e.name, e.project_id)",
+)
+
+# Fact extraction reads the head and tail of long chapters; the character
+# budget only applies when no tokenizer is available
+# 2500 tokens is about the 10000-character budget used before token-based
+# truncation, so moving to tokens does not shrink what the model sees
+_EXTRACTION_MAX_TOKENS = 2500
+_EXTRACTION_MAX_CHARS = 10000
+# Parsed extraction facts keyed by a digest of the chunk text, so regenerated
+# or retried chapters with identical text skip the LLM call. Replies that do
+# not parse to a JSON object are never cached.
+_EXTRACTION_CACHE_TTL = timedelta(hours=1)
+_EXTRACTION_CACHE: TTLCache = TTLCache(
+    maxsize=512, ttl=_EXTRACTION_CACHE_TTL.total_seconds()
+)
+_EXTRACTION_CACHE_LOCK = threading.Lock()
+# List sections of an extracted facts payload, besides the summary string
+_FACT_LIST_KEYS = (
+    "characters",
+    "locations",
+    "relations",
+    "events",
+    "objects",
+    "character_locations",
+)
+
+# Static part of the fact-extraction prompt; only the chapter text varies
+_EXTRACTION_PROMPT_HEADER = (
+    "Tu es un assistant de coherence narrative. Reponds en francais uniquement.\n"
+    "Extrait les faits de continuite en JSON strict avec les cles: summary, characters, locations, "
+    "relations, events, objects, character_locations.\n"
+    "Utilise des cles snake_case ASCII. Si une info manque, laisse le champ vide.\n\n"
+    "characters: liste de {name, role, status, current_state, motivations, traits, goals, arc_stage, "
+    "last_seen_chapter, relationships}\n"
+    "locations: liste de {name, description, rules, timeline_markers, atmosphere, last_mentioned_chapter}\n"
+    "relations: liste de {from, to, type, detail, start_chapter, current_state, evolution}\n"
+    "events: liste de {name, summary, chapter_index, time_reference, impact, unresolved_threads}\n"
+    "objects: liste de {name, description, status, current_holder, location, "
+    "lost_at_chapter, found_at_chapter, importance, magical_properties}\n"
+    "character_locations: liste de {character_name, location, chapter_index, "
+    "travel_from, travel_to, arrival_confirmed}\n\n"
+    "status pour objects: possessed, lost, destroyed, hidden, transferred\n"
+    "Retourne uniquement le JSON.\n\n"
+    "Chapitre:\n"
+)
+
+# Graph write statements, one UNWIND batch per node or relationship kind. Kept
+# as module constants so every call sends identical text and hits the server
+# plan cache. Histories keep their latest _GRAPH_HISTORY_LIMIT entries so each
+# append stays bounded as chapters accumulate.
+_GRAPH_HISTORY_LIMIT = 100
+
+_CYPHER_MERGE_CHARACTER_PROJECT = (
+    "UNWIND $rows AS r "
+    "MERGE (c:Character {name: r.name, project_id: $project_id}) "
+    "ON CREATE SET c.created_chapter = r.chapter_index, c.first_appearance = $timestamp "
+    "SET c.role = r.role, c.status = r.status, c.last_seen_chapter = r.chapter_index, "
+    "c.last_updated = $timestamp, c.project_id = $project_id, "
+    f"c.status_history = (coalesce(c.status_history, []) + r.status_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_MERGE_CHARACTER = (
+    "UNWIND $rows AS r "
+    "MERGE (c:Character {name: r.name}) "
+    "ON CREATE SET c.created_chapter = r.chapter_index, c.first_appearance = $timestamp "
+    "SET c.role = r.role, c.status = r.status, c.last_seen_chapter = r.chapter_index, "
+    "c.last_updated = $timestamp, "
+    f"c.status_history = (coalesce(c.status_history, []) + r.status_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_MERGE_LOCATION_PROJECT = (
+    "UNWIND $rows AS r "
+    "MERGE (l:Location {name: r.name, project_id: $project_id}) "
+    "ON CREATE SET l.created_chapter = r.chapter_index, l.first_appearance = $timestamp "
+    "SET l.description = r.description, l.rules = r.rules, "
+    "l.timeline_markers = r.timeline_markers, "
+    "l.atmosphere = r.atmosphere, l.last_mentioned_chapter = r.chapter_index, "
+    "l.last_updated = $timestamp, l.project_id = $project_id"
+)
+
+_CYPHER_MERGE_LOCATION = (
+    "UNWIND $rows AS r "
+    "MERGE (l:Location {name: r.name}) "
+    "ON CREATE SET l.created_chapter = r.chapter_index, l.first_appearance = $timestamp "
+    "SET l.description = r.description, l.rules = r.rules, "
+    "l.timeline_markers = r.timeline_markers, "
+    "l.atmosphere = r.atmosphere, l.last_mentioned_chapter = r.chapter_index, "
+    "l.last_updated = $timestamp"
+)
+
+_CYPHER_MERGE_RELATION_PROJECT = (
+    "UNWIND $rows AS r "
+    "MERGE (a:Character {name: r.source, project_id: $project_id}) "
+    "MERGE (b:Character {name: r.target, project_id: $project_id}) "
+    "MERGE (a)-[rel:RELATION {type: r.type}]->(b) "
+    "SET rel.detail = r.detail, rel.current_state = r.current_state, "
+    "rel.evolution = r.evolution, rel.start_chapter = r.start_chapter, "
+    "rel.last_updated = $timestamp, rel.project_id = $project_id, "
+    f"rel.evolution_history = (coalesce(rel.evolution_history, []) + r.evolution_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_MERGE_RELATION = (
+    "UNWIND $rows AS r "
+    "MERGE (a:Character {name: r.source}) "
+    "MERGE (b:Character {name: r.target}) "
+    "MERGE (a)-[rel:RELATION {type: r.type}]->(b) "
+    "SET rel.detail = r.detail, rel.current_state = r.current_state, "
+    "rel.evolution = r.evolution, rel.start_chapter = r.start_chapter, "
+    "rel.last_updated = $timestamp, "
+    f"rel.evolution_history = (coalesce(rel.evolution_history, []) + r.evolution_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_MERGE_EVENT_PROJECT = (
+    "UNWIND $rows AS r "
+    "MERGE (e:Event {name: r.name, project_id: $project_id}) "
+    "ON CREATE SET e.created_chapter = r.chapter_index, e.first_appearance = $timestamp "
+    "SET e.summary = r.summary, e.time_reference = r.time_reference, "
+    "e.impact = r.impact, e.last_mentioned_chapter = r.chapter_index, "
+    "e.unresolved = r.unresolved, e.unresolved_threads = r.unresolved_threads, "
+    "e.last_updated = $timestamp, e.project_id = $project_id"
+)
+
+_CYPHER_MERGE_EVENT = (
+    "UNWIND $rows AS r "
+    "MERGE (e:Event {name: r.name}) "
+    "ON CREATE SET e.created_chapter = r.chapter_index, e.first_appearance = $timestamp "
+    "SET e.summary = r.summary, e.time_reference = r.time_reference, "
+    "e.impact = r.impact, e.last_mentioned_chapter = r.chapter_index, "
+    "e.unresolved = r.unresolved, e.unresolved_threads = r.unresolved_threads, "
+    "e.last_updated = $timestamp"
+)
+
+
+_CYPHER_MERGE_OBJECT_PROJECT = (
+    "UNWIND $rows AS r "
+    "MERGE (o:Object {name: r.name, project_id: $project_id}) "
+    "ON CREATE SET o.created_chapter = r.chapter_index, o.first_appearance = $timestamp "
+    "SET o.description = r.description, o.status = r.status, "
+    "o.current_holder = r.current_holder, o.location = r.location, "
+    "o.importance = r.importance, o.magical_properties = r.magical_properties, "
+    "o.last_seen_chapter = r.chapter_index, o.last_updated = $timestamp, "
+    "o.project_id = $project_id, "
+    f"o.status_history = (coalesce(o.status_history, []) + r.status_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_MERGE_OBJECT = (
+    "UNWIND $rows AS r "
+    "MERGE (o:Object {name: r.name}) "
+    "ON CREATE SET o.created_chapter = r.chapter_index, o.first_appearance = $timestamp "
+    "SET o.description = r.description, o.status = r.status, "
+    "o.current_holder = r.current_holder, o.location = r.location, "
+    "o.importance = r.importance, o.magical_properties = r.magical_properties, "
+    "o.last_seen_chapter = r.chapter_index, o.last_updated = $timestamp, "
+    f"o.status_history = (coalesce(o.status_history, []) + r.status_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_MERGE_POSSESSES = (
+    "UNWIND $rows AS r "
+    "MATCH (o:Object {name: r.obj_name, project_id: $project_id}) "
+    "MATCH (c:Character {name: r.holder_name, project_id: $project_id}) "
+    "MERGE (c)-[rel:POSSESSES]->(o) "
+    "SET rel.since_chapter = r.chapter_index, rel.updated = $timestamp"
+)
+
+_CYPHER_SET_CHARACTER_LOCATION_PROJECT = (
+    "UNWIND $rows AS r "
+    "MATCH (c:Character {name: r.name, project_id: $project_id}) "
+    "SET c.current_location = r.current_location, "
+    "c.location_updated_chapter = r.chapter_index, "
+    f"c.location_history = (coalesce(c.location_history, []) + r.location_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+_CYPHER_SET_CHARACTER_LOCATION = (
+    "UNWIND $rows AS r "
+    "MATCH (c:Character {name: r.name}) "
+    "SET c.current_location = r.current_location, "
+    "c.location_updated_chapter = r.chapter_index, "
+    f"c.location_history = (coalesce(c.location_history, []) + r.location_entry)[-{_GRAPH_HISTORY_LIMIT}..]"
+)
+
+# Node lookups of the continuity checks. Both only return the properties their
+# check reads, with histories cut down to the entries it looks at.
+_OBJECT_AVAILABILITY_PROJECTION = (
+    "RETURN o {.status, .current_holder, .location, "
+    "status_history: [e IN coalesce(o.status_history, []) "
+    "WHERE e.status IN ['lost', 'possessed', 'found']]} AS o"
+)
+_CYPHER_FIND_OBJECT_PROJECT = (
+    "MATCH (o:Object {name: $name, project_id: $project_id}) "
+    + _OBJECT_AVAILABILITY_PROJECTION
+)
+_CYPHER_FIND_OBJECT = "MATCH (o:Object {name: $name}) " + _OBJECT_AVAILABILITY_PROJECTION
+_LOCATION_CONSISTENCY_PROJECTION = (
+    "RETURN c {.current_location, .location_updated_chapter, "
+    "location_history: [e IN coalesce(c.location_history, []) "
+    "WHERE e.travel_to IS NOT NULL]} AS c"
+)
+_CYPHER_FIND_CHARACTER_PROJECT = (
+    "MATCH (c:Character {name: $name, project_id: $project_id}) "
+    + _LOCATION_CONSISTENCY_PROJECTION
+)
+_CYPHER_FIND_CHARACTER = "MATCH (c:Character {name: $name}) " + _LOCATION_CONSISTENCY_PROJECTION
+
+# Consecutive status entries where a dead character comes back
+_RESURRECTIONS_BODY = (
+    "UNWIND coalesce(c.status_history, []) as history "
+    "WITH c, history "
+    "ORDER BY history.chapter "
+    "WITH c, collect(history) as ordered_history "
+    "UNWIND range(0, size(ordered_history) - 2) as i "
+    "WITH c, ordered_history[i] as current, ordered_history[i + 1] as next "
+    "WHERE current.status = 'dead' AND next.status IN ['alive', 'active', 'healthy'] "
+    "RETURN {"
+    "  character: c.name, "
+    "  contradiction: 'resurrection', "
+    "  from_chapter: current.chapter, "
+    "  from_status: current.status, "
+    "  to_chapter: next.chapter, "
+    "  to_status: next.status"
+    "} as issue"
+)
+_CYPHER_CHARACTER_RESURRECTIONS_PROJECT = (
+    "MATCH (c:Character {name: $name, project_id: $project_id}) " + _RESURRECTIONS_BODY
+)
+_CYPHER_CHARACTER_RESURRECTIONS = "MATCH (c:Character {name: $name}) " + _RESURRECTIONS_BODY
+_CYPHER_CHARACTERS_RESURRECTIONS_PROJECT = (
+    "UNWIND $names AS name "
+    "MATCH (c:Character {name: name, project_id: $project_id}) " + _RESURRECTIONS_BODY
+)
+_CYPHER_CHARACTERS_RESURRECTIONS = (
+    "UNWIND $names AS name MATCH (c:Character {name: name}) " + _RESURRECTIONS_BODY
+)
+
+# Read queries of the evolution, orphaned-thread and export helpers
+_CYPHER_CHARACTER_EVOLUTION_PROJECT = (
+    "MATCH (c:Character {name: $name, project_id: $project_id}) "
+    "RETURN c.name as name, c.status_history as status_history, "
+    "c.first_appearance as first_appearance, c.last_seen_chapter as last_seen_chapter"
+)
+_CYPHER_CHARACTER_EVOLUTION = (
+    "MATCH (c:Character {name: $name}) "
+    "RETURN c.name as name, c.status_history as status_history, "
+    "c.first_appearance as first_appearance, c.last_seen_chapter as last_seen_chapter"
+)
+_CYPHER_RELATION_EVOLUTION_PROJECT = (
+    "MATCH (a:Character {name: $char_a, project_id: $project_id})"
+    "-[r:RELATION]->"
+    "(b:Character {name: $char_b, project_id: $project_id}) "
+    "RETURN r.type as type, r.start_chapter as start_chapter, "
+    "r.evolution_history as evolution, r.current_state as current_state"
+)
+_CYPHER_RELATION_EVOLUTION = (
+    "MATCH (a:Character {name: $char_a})-[r:RELATION]->(b:Character {name: $char_b}) "
+    "RETURN r.type as type, r.start_chapter as start_chapter, "
+    "r.evolution_history as evolution, r.current_state as current_state"
+)
+_CYPHER_ORPHANED_THREADS_PROJECT = (
+    "MATCH (e:Event {project_id: $project_id}) "
+    "WHERE e.unresolved = true AND e.last_mentioned_chapter < $cutoff "
+    "RETURN e.name as event, e.last_mentioned_chapter as last_mentioned, e.summary as summary "
+    "ORDER BY e.last_mentioned_chapter"
+)
+_CYPHER_ORPHANED_THREADS = (
+    "MATCH (e:Event) "
+    "WHERE e.unresolved = true AND e.last_mentioned_chapter < $cutoff "
+    "RETURN e.name as event, e.last_mentioned_chapter as last_mentioned, e.summary as summary "
+    "ORDER BY e.last_mentioned_chapter"
+)
+# The export collects nodes and edges in two subqueries of one statement, so
+# the graph view costs a single round-trip
+_EXPORT_COLLECT_NODES = (
+    "WITH n LIMIT $limit "
+    "RETURN collect({id: id(n), labels: labels(n), props: properties(n)}) AS nodes }"
+)
+_EXPORT_COLLECT_EDGES = (
+    "WITH a, r, b LIMIT $limit "
+    "RETURN collect({source: id(a), target: id(b), type: type(r), props: properties(r)}) AS edges } "
+    "RETURN nodes, edges"
+)
+_CYPHER_EXPORT_GRAPH_PROJECT = (
+    "CALL { MATCH (n) WHERE n.project_id = $project_id " + _EXPORT_COLLECT_NODES + " "
+    "CALL { MATCH (a)-[r]->(b) WHERE a.project_id = $project_id AND b.project_id = $project_id "
+    + _EXPORT_COLLECT_EDGES
+)
+_CYPHER_EXPORT_GRAPH = (
+    "CALL { MATCH (n) " + _EXPORT_COLLECT_NODES + " "
+    "CALL { MATCH (a)-[r]->(b) " + _EXPORT_COLLECT_EDGES
+)
+
+# Bulk variants used by preload to fill the node cache in one round-trip per kind
+_CYPHER_FIND_OBJECTS_PROJECT = (
+    "MATCH (o:Object) WHERE o.name IN $names AND o.project_id = $project_id "
+    "WITH o, o.name AS name " + _OBJECT_AVAILABILITY_PROJECTION + ", name"
+)
+_CYPHER_FIND_OBJECTS = (
+    "MATCH (o:Object) WHERE o.name IN $names "
+    "WITH o, o.name AS name " + _OBJECT_AVAILABILITY_PROJECTION + ", name"
+)
+_CYPHER_FIND_CHARACTERS_PROJECT = (
+    "MATCH (c:Character) WHERE c.name IN $names AND c.project_id = $project_id "
+    "WITH c, c.name AS name " + _LOCATION_CONSISTENCY_PROJECTION + ", name"
+)
+_CYPHER_FIND_CHARACTERS = (
+    "MATCH (c:Character) WHERE c.name IN $names "
+    "WITH c, c.name AS name " + _LOCATION_CONSISTENCY_PROJECTION + ", name"
+)
+
+
+@contextmanager
+def _ignore_missing_property_warnings() -> Iterator[None]:
+    """
+    Silence Neo4j warnings about property keys not yet in the database.
+
+    They occur when reading properties no write has created yet. The filter is
+    scoped to graph reads instead of being installed process-wide at import.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            category=UserWarning,
+            module="neo4j",
+            message=".*property key.*not in the database.*",
+        )
+        yield
+
+
+# Async graph clients built from settings, one per event loop: the async driver
+# cannot be shared across loops, and Celery tasks run each job in a fresh loop
+_graph_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_graph_client() -> Optional[Any]:
+    if AsyncNeo4jClient is None or not settings.NEO4J_URI:
+        return None
+    if not (settings.NEO4J_USER and settings.NEO4J_PASSWORD):
+        return None
+    loop = asyncio.get_running_loop()
+    client = _graph_clients.get(loop)
+    if client is None:
+        try:
+            client = AsyncNeo4jClient(
+                settings.NEO4J_URI,
+                settings.NEO4J_USER,
+                settings.NEO4J_PASSWORD,
+                database=settings.NEO4J_DATABASE or None,
+            )
+        except RuntimeError:
+            return None
+        _graph_clients[loop] = client
+    return client
+
+
+async def close_graph_clients() -> None:
+    """Close the async graph client of the running event loop."""
+    client = _graph_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def _cache_get(key: Any) -> Tuple[bool, Any]:
+    """Return (hit, value) for a live _NEO4J_CACHE entry; None values are hits too."""
+    with _NEO4J_CACHE_LOCK:
+        value = _NEO4J_CACHE.get(key, _CACHE_MISS)
+    if value is _CACHE_MISS:
+        return False, None
+    return True, value
+
+
+def _cache_put(key: Any, value: Any) -> None:
+    with _NEO4J_CACHE_LOCK:
+        _NEO4J_CACHE[key] = value
+
+
+def _node_cache_key(kind: str, name: str, project_id: Optional[str]) -> Tuple[Any, ...]:
+    return (kind, name, project_id, _GRAPH_VERSIONS.get(project_id, 0))
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding() -> Optional[Any]:
+    """Load the tiktoken encoding once; None when it cannot be loaded."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logger.warning("tiktoken encoding unavailable, truncating by characters.", exc_info=True)
+        return None
+
+
+def warm_token_encoding() -> None:
+    """
+    Load the extraction tokenizer ahead of the first request.
+
+    The first load may download the BPE file, so app and worker startup call
+    this instead of letting extract_facts block the event loop on it.
+    """
+    _get_token_encoding()
 
 
 class MemoryService:
@@ -65,6 +507,9 @@ class MemoryService:
         self.neo4j_driver = neo4j_driver if neo4j_driver is not None else self._init_neo4j()
         self.chroma_client = chroma_client if chroma_client is not None else self._init_chroma()
         self.neo4j_async_client = neo4j_async_client
+        # Only a driver built from settings gets a matching settings-built async client
+        self._graph_client_from_settings = neo4j_driver is None and neo4j_async_client is None
+        self._collections: Dict[str, Any] = {}
         if self.neo4j_driver:
             self._ensure_neo4j_schema()
 
@@ -76,6 +521,18 @@ class MemoryService:
             auth = (settings.NEO4J_USER, settings.NEO4J_PASSWORD)
         return GraphDatabase.driver(settings.NEO4J_URI, auth=auth)
 
+    def _async_graph_client(self) -> Optional[Any]:
+        """
+        Return the async Neo4j client, or None to fall back to the sync driver.
+
+        An injected client wins; otherwise services that built their sync
+        driver from settings share the event loop's settings-built client.
+        """
+        client = self.neo4j_async_client
+        if client is None and self.neo4j_driver and self._graph_client_from_settings:
+            client = _get_graph_client()
+        return client
+
     def _init_chroma(self):
         if not chromadb:
             return None
@@ -96,40 +553,58 @@ class MemoryService:
         )
 
     def _ensure_neo4j_schema(self) -> None:
-        global _NEO4J_SCHEMA_READY
-        if _NEO4J_SCHEMA_READY or not self.neo4j_driver:
+        if not self.neo4j_driver:
+            return
+        driver_key = id(self.neo4j_driver)
+        if driver_key in _NEO4J_SCHEMA_READY:
             return
+
+        def create_schema(tx: Any) -> None:
+            for statement in _NEO4J_SCHEMA_STATEMENTS:
+                tx.run(statement)
+
         database = settings.NEO4J_DATABASE or None
-        try:
-            with self.neo4j_driver.session(database=database) as session:
-                session.run(
-                    "CREATE INDEX event_project_id IF NOT EXISTS "
-                    "FOR (e:Event) ON (e.project_id)"
-                )
-                session.run(
-                    "CREATE INDEX event_unresolved IF NOT EXISTS "
-                    "FOR (e:Event) ON (e.unresolved)"
-                )
-                session.run(
-                    "CREATE INDEX event_last_mentioned IF NOT EXISTS "
-                    "FOR (e:Event) ON (e.last_mentioned_chapter)"
-                )
-            _NEO4J_SCHEMA_READY = True
-        except Exception:
-            logger.warning("Neo4j schema initialization failed.", exc_info=True)
+        with _NEO4J_SCHEMA_LOCK:
+            if driver_key in _NEO4J_SCHEMA_READY:
+                return
+            try:
+                with self.neo4j_driver.session(database=database) as session:
+                    session.execute_write(create_schema)
+                _NEO4J_SCHEMA_READY.add(driver_key)
+            except Exception:
+                logger.warning("Neo4j schema initialization failed.", exc_info=True)
 
     async def extract_facts(self, chapter_text: str) -> Dict[str, Any]:
         """Extract enriched continuity facts from chapter text."""
         if not chapter_text or not chapter_text.strip():
             return self._empty_facts()
 
-        chunks = self._select_extraction_chunks(chapter_text, max_chars=10000)
+        chunks = self._select_extraction_chunks(
+            chapter_text,
+            max_chars=_EXTRACTION_MAX_CHARS,
+            max_tokens=_EXTRACTION_MAX_TOKENS,
+        )
+        # Head and tail are extracted concurrently, then merged in text order
+        chunk_facts_list = await asyncio.gather(
+            *(self._extract_facts_chunk(chunk) for chunk in chunks)
+        )
         merged = self._empty_facts()
-        for chunk in chunks:
-            chunk_facts = await self._extract_facts_chunk(chunk)
+        for chunk_facts in chunk_facts_list:
             merged = self._merge_fact_payloads(merged, chunk_facts)
         return merged
 
+    async def extract_facts_many(
+        self, chapter_texts: List[str], concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Extract facts for several chapters with bounded concurrency, in input order."""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(chapter_text: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.extract_facts(chapter_text)
+
+        return list(await asyncio.gather(*(run(text) for text in chapter_texts)))
+
     def merge_facts(self, metadata: Dict[str, Any], facts: Dict[str, Any]) -> Dict[str, Any]:
         continuity_raw = metadata.get("continuity")
         continuity: Dict[str, Any] = continuity_raw if isinstance(continuity_raw, dict) else {}
@@ -137,9 +612,11 @@ class MemoryService:
         continuity.setdefault("locations", [])
         continuity.setdefault("relations", [])
         continuity.setdefault("events", [])
+        # One timestamp for the whole merge, shared by every history entry
+        timestamp = datetime.now(timezone.utc).isoformat()
 
         continuity["characters"] = self._merge_characters(
-            continuity["characters"], facts.get("characters", [])
+            continuity["characters"], facts.get("characters", []), timestamp
         )
         continuity["locations"] = self._merge_locations(
             continuity["locations"], facts.get("locations", [])
@@ -150,59 +627,32 @@ class MemoryService:
         continuity["events"] = self._merge_events(
             continuity["events"], facts.get("events", [])
         )
-        continuity["updated_at"] = datetime.now(timezone.utc).isoformat()
+        continuity["updated_at"] = timestamp
         metadata["continuity"] = continuity
         return metadata
 
     def build_context_block(self, metadata: Dict[str, Any]) -> str:
         continuity_raw = metadata.get("continuity")
         continuity: Dict[str, Any] = continuity_raw if isinstance(continuity_raw, dict) else {}
-        characters = continuity.get("characters", [])
-        if not isinstance(characters, list):
-            characters = []
-        locations = continuity.get("locations", [])
-        if not isinstance(locations, list):
-            locations = []
-        relations = continuity.get("relations", [])
-        if not isinstance(relations, list):
-            relations = []
-        events = continuity.get("events", [])
-        if not isinstance(events, list):
-            events = []
-        lines = ["CONTINUITY FACTS:", ""]
-        lines.append("Characters:")
-        if characters:
-            for item in characters:
-                lines.append(self._format_character(item))
-        else:
-            lines.append("- none")
-
-        lines.append("")
-        lines.append("Locations:")
-        if locations:
-            for item in locations:
-                lines.append(self._format_location(item))
-        else:
-            lines.append("- none")
-
-        lines.append("")
-        lines.append("Relations:")
-        if relations:
-            for item in relations:
-                lines.append(self._format_relation(item))
-        else:
-            lines.append("- none")
-
-        lines.append("")
-        lines.append("Events:")
-        if events:
-            for item in events:
-                lines.append(self._format_event(item))
-        else:
-            lines.append("- none")
-
-        context_block = "\n".join(lines).strip()
-        if self._word_count(context_block) < 200:
+        sections = (
+            ("Characters:", continuity.get("characters"), self._format_character),
+            ("Locations:", continuity.get("locations"), self._format_location),
+            ("Relations:", continuity.get("relations"), self._format_relation),
+            ("Events:", continuity.get("events"), self._format_event),
+        )
+        lines = ["CONTINUITY FACTS:"]
+        # Words are counted per formatted line while building, and only until
+        # the padding threshold is reached, instead of re-splitting the block
+        word_count = 2
+        for header, items, formatter in sections:
+            formatted = [formatter(item) for item in items] if isinstance(items, list) and items else ["- none"]
+            lines.append(f"\n{header}")
+            lines.extend(formatted)
+            if word_count < 200:
+                word_count += 1 + sum(len(line.split()) for line in formatted)
+
+        context_block = "\n".join(lines)
+        if word_count < 200:
             context_block = f"{context_block}\n\n{self._build_padding_note()}".strip()
         return context_block
 
@@ -215,106 +665,74 @@ class MemoryService:
         """Update Neo4j with object tracking data."""
         if not self.neo4j_driver:
             return
-        
+        self._write_graph_batches(*self._neo4j_object_batches(facts, project_id, chapter_index), project_id)
+
+    async def update_neo4j_objects_async(
+        self,
+        facts: Dict[str, Any],
+        project_id: Optional[str] = None,
+        chapter_index: Optional[int] = None,
+    ) -> None:
+        """Update Neo4j object tracking without blocking the event loop."""
+        if not self._graph_writable():
+            return
+        await self._write_graph_batches_async(
+            *self._neo4j_object_batches(facts, project_id, chapter_index), project_id
+        )
+
+    def _neo4j_object_batches(
+        self,
+        facts: Dict[str, Any],
+        project_id: Optional[str],
+        chapter_index: Optional[int],
+    ) -> Tuple[List[Tuple[str, List[Dict[str, Any]]]], str]:
+        """Build the (UNWIND query, rows) pairs written by update_neo4j_objects."""
         timestamp = datetime.now(timezone.utc).isoformat()
-        database = settings.NEO4J_DATABASE or None
         base_chapter = self._resolve_chapter_index(chapter_index)
         
-        with self.neo4j_driver.session(database=database) as session:
-            for obj in facts.get("objects", []):
-                name = obj.get("name")
-                if not name:
-                    continue
-                
-                obj_chapter = self._resolve_chapter_index(
-                    obj.get("last_seen_chapter"), base_chapter
-                )
-                status = obj.get("status", "possessed")
-                holder = obj.get("current_holder")
-                location = obj.get("location")
-                
-                # Build status history entry
-                status_entry = []
-                if status and isinstance(obj_chapter, int):
-                    status_entry = [{
-                        "status": status,
-                        "chapter": obj_chapter,
-                        "holder": holder,
-                        "location": location,
-                        "timestamp": timestamp,
-                    }]
-                
-                params = {
-                    "name": name,
-                    "description": obj.get("description"),
+        object_rows = []
+        holder_rows = []
+        for obj in facts.get("objects", []):
+            name = obj.get("name")
+            if not name:
+                continue
+            
+            obj_chapter = self._resolve_chapter_index(
+                obj.get("last_seen_chapter"), base_chapter
+            )
+            status = obj.get("status", "possessed")
+            holder = obj.get("current_holder")
+            location = obj.get("location")
+            
+            # Build status history entry
+            status_entry = []
+            if status and isinstance(obj_chapter, int):
+                status_entry = [{
                     "status": status,
-                    "current_holder": holder,
+                    "chapter": obj_chapter,
+                    "holder": holder,
                     "location": location,
-                    "importance": obj.get("importance", "normal"),
-                    "magical_properties": obj.get("magical_properties"),
-                    "chapter_index": obj_chapter,
                     "timestamp": timestamp,
-                    "status_entry": status_entry,
-                }
-                
-                if project_id:
-                    params["project_id"] = project_id
-                    session.run(
-                        """
-                        MERGE (o:Object {name: $name, project_id: $project_id})
-                        ON CREATE SET 
-                            o.created_chapter = $chapter_index,
-                            o.first_appearance = $timestamp
-                        SET 
-                            o.description = $description,
-                            o.status = $status,
-                            o.current_holder = $current_holder,
-                            o.location = $location,
-                            o.importance = $importance,
-                            o.magical_properties = $magical_properties,
-                            o.last_seen_chapter = $chapter_index,
-                            o.last_updated = $timestamp,
-                            o.project_id = $project_id,
-                            o.status_history = coalesce(o.status_history, []) + $status_entry
-                        """,
-                        **params,
-                    )
-                    
-                    # Create relationship to holder if exists
-                    if holder:
-                        session.run(
-                            """
-                            MATCH (o:Object {name: $obj_name, project_id: $project_id})
-                            MATCH (c:Character {name: $holder_name, project_id: $project_id})
-                            MERGE (c)-[r:POSSESSES]->(o)
-                            SET r.since_chapter = $chapter_index, r.updated = $timestamp
-                            """,
-                            obj_name=name,
-                            holder_name=holder,
-                            project_id=project_id,
-                            chapter_index=obj_chapter,
-                            timestamp=timestamp,
-                        )
-                else:
-                    session.run(
-                        """
-                        MERGE (o:Object {name: $name})
-                        ON CREATE SET 
-                            o.created_chapter = $chapter_index,
-                            o.first_appearance = $timestamp
-                        SET 
-                            o.description = $description,
-                            o.status = $status,
-                            o.current_holder = $current_holder,
-                            o.location = $location,
-                            o.importance = $importance,
-                            o.magical_properties = $magical_properties,
-                            o.last_seen_chapter = $chapter_index,
-                            o.last_updated = $timestamp,
-                            o.status_history = coalesce(o.status_history, []) + $status_entry
-                        """,
-                        **params,
-                    )
+                }]
+            
+            object_rows.append({
+                "name": name,
+                "description": obj.get("description"),
+                "status": status,
+                "current_holder": holder,
+                "location": location,
+                "importance": obj.get("importance", "normal"),
+                "magical_properties": obj.get("magical_properties"),
+                "chapter_index": obj_chapter,
+                "status_entry": status_entry,
+            })
+            # Holder relationships are only tracked within a project
+            if holder and project_id:
+                holder_rows.append({"obj_name": name, "holder_name": holder, "chapter_index": obj_chapter})
+        
+        object_query = _CYPHER_MERGE_OBJECT_PROJECT if project_id else _CYPHER_MERGE_OBJECT
+        batches = [(object_query, object_rows), (_CYPHER_MERGE_POSSESSES, holder_rows)]
+        return [(query, rows) for query, rows in batches if rows], timestamp
 
     def check_object_availability(
         self,
@@ -331,70 +749,99 @@ class MemoryService:
         if not self.neo4j_driver:
             return {"available": True, "status": "unknown", "issue": None}
         
-        database = settings.NEO4J_DATABASE or None
-        
-        query_base = "MATCH (o:Object {name: $name"
+        cache_key = _node_cache_key("obj", object_name, project_id)
+        hit, obj = _cache_get(cache_key)
+        if not hit:
+            query_base, params = self._object_node_query(object_name, project_id)
+            obj = self._fetch_graph_node(query_base, params, "o")
+            _cache_put(cache_key, obj)
+        return self._object_availability(obj, object_name, chapter_index)
+
+    async def check_object_availability_async(
+        self,
+        object_name: str,
+        chapter_index: int,
+        project_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async variant of check_object_availability."""
+        async_client = self._async_graph_client()
+        if async_client is None:
+            return await asyncio.to_thread(
+                self.check_object_availability, object_name, chapter_index, project_id
+            )
+        cache_key = _node_cache_key("obj", object_name, project_id)
+        hit, obj = _cache_get(cache_key)
+        if not hit:
+            query_base, params = self._object_node_query(object_name, project_id)
+            obj = await self._fetch_graph_node_async(async_client, query_base, params, "o")
+            _cache_put(cache_key, obj)
+        return self._object_availability(obj, object_name, chapter_index)
+
+    def _object_node_query(
+        self, object_name: str, project_id: Optional[str]
+    ) -> Tuple[str, Dict[str, Any]]:
         if project_id:
-            query_base += ", project_id: $project_id"
-        query_base += "}) RETURN o"
+            return _CYPHER_FIND_OBJECT_PROJECT, {"name": object_name, "project_id": project_id}
+        return _CYPHER_FIND_OBJECT, {"name": object_name}
+
+    def _object_availability(
+        self, obj: Optional[Dict[str, Any]], object_name: str, chapter_index: int
+    ) -> Dict[str, Any]:
+        if obj is None:
+            return {"available": True, "status": "unknown", "issue": None}
         
-        params = {"name": object_name}
-        if project_id:
-            params["project_id"] = project_id
+        status = obj.get("status", "possessed")
+        holder = obj.get("current_holder")
+        location = obj.get("location")
+        lost_chapter = None
         
-        with self.neo4j_driver.session(database=database) as session:
-            result = session.run(query_base, **params)
-            record = result.single()
-            
-            if not record:
-                return {"available": True, "status": "unknown", "issue": None}
-            
-            obj = dict(record["o"])
-            status = obj.get("status", "possessed")
-            holder = obj.get("current_holder")
-            location = obj.get("location")
-            lost_chapter = None
-            
-            # Check status history for lost status
-            status_history = obj.get("status_history", [])
-            for entry in status_history:
-                if entry.get("status") == "lost" and entry.get("chapter", 0) < chapter_index:
-                    # Check if found after
-                    found_after = any(
-                        e.get("status") in ("possessed", "found") 
-                        and e.get("chapter", 0) > entry.get("chapter", 0)
-                        and e.get("chapter", 0) <= chapter_index
-                        for e in status_history
-                    )
-                    if not found_after:
-                        lost_chapter = entry.get("chapter")
-                        break
-            
-            if status == "destroyed":
-                return {
-                    "available": False,
-                    "status": "destroyed",
-                    "holder": None,
-                    "location": None,
-                    "issue": f"L'objet '{object_name}' a été détruit et ne peut plus être utilisé.",
-                }
-            
-            if lost_chapter:
-                return {
-                    "available": False,
-                    "status": "lost",
-                    "holder": None,
-                    "location": location,
-                    "issue": f"L'objet '{object_name}' a été perdu au chapitre {lost_chapter} et n'a pas été retrouvé.",
-                }
-            
+        # A loss is unresolved when no possessed/found entry follows it up to
+        # the checked chapter, i.e. when it is not older than the last recovery
+        status_history = obj.get("status_history") or []
+        last_found = max(
+            (
+                e.get("chapter", 0)
+                for e in status_history
+                if e.get("status") in ("possessed", "found")
+                and e.get("chapter", 0) <= chapter_index
+            ),
+            default=None,
+        )
+        for entry in status_history:
+            chapter = entry.get("chapter", 0)
+            if (
+                entry.get("status") == "lost"
+                and chapter < chapter_index
+                and (last_found is None or last_found <= chapter)
+            ):
+                lost_chapter = entry.get("chapter")
+                break
+        
+        if status == "destroyed":
             return {
-                "available": True,
-                "status": status,
-                "holder": holder,
+                "available": False,
+                "status": "destroyed",
+                "holder": None,
+                "location": None,
+                "issue": f"L'objet '{object_name}' a été détruit et ne peut plus être utilisé.",
+            }
+        
+        if lost_chapter:
+            return {
+                "available": False,
+                "status": "lost",
+                "holder": None,
                 "location": location,
-                "issue": None,
+                "issue": f"L'objet '{object_name}' a été perdu au chapitre {lost_chapter} et n'a pas été retrouvé.",
             }
+        
+        return {
+            "available": True,
+            "status": status,
+            "holder": holder,
+            "location": location,
+            "issue": None,
+        }
 
     def update_character_locations(
         self,
@@ -405,62 +852,60 @@ class MemoryService:
         """Update character location tracking in Neo4j."""
         if not self.neo4j_driver:
             return
-        
+        self._write_graph_batches(*self._neo4j_location_batches(facts, project_id, chapter_index), project_id)
+
+    async def update_character_locations_async(
+        self,
+        facts: Dict[str, Any],
+        project_id: Optional[str] = None,
+        chapter_index: Optional[int] = None,
+    ) -> None:
+        """Update character location tracking without blocking the event loop."""
+        if not self._graph_writable():
+            return
+        await self._write_graph_batches_async(
+            *self._neo4j_location_batches(facts, project_id, chapter_index), project_id
+        )
+
+    def _neo4j_location_batches(
+        self,
+        facts: Dict[str, Any],
+        project_id: Optional[str],
+        chapter_index: Optional[int],
+    ) -> Tuple[List[Tuple[str, List[Dict[str, Any]]]], str]:
+        """Build the (UNWIND query, rows) pairs written by update_character_locations."""
         timestamp = datetime.now(timezone.utc).isoformat()
-        database = settings.NEO4J_DATABASE or None
         base_chapter = self._resolve_chapter_index(chapter_index)
         
-        with self.neo4j_driver.session(database=database) as session:
-            for loc_entry in facts.get("character_locations", []):
-                char_name = loc_entry.get("character_name")
-                location = loc_entry.get("location")
-                if not char_name or not location:
-                    continue
-                
-                entry_chapter = self._resolve_chapter_index(
-                    loc_entry.get("chapter_index"), base_chapter
-                )
-                
-                location_entry = {
-                    "location": location,
-                    "chapter": entry_chapter,
-                    "timestamp": timestamp,
-                    "travel_from": loc_entry.get("travel_from"),
-                    "travel_to": loc_entry.get("travel_to"),
-                    "arrival_confirmed": loc_entry.get("arrival_confirmed", True),
-                }
-                
-                params = {
-                    "name": char_name,
-                    "current_location": location,
-                    "chapter_index": entry_chapter,
-                    "timestamp": timestamp,
-                    "location_entry": [location_entry],
-                }
-                
-                if project_id:
-                    params["project_id"] = project_id
-                    session.run(
-                        """
-                        MATCH (c:Character {name: $name, project_id: $project_id})
-                        SET 
-                            c.current_location = $current_location,
-                            c.location_updated_chapter = $chapter_index,
-                            c.location_history = coalesce(c.location_history, []) + $location_entry
-                        """,
-                        **params,
-                    )
-                else:
-                    session.run(
-                        """
-                        MATCH (c:Character {name: $name})
-                        SET 
-                            c.current_location = $current_location,
-                            c.location_updated_chapter = $chapter_index,
-                            c.location_history = coalesce(c.location_history, []) + $location_entry
-                        """,
-                        **params,
-                    )
+        rows = []
+        for loc_entry in facts.get("character_locations", []):
+            char_name = loc_entry.get("character_name")
+            location = loc_entry.get("location")
+            if not char_name or not location:
+                continue
+            
+            entry_chapter = self._resolve_chapter_index(
+                loc_entry.get("chapter_index"), base_chapter
+            )
+            
+            location_entry = {
+                "location": location,
+                "chapter": entry_chapter,
+                "timestamp": timestamp,
+                "travel_from": loc_entry.get("travel_from"),
+                "travel_to": loc_entry.get("travel_to"),
+                "arrival_confirmed": loc_entry.get("arrival_confirmed", True),
+            }
+            
+            rows.append({
+                "name": char_name,
+                "current_location": location,
+                "chapter_index": entry_chapter,
+                "location_entry": [location_entry],
+            })
+        
+        query = _CYPHER_SET_CHARACTER_LOCATION_PROJECT if project_id else _CYPHER_SET_CHARACTER_LOCATION
+        return ([(query, rows)] if rows else []), timestamp
 
     def check_character_location_consistency(
         self,
@@ -478,78 +923,126 @@ class MemoryService:
         if not self.neo4j_driver:
             return {"consistent": True, "issue": None}
         
-        database = settings.NEO4J_DATABASE or None
-        
-        query_base = "MATCH (c:Character {name: $name"
+        cache_key = _node_cache_key("char", character_name, project_id)
+        hit, char = _cache_get(cache_key)
+        if not hit:
+            query_base, params = self._character_node_query(character_name, project_id)
+            char = self._fetch_graph_node(query_base, params, "c")
+            _cache_put(cache_key, char)
+        return self._location_consistency(char, character_name, required_location, chapter_index)
+
+    async def check_character_location_consistency_async(
+        self,
+        character_name: str,
+        required_location: str,
+        chapter_index: int,
+        project_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async variant of check_character_location_consistency."""
+        async_client = self._async_graph_client()
+        if async_client is None:
+            return await asyncio.to_thread(
+                self.check_character_location_consistency,
+                character_name,
+                required_location,
+                chapter_index,
+                project_id,
+            )
+        cache_key = _node_cache_key("char", character_name, project_id)
+        hit, char = _cache_get(cache_key)
+        if not hit:
+            query_base, params = self._character_node_query(character_name, project_id)
+            char = await self._fetch_graph_node_async(async_client, query_base, params, "c")
+            _cache_put(cache_key, char)
+        return self._location_consistency(char, character_name, required_location, chapter_index)
+
+    def _character_node_query(
+        self, character_name: str, project_id: Optional[str]
+    ) -> Tuple[str, Dict[str, Any]]:
         if project_id:
-            query_base += ", project_id: $project_id"
-        query_base += "}) RETURN c"
+            return _CYPHER_FIND_CHARACTER_PROJECT, {"name": character_name, "project_id": project_id}
+        return _CYPHER_FIND_CHARACTER, {"name": character_name}
+
+    def _travel_chapters(self, char: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Map each lowercased travel destination to its earliest chapter.
+
+        The index is kept on the node dict, so cached nodes build it once and
+        later checks are a dict lookup instead of a history scan.
+        """
+        travel = char.get("_travel_chapters")
+        if travel is None:
+            travel = {}
+            for entry in char.get("location_history") or []:
+                destination = entry.get("travel_to")
+                if not destination:
+                    continue
+                chapter = entry.get("chapter", 0)
+                key = destination.lower()
+                if key not in travel or chapter < travel[key]:
+                    travel[key] = chapter
+            char["_travel_chapters"] = travel
+        return travel
+
+    def _location_consistency(
+        self,
+        char: Optional[Dict[str, Any]],
+        character_name: str,
+        required_location: str,
+        chapter_index: int,
+    ) -> Dict[str, Any]:
+        if char is None:
+            return {"consistent": True, "issue": None}
         
-        params = {"name": character_name}
-        if project_id:
-            params["project_id"] = project_id
+        current_location = char.get("current_location")
+        location_chapter = char.get("location_updated_chapter")
         
-        with self.neo4j_driver.session(database=database) as session:
-            result = session.run(query_base, **params)
-            record = result.single()
-            
-            if not record:
-                return {"consistent": True, "issue": None}
-            
-            char = dict(record["c"])
-            current_location = char.get("current_location")
-            location_chapter = char.get("location_updated_chapter")
-            
-            if not current_location:
-                return {"consistent": True, "issue": None}
-            
-            # If same location, all good
-            if current_location.lower() == required_location.lower():
-                return {
-                    "consistent": True,
-                    "current_location": current_location,
-                    "last_known_chapter": location_chapter,
-                    "issue": None,
-                }
-            
-            # Check if there's a travel entry
-            location_history = char.get("location_history", [])
-            travel_found = any(
-                entry.get("travel_to", "").lower() == required_location.lower()
-                and entry.get("chapter", 0) <= chapter_index
-                for entry in location_history
-            )
-            
-            if travel_found:
-                return {
-                    "consistent": True,
-                    "current_location": required_location,
-                    "last_known_chapter": chapter_index,
-                    "issue": None,
-                }
-            
-            # Calculate chapter gap
-            chapter_gap = chapter_index - (location_chapter or 0)
-            
-            # Allow some tolerance (1-2 chapters could include implicit travel)
-            if chapter_gap <= 2:
-                return {
-                    "consistent": True,
-                    "current_location": current_location,
-                    "last_known_chapter": location_chapter,
-                    "issue": None,
-                    "warning": f"Voyage implicite de {current_location} à {required_location}",
-                }
-            
+        if not current_location:
+            return {"consistent": True, "issue": None}
+        
+        # If same location, all good
+        if current_location.lower() == required_location.lower():
             return {
-                "consistent": False,
+                "consistent": True,
                 "current_location": current_location,
                 "last_known_chapter": location_chapter,
-                "issue": (
-                    f"'{character_name}' était à '{current_location}' au chapitre {location_chapter}. "
-                    f"Aucun voyage vers '{required_location}' n'a été mentionné."
-                ),
+                "issue": None,
+            }
+        
+        # Check if there's a travel entry
+        first_travel = self._travel_chapters(char).get(required_location.lower())
+        travel_found = first_travel is not None and first_travel <= chapter_index
+        
+        if travel_found:
+            return {
+                "consistent": True,
+                "current_location": required_location,
+                "last_known_chapter": chapter_index,
+                "issue": None,
+            }
+        
+        # Calculate chapter gap
+        chapter_gap = chapter_index - (location_chapter or 0)
+        
+        # Allow some tolerance (1-2 chapters could include implicit travel)
+        if chapter_gap <= 2:
+            return {
+                "consistent": True,
+                "current_location": current_location,
+                "last_known_chapter": location_chapter,
+                "issue": None,
+                "warning": f"Voyage implicite de {current_location} à {required_location}",
             }
+        
+        return {
+            "consistent": False,
+            "current_location": current_location,
+            "last_known_chapter": location_chapter,
+            "issue": (
+                f"'{character_name}' était à '{current_location}' au chapitre {location_chapter}. "
+                f"Aucun voyage vers '{required_location}' n'a été mentionné."
+            ),
+        }
 
     def update_neo4j(
         self,
@@ -560,162 +1053,7 @@ class MemoryService:
         """Update Neo4j graph nodes with temporal attributes."""
         if not self.neo4j_driver:
             return
-        timestamp = datetime.now(timezone.utc).isoformat()
-        database = settings.NEO4J_DATABASE or None
-        base_chapter = self._resolve_chapter_index(chapter_index)
-        with self.neo4j_driver.session(database=database) as session:
-            for char in facts.get("characters", []):
-                name = char.get("name")
-                if not name:
-                    continue
-                char_chapter = self._resolve_chapter_index(char.get("last_seen_chapter"), base_chapter)
-                status = char.get("status")
-                status_entry = []
-                if status and isinstance(char_chapter, int):
-                    status_entry = [{"status": status, "chapter": char_chapter, "timestamp": timestamp}]
-                params = {
-                    "name": name,
-                    "role": char.get("role"),
-                    "status": status,
-                    "chapter_index": char_chapter,
-                    "timestamp": timestamp,
-                    "status_entry": status_entry,
-                }
-                if project_id:
-                    params["project_id"] = project_id
-                    session.run(
-                        "MERGE (c:Character {name: $name, project_id: $project_id}) "
-                        "ON CREATE SET c.created_chapter = $chapter_index, c.first_appearance = $timestamp "
-                        "SET c.role = $role, c.status = $status, c.last_seen_chapter = $chapter_index, "
-                        "c.last_updated = $timestamp, c.project_id = $project_id, "
-                        "c.status_history = coalesce(c.status_history, []) + $status_entry",
-                        **params,
-                    )
-                else:
-                    session.run(
-                        "MERGE (c:Character {name: $name}) "
-                        "ON CREATE SET c.created_chapter = $chapter_index, c.first_appearance = $timestamp "
-                        "SET c.role = $role, c.status = $status, c.last_seen_chapter = $chapter_index, "
-                        "c.last_updated = $timestamp, "
-                        "c.status_history = coalesce(c.status_history, []) + $status_entry",
-                        **params,
-                    )
-            for loc in facts.get("locations", []):
-                name = loc.get("name")
-                if not name:
-                    continue
-                loc_chapter = self._resolve_chapter_index(loc.get("last_mentioned_chapter"), base_chapter)
-                params = {
-                    "name": name,
-                    "description": loc.get("description"),
-                    "rules": self._normalize_list(loc.get("rules")),
-                    "timeline_markers": self._normalize_list(loc.get("timeline_markers")),
-                    "atmosphere": loc.get("atmosphere"),
-                    "chapter_index": loc_chapter,
-                    "timestamp": timestamp,
-                }
-                if project_id:
-                    params["project_id"] = project_id
-                    session.run(
-                        "MERGE (l:Location {name: $name, project_id: $project_id}) "
-                        "ON CREATE SET l.created_chapter = $chapter_index, l.first_appearance = $timestamp "
-                        "SET l.description = $description, l.rules = $rules, l.timeline_markers = $timeline_markers, "
-                        "l.atmosphere = $atmosphere, l.last_mentioned_chapter = $chapter_index, "
-                        "l.last_updated = $timestamp, l.project_id = $project_id",
-                        **params,
-                    )
-                else:
-                    session.run(
-                        "MERGE (l:Location {name: $name}) "
-                        "ON CREATE SET l.created_chapter = $chapter_index, l.first_appearance = $timestamp "
-                        "SET l.description = $description, l.rules = $rules, l.timeline_markers = $timeline_markers, "
-                        "l.atmosphere = $atmosphere, l.last_mentioned_chapter = $chapter_index, "
-                        "l.last_updated = $timestamp",
-                        **params,
-                    )
-            for rel in facts.get("relations", []):
-                source = rel.get("from")
-                target = rel.get("to")
-                rel_type = rel.get("type")
-                if not source or not target or not rel_type:
-                    continue
-                rel_chapter = self._resolve_chapter_index(rel.get("start_chapter"), base_chapter)
-                current_state = rel.get("current_state")
-                evolution_entry = []
-                if current_state and isinstance(rel_chapter, int):
-                    evolution_entry = [{"state": current_state, "chapter": rel_chapter, "timestamp": timestamp}]
-                params = {
-                    "source": source,
-                    "target": target,
-                    "type": rel_type,
-                    "detail": rel.get("detail"),
-                    "current_state": current_state,
-                    "evolution": rel.get("evolution"),
-                    "start_chapter": rel_chapter,
-                    "timestamp": timestamp,
-                    "evolution_entry": evolution_entry,
-                }
-                if project_id:
-                    params["project_id"] = project_id
-                    session.run(
-                        "MERGE (a:Character {name: $source, project_id: $project_id}) "
-                        "MERGE (b:Character {name: $target, project_id: $project_id}) "
-                        "MERGE (a)-[r:RELATION {type: $type}]->(b) "
-                        "SET r.detail = $detail, r.current_state = $current_state, "
-                        "r.evolution = $evolution, r.start_chapter = $start_chapter, "
-                        "r.last_updated = $timestamp, r.project_id = $project_id, "
-                        "r.evolution_history = coalesce(r.evolution_history, []) + $evolution_entry",
-                        **params,
-                    )
-                else:
-                    session.run(
-                        "MERGE (a:Character {name: $source}) "
-                        "MERGE (b:Character {name: $target}) "
-                        "MERGE (a)-[r:RELATION {type: $type}]->(b) "
-                        "SET r.detail = $detail, r.current_state = $current_state, "
-                        "r.evolution = $evolution, r.start_chapter = $start_chapter, "
-                        "r.last_updated = $timestamp, "
-                        "r.evolution_history = coalesce(r.evolution_history, []) + $evolution_entry",
-                        **params,
-                    )
-            for event in facts.get("events", []):
-                name = event.get("name")
-                if not name:
-                    continue
-                event_chapter = self._resolve_chapter_index(event.get("chapter_index"), base_chapter)
-                unresolved_threads = self._normalize_list(event.get("unresolved_threads"))
-                unresolved = bool(unresolved_threads)
-                params = {
-                    "name": name,
-                    "summary": event.get("summary"),
-                    "time_reference": event.get("time_reference"),
-                    "impact": event.get("impact"),
-                    "chapter_index": event_chapter,
-                    "timestamp": timestamp,
-                    "unresolved": unresolved,
-                    "unresolved_threads": unresolved_threads,
-                }
-                if project_id:
-                    params["project_id"] = project_id
-                    session.run(
-                        "MERGE (e:Event {name: $name, project_id: $project_id}) "
-                        "ON CREATE SET e.created_chapter = $chapter_index, e.first_appearance = $timestamp "
-                        "SET e.summary = $summary, e.time_reference = $time_reference, "
-                        "e.impact = $impact, e.last_mentioned_chapter = $chapter_index, "
-                        "e.unresolved = $unresolved, e.unresolved_threads = $unresolved_threads, "
-                        "e.last_updated = $timestamp, e.project_id = $project_id",
-                        **params,
-                    )
-                else:
-                    session.run(
-                        "MERGE (e:Event {name: $name}) "
-                        "ON CREATE SET e.created_chapter = $chapter_index, e.first_appearance = $timestamp "
-                        "SET e.summary = $summary, e.time_reference = $time_reference, "
-                        "e.impact = $impact, e.last_mentioned_chapter = $chapter_index, "
-                        "e.unresolved = $unresolved, e.unresolved_threads = $unresolved_threads, "
-                        "e.last_updated = $timestamp",
-                        **params,
-                    )
+        self._write_graph_batches(*self._neo4j_fact_batches(facts, project_id, chapter_index), project_id)
 
     async def update_neo4j_async(
         self,
@@ -723,8 +1061,314 @@ class MemoryService:
         project_id: Optional[str] = None,
         chapter_index: Optional[int] = None,
     ) -> None:
-        """Async wrapper for Neo4j updates (uses thread fallback)."""
-        await asyncio.to_thread(self.update_neo4j, facts, project_id, chapter_index)
+        """Update Neo4j without blocking the event loop."""
+        if not self._graph_writable():
+            return
+        await self._write_graph_batches_async(
+            *self._neo4j_fact_batches(facts, project_id, chapter_index), project_id
+        )
+
+    async def persist_facts(
+        self,
+        facts: Dict[str, Any],
+        project_id: str,
+        chapter_id: str,
+        chapter_text: str,
+        summary: Optional[str],
+        chapter_index: Optional[int] = None,
+    ) -> None:
+        """Write extracted facts to Neo4j and the chapter to style memory concurrently."""
+        await asyncio.gather(
+            self._write_chapter_graph_async(facts, project_id, chapter_index),
+            asyncio.to_thread(
+                self.store_style_memory, project_id, chapter_id, chapter_text, summary
+            ),
+        )
+
+    async def _write_chapter_graph_async(
+        self,
+        facts: Dict[str, Any],
+        project_id: Optional[str],
+        chapter_index: Optional[int],
+    ) -> None:
+        """Write fact, object and location batches in one transaction.
+
+        Location and POSSESSES statements MATCH the characters MERGEd by the
+        fact batches, so they must run after them in the same transaction.
+        """
+        if not self._graph_writable():
+            return
+        batches, timestamp = self._neo4j_fact_batches(facts, project_id, chapter_index)
+        batches = [
+            *batches,
+            *self._neo4j_object_batches(facts, project_id, chapter_index)[0],
+            *self._neo4j_location_batches(facts, project_id, chapter_index)[0],
+        ]
+        await self._write_graph_batches_async(batches, timestamp, project_id)
+
+    def _graph_writable(self) -> bool:
+        return bool(self.neo4j_driver or self.neo4j_async_client)
+
+    def _write_graph_batches(
+        self,
+        batches: List[Tuple[str, List[Dict[str, Any]]]],
+        timestamp: str,
+        project_id: Optional[str],
+    ) -> None:
+        """Run UNWIND batches in a single write transaction on the sync driver."""
+        if not self.neo4j_driver or not batches:
+            return
+        database = settings.NEO4J_DATABASE or None
+
+        def write_batches(tx: Any) -> None:
+            for query, rows in batches:
+                tx.run(query, rows=rows, project_id=project_id, timestamp=timestamp)
+
+        with self.neo4j_driver.session(database=database) as session:
+            session.execute_write(write_batches)
+        _GRAPH_VERSIONS[project_id] = _GRAPH_VERSIONS.get(project_id, 0) + 1
+
+    async def _write_graph_batches_async(
+        self,
+        batches: List[Tuple[str, List[Dict[str, Any]]]],
+        timestamp: str,
+        project_id: Optional[str],
+    ) -> None:
+        """Run UNWIND batches on the async driver, or the sync one in a thread."""
+        if not batches:
+            return
+        async_client = self._async_graph_client()
+        if async_client is None:
+            await asyncio.to_thread(self._write_graph_batches, batches, timestamp, project_id)
+            return
+
+        async def write_batches(tx: Any) -> None:
+            for query, rows in batches:
+                await tx.run(query, rows=rows, project_id=project_id, timestamp=timestamp)
+
+        async with async_client.session() as session:
+            await session.execute_write(write_batches)
+        _GRAPH_VERSIONS[project_id] = _GRAPH_VERSIONS.get(project_id, 0) + 1
+
+    def preload(
+        self,
+        project_id: Optional[str],
+        object_names: List[str],
+        character_names: List[str],
+    ) -> None:
+        """
+        Fill the node cache for the objects and characters a chapter will check.
+
+        Runs one query per node kind; names without a node are cached as
+        missing so the following checks do not query them again.
+        """
+        if not self.neo4j_driver:
+            return
+        lookups = self._preload_lookups(project_id, object_names, character_names)
+        if not lookups:
+            return
+        for kind, query, params, key in lookups:
+            records = self._read_records(query, params)
+            self._cache_preloaded(kind, project_id, params["names"], records, key)
+
+    async def preload_async(
+        self,
+        project_id: Optional[str],
+        object_names: List[str],
+        character_names: List[str],
+    ) -> None:
+        """Async variant of preload."""
+        async_client = self._async_graph_client()
+        if async_client is None:
+            await asyncio.to_thread(self.preload, project_id, object_names, character_names)
+            return
+        lookups = self._preload_lookups(project_id, object_names, character_names)
+        if not lookups:
+            return
+        async def read_nodes(tx: Any) -> List[List[Any]]:
+            batches = []
+            for _, query, params, _ in lookups:
+                result = await tx.run(query, **params)
+                batches.append([record async for record in result])
+            return batches
+
+        with _ignore_missing_property_warnings():
+            async with async_client.session() as session:
+                batches = await session.execute_read(read_nodes)
+        for (kind, _, params, key), records in zip(lookups, batches):
+            self._cache_preloaded(kind, project_id, params["names"], records, key)
+
+    def _preload_lookups(
+        self,
+        project_id: Optional[str],
+        object_names: List[str],
+        character_names: List[str],
+    ) -> List[Tuple[str, str, Dict[str, Any], str]]:
+        """Build (kind, query, params, node key) for the names missing from the cache."""
+        specs = (
+            ("obj", "o", object_names, _CYPHER_FIND_OBJECTS_PROJECT, _CYPHER_FIND_OBJECTS),
+            ("char", "c", character_names, _CYPHER_FIND_CHARACTERS_PROJECT, _CYPHER_FIND_CHARACTERS),
+        )
+        lookups = []
+        for kind, key, names, project_query, query in specs:
+            missing = [
+                name for name in dict.fromkeys(names)
+                if name and not _cache_get(_node_cache_key(kind, name, project_id))[0]
+            ]
+            if not missing:
+                continue
+            params: Dict[str, Any] = {"names": missing}
+            if project_id:
+                params["project_id"] = project_id
+            lookups.append((kind, project_query if project_id else query, params, key))
+        return lookups
+
+    def _cache_preloaded(
+        self,
+        kind: str,
+        project_id: Optional[str],
+        names: List[str],
+        records: List[Any],
+        key: str,
+    ) -> None:
+        nodes = {record["name"]: dict(record[key]) for record in records}
+        for name in names:
+            _cache_put(_node_cache_key(kind, name, project_id), nodes.get(name))
+
+    def _read_records(self, query: str, params: Dict[str, Any]) -> List[Any]:
+        """
+        Run a read query through the driver's managed execute_query.
+
+        The driver reuses its pooled sessions and routes to a reader, instead
+        of every helper opening and tearing down its own session.
+        """
+        database = settings.NEO4J_DATABASE or None
+        with _ignore_missing_property_warnings():
+            return self.neo4j_driver.execute_query(
+                query, params, database_=database, routing_=_READ_ROUTING
+            ).records
+
+    def _fetch_graph_node(
+        self, query: str, params: Dict[str, Any], key: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return the properties of the single node matched by ``query``."""
+        records = self._read_records(query, params)
+        return dict(records[0][key]) if records else None
+
+    async def _fetch_graph_node_async(
+        self, async_client: Any, query: str, params: Dict[str, Any], key: str
+    ) -> Optional[Dict[str, Any]]:
+        async def read_node(tx: Any) -> Any:
+            result = await tx.run(query, **params)
+            return await result.single()
+
+        # A read transaction lets a cluster route the lookup to a follower
+        with _ignore_missing_property_warnings():
+            async with async_client.session() as session:
+                record = await session.execute_read(read_node)
+        return dict(record[key]) if record else None
+
+    def _neo4j_fact_batches(
+        self,
+        facts: Dict[str, Any],
+        project_id: Optional[str],
+        chapter_index: Optional[int],
+    ) -> Tuple[List[Tuple[str, List[Dict[str, Any]]]], str]:
+        """Build the (UNWIND query, rows) pairs written by update_neo4j."""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        base_chapter = self._resolve_chapter_index(chapter_index)
+
+        character_rows = []
+        for char in facts.get("characters", []):
+            name = char.get("name")
+            if not name:
+                continue
+            char_chapter = self._resolve_chapter_index(char.get("last_seen_chapter"), base_chapter)
+            status = char.get("status")
+            status_entry = []
+            if status and isinstance(char_chapter, int):
+                status_entry = [{"status": status, "chapter": char_chapter, "timestamp": timestamp}]
+            character_rows.append({
+                "name": name,
+                "role": char.get("role"),
+                "status": status,
+                "chapter_index": char_chapter,
+                "status_entry": status_entry,
+            })
+
+        location_rows = []
+        for loc in facts.get("locations", []):
+            name = loc.get("name")
+            if not name:
+                continue
+            location_rows.append({
+                "name": name,
+                "description": loc.get("description"),
+                "rules": self._normalize_list(loc.get("rules")),
+                "timeline_markers": self._normalize_list(loc.get("timeline_markers")),
+                "atmosphere": loc.get("atmosphere"),
+                "chapter_index": self._resolve_chapter_index(
+                    loc.get("last_mentioned_chapter"), base_chapter
+                ),
+            })
+
+        relation_rows = []
+        for rel in facts.get("relations", []):
+            source = rel.get("from")
+            target = rel.get("to")
+            rel_type = rel.get("type")
+            if not source or not target or not rel_type:
+                continue
+            rel_chapter = self._resolve_chapter_index(rel.get("start_chapter"), base_chapter)
+            current_state = rel.get("current_state")
+            evolution_entry = []
+            if current_state and isinstance(rel_chapter, int):
+                evolution_entry = [{"state": current_state, "chapter": rel_chapter, "timestamp": timestamp}]
+            relation_rows.append({
+                "source": source,
+                "target": target,
+                "type": rel_type,
+                "detail": rel.get("detail"),
+                "current_state": current_state,
+                "evolution": rel.get("evolution"),
+                "start_chapter": rel_chapter,
+                "evolution_entry": evolution_entry,
+            })
+
+        event_rows = []
+        for event in facts.get("events", []):
+            name = event.get("name")
+            if not name:
+                continue
+            unresolved_threads = self._normalize_list(event.get("unresolved_threads"))
+            event_rows.append({
+                "name": name,
+                "summary": event.get("summary"),
+                "time_reference": event.get("time_reference"),
+                "impact": event.get("impact"),
+                "chapter_index": self._resolve_chapter_index(event.get("chapter_index"), base_chapter),
+                "unresolved": bool(unresolved_threads),
+                "unresolved_threads": unresolved_threads,
+            })
+
+        if project_id:
+            character_query = _CYPHER_MERGE_CHARACTER_PROJECT
+            location_query = _CYPHER_MERGE_LOCATION_PROJECT
+            relation_query = _CYPHER_MERGE_RELATION_PROJECT
+            event_query = _CYPHER_MERGE_EVENT_PROJECT
+        else:
+            character_query = _CYPHER_MERGE_CHARACTER
+            location_query = _CYPHER_MERGE_LOCATION
+            relation_query = _CYPHER_MERGE_RELATION
+            event_query = _CYPHER_MERGE_EVENT
+
+        batches = [
+            (character_query, character_rows),
+            (location_query, location_rows),
+            (relation_query, relation_rows),
+            (event_query, event_rows),
+        ]
+        return [(query, rows) for query, rows in batches if rows], timestamp
 
     def query_character_evolution(
         self, character_name: str, project_id: Optional[str] = None
@@ -732,106 +1376,100 @@ class MemoryService:
         """Fetch the evolution of a character from Neo4j."""
         if not self.neo4j_driver:
             return {}
-        database = settings.NEO4J_DATABASE or None
         if project_id:
-            query = (
-                "MATCH (c:Character {name: $name, project_id: $project_id}) "
-                "RETURN c.name as name, c.status_history as status_history, "
-                "c.first_appearance as first_appearance, c.last_seen_chapter as last_seen_chapter"
-            )
+            query = _CYPHER_CHARACTER_EVOLUTION_PROJECT
             params = {"name": character_name, "project_id": project_id}
         else:
-            query = (
-                "MATCH (c:Character {name: $name}) "
-                "RETURN c.name as name, c.status_history as status_history, "
-                "c.first_appearance as first_appearance, c.last_seen_chapter as last_seen_chapter"
-            )
+            query = _CYPHER_CHARACTER_EVOLUTION
             params = {"name": character_name}
-        with self.neo4j_driver.session(database=database) as session:
-            result = session.run(query, **params)
-            record = result.single()
-            return dict(record) if record else {}
+        records = self._read_records(query, params)
+        return dict(records[0]) if records else {}
 
     def detect_character_contradictions(
         self, character_name: str, project_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Detect contradictions in character status history with caching."""
-        cache_key = f"contradictions:{project_id}:{character_name}"
-        cached = _NEO4J_CACHE.get(cache_key)
-        if cached and datetime.now(timezone.utc) - cached.get("timestamp", datetime.min.replace(tzinfo=timezone.utc)) < _NEO4J_CACHE_TTL:
-            return cached["result"]
+        cache_key = _node_cache_key("contradictions", character_name, project_id)
+        hit, cached = _cache_get(cache_key)
+        if hit:
+            return cached
 
         if not self.neo4j_driver:
             return []
         
-        database = settings.NEO4J_DATABASE or None
         if project_id:
-            match_clause = "MATCH (c:Character {name: $name, project_id: $project_id})"
+            query = _CYPHER_CHARACTER_RESURRECTIONS_PROJECT
+            params = {"name": character_name, "project_id": project_id}
         else:
-            match_clause = "MATCH (c:Character {name: $name})"
-        query = (
-            f"{match_clause} "
-            "UNWIND coalesce(c.status_history, []) as history "
-            "WITH c, history "
-            "ORDER BY history.chapter "
-            "WITH c, collect(history) as ordered_history "
-            "UNWIND range(0, size(ordered_history) - 2) as i "
-            "WITH c, ordered_history[i] as current, ordered_history[i + 1] as next "
-            "WHERE current.status = 'dead' AND next.status IN ['alive', 'active', 'healthy'] "
-            "RETURN {"
-            "  character: c.name, "
-            "  contradiction: 'resurrection', "
-            "  from_chapter: current.chapter, "
-            "  from_status: current.status, "
-            "  to_chapter: next.chapter, "
-            "  to_status: next.status"
-            "} as issue"
-        )
-        params = {"name": character_name}
-        if project_id:
-            params["project_id"] = project_id
-            
+            query = _CYPHER_CHARACTER_RESURRECTIONS
+            params = {"name": character_name}
+
         result_list = []
         try:
-            with self.neo4j_driver.session(database=database) as session:
-                result = session.run(query, **params)
-                result_list = [dict(record["issue"]) for record in result]
+            # Map results already arrive as dicts; no per-row copy needed
+            result_list = [record["issue"] for record in self._read_records(query, params)]
         except Exception as e:
             logger.error(f"Error checking contradictions for {character_name}: {e}")
             return []
 
-        _NEO4J_CACHE[cache_key] = {
-            "result": result_list,
-            "timestamp": datetime.now(timezone.utc)
-        }
+        _cache_put(cache_key, result_list)
         return result_list
 
+    def detect_character_contradictions_batch(
+        self, character_names: List[str], project_id: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Detect contradictions for several characters in one graph round-trip.
+
+        Names already in the cache are served from it; the rest share a single
+        UNWIND query and are cached individually, like the per-name variant.
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        missing = []
+        for name in dict.fromkeys(character_names):
+            hit, cached = _cache_get(_node_cache_key("contradictions", name, project_id))
+            if hit:
+                results[name] = cached
+            else:
+                missing.append(name)
+        if not missing:
+            return results
+        if not self.neo4j_driver:
+            return {**results, **{name: [] for name in missing}}
+
+        if project_id:
+            query = _CYPHER_CHARACTERS_RESURRECTIONS_PROJECT
+            params: Dict[str, Any] = {"names": missing, "project_id": project_id}
+        else:
+            query = _CYPHER_CHARACTERS_RESURRECTIONS
+            params = {"names": missing}
+        try:
+            records = self._read_records(query, params)
+        except Exception as e:
+            logger.error(f"Error checking contradictions for {len(missing)} characters: {e}")
+            return {**results, **{name: [] for name in missing}}
+
+        found: Dict[str, List[Dict[str, Any]]] = {name: [] for name in missing}
+        for record in records:
+            issue = record["issue"]
+            found.setdefault(issue.get("character"), []).append(issue)
+        for name in missing:
+            _cache_put(_node_cache_key("contradictions", name, project_id), found[name])
+        return {**results, **found}
+
     def query_relationship_evolution(
         self, char_a: str, char_b: str, project_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Fetch the evolution of a relationship between two characters."""
         if not self.neo4j_driver:
             return []
-        database = settings.NEO4J_DATABASE or None
         if project_id:
-            query = (
-                "MATCH (a:Character {name: $char_a, project_id: $project_id})"
-                "-[r:RELATION]->"
-                "(b:Character {name: $char_b, project_id: $project_id}) "
-                "RETURN r.type as type, r.start_chapter as start_chapter, "
-                "r.evolution_history as evolution, r.current_state as current_state"
-            )
+            query = _CYPHER_RELATION_EVOLUTION_PROJECT
             params = {"char_a": char_a, "char_b": char_b, "project_id": project_id}
         else:
-            query = (
-                "MATCH (a:Character {name: $char_a})-[r:RELATION]->(b:Character {name: $char_b}) "
-                "RETURN r.type as type, r.start_chapter as start_chapter, "
-                "r.evolution_history as evolution, r.current_state as current_state"
-            )
+            query = _CYPHER_RELATION_EVOLUTION
             params = {"char_a": char_a, "char_b": char_b}
-        with self.neo4j_driver.session(database=database) as session:
-            result = session.run(query, **params)
-            return [dict(record) for record in result]
+        return [dict(record) for record in self._read_records(query, params)]
 
     def find_orphaned_plot_threads(
         self, current_chapter: Optional[int], project_id: Optional[str] = None
@@ -843,90 +1481,53 @@ class MemoryService:
         if chapter_value is None:
             return []
         cutoff = chapter_value - 10
-        database = settings.NEO4J_DATABASE or None
-        with self.neo4j_driver.session(database=database) as session:
-            if project_id:
-                count_result = session.run(
-                    "MATCH (e:Event {project_id: $project_id}) RETURN count(e) as total",
-                    project_id=project_id,
-                ).single()
-            else:
-                count_result = session.run(
-                    "MATCH (e:Event) RETURN count(e) as total"
-                ).single()
-            total = count_result.get("total") if count_result else 0
-            if not total:
-                return []
         if project_id:
-            query = (
-                "MATCH (e:Event {project_id: $project_id}) "
-                "WHERE e.unresolved = true AND e.last_mentioned_chapter < $cutoff "
-                "RETURN e.name as event, e.last_mentioned_chapter as last_mentioned, e.summary as summary "
-                "ORDER BY e.last_mentioned_chapter"
-            )
+            query = _CYPHER_ORPHANED_THREADS_PROJECT
             params = {"project_id": project_id, "cutoff": cutoff}
         else:
-            query = (
-                "MATCH (e:Event) "
-                "WHERE e.unresolved = true AND e.last_mentioned_chapter < $cutoff "
-                "RETURN e.name as event, e.last_mentioned_chapter as last_mentioned, e.summary as summary "
-                "ORDER BY e.last_mentioned_chapter"
-            )
+            query = _CYPHER_ORPHANED_THREADS
             params = {"cutoff": cutoff}
-        with self.neo4j_driver.session(database=database) as session:
-            result = session.run(query, **params)
-            return [dict(record) for record in result]
+        return [dict(record) for record in self._read_records(query, params)]
 
     def export_graph_for_visualization(self, project_id: Optional[str] = None) -> Dict[str, Any]:
         """Export Neo4j nodes and edges for visualization."""
         if not self.neo4j_driver:
             return {"nodes": [], "edges": []}
-        database = settings.NEO4J_DATABASE or None
         max_nodes = 500
         if project_id:
-            node_query = (
-                "MATCH (n) WHERE n.project_id = $project_id "
-                "RETURN id(n) as id, labels(n) as labels, n as props "
-                "LIMIT $limit"
-            )
-            edge_query = (
-                "MATCH (a)-[r]->(b) WHERE a.project_id = $project_id AND b.project_id = $project_id "
-                "RETURN id(a) as source, id(b) as target, type(r) as type, r as props "
-                "LIMIT $limit"
-            )
-            params = {"project_id": project_id, "limit": max_nodes}
+            query = _CYPHER_EXPORT_GRAPH_PROJECT
+            params: Dict[str, Any] = {"project_id": project_id, "limit": max_nodes}
         else:
-            node_query = "MATCH (n) RETURN id(n) as id, labels(n) as labels, n as props LIMIT $limit"
-            edge_query = "MATCH (a)-[r]->(b) RETURN id(a) as source, id(b) as target, type(r) as type, r as props LIMIT $limit"
+            query = _CYPHER_EXPORT_GRAPH
             params = {"limit": max_nodes}
+        records = self._read_records(query, params)
+        graph = records[0] if records else {}
         nodes: List[Dict[str, Any]] = []
         edges: List[Dict[str, Any]] = []
-        with self.neo4j_driver.session(database=database) as session:
-            for record in session.run(node_query, **params):
-                labels = record.get("labels") or []
-                props = record.get("props")
-                props_dict = dict(props) if isinstance(props, dict) or props is not None else {}
-                label = props_dict.get("name") or props_dict.get("title") or ""
-                node_type = labels[0] if labels else "Node"
-                nodes.append(
-                    {
-                        "id": str(record.get("id")),
-                        "label": label,
-                        "type": node_type,
-                        "properties": props_dict,
-                    }
-                )
-            for record in session.run(edge_query, **params):
-                props = record.get("props")
-                props_dict = dict(props) if isinstance(props, dict) or props is not None else {}
-                edges.append(
-                    {
-                        "source": str(record.get("source")),
-                        "target": str(record.get("target")),
-                        "type": record.get("type"),
-                        "properties": props_dict,
-                    }
-                )
+        # properties() returns plain maps, so records need no per-item copy
+        for record in graph.get("nodes") or []:
+            labels = record.get("labels") or []
+            props_dict = record.get("props") or {}
+            label = props_dict.get("name") or props_dict.get("title") or ""
+            node_type = labels[0] if labels else "Node"
+            nodes.append(
+                {
+                    "id": str(record.get("id")),
+                    "label": label,
+                    "type": node_type,
+                    "properties": props_dict,
+                }
+            )
+        for record in graph.get("edges") or []:
+            props_dict = record.get("props") or {}
+            edges.append(
+                {
+                    "source": str(record.get("source")),
+                    "target": str(record.get("target")),
+                    "type": record.get("type"),
+                    "properties": props_dict,
+                }
+            )
         return {"nodes": nodes, "edges": edges}
 
     def store_style_memory(
@@ -935,69 +1536,175 @@ class MemoryService:
         chapter_id: str,
         chapter_text: str,
         summary: Optional[str],
+        metadata: Optional[Dict[str, Any]] = None,
+        embedding: Optional[np.ndarray] = None,
     ) -> None:
-        if not self.chroma_client:
+        self.store_style_memory_batch(
+            project_id,
+            [
+                {
+                    "chapter_id": chapter_id,
+                    "chapter_text": chapter_text,
+                    "summary": summary,
+                    "metadata": metadata,
+                    "embedding": embedding,
+                }
+            ],
+        )
+
+    def store_style_memory_batch(self, project_id: str, entries: List[Dict[str, Any]]) -> None:
+        """
+        Store several style memory entries with a single Chroma upsert.
+
+        Each entry takes the store_style_memory arguments as keys: chapter_id,
+        chapter_text, summary and optionally metadata and embedding.
+        """
+        if not self.chroma_client or not entries:
             return
-        collection_name = f"{settings.CHROMA_COLLECTION_PREFIX}-{project_id}"
-        collection = self.chroma_client.get_or_create_collection(collection_name)
-        collection.add(
-            documents=[chapter_text],
-            ids=[chapter_id],
-            metadatas=[{"summary": summary or "", "project_id": project_id}],
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for item in entries:
+            entry: Dict[str, Any] = {"summary": item.get("summary") or "", "project_id": project_id}
+            if item.get("metadata"):
+                entry.update(item["metadata"])
+            embedding = item.get("embedding")
+            if embedding is not None:
+                # Unit-normalized FP16 vector, base64-encoded to fit Chroma metadata
+                entry["embedding_f16"] = base64.b64encode(
+                    np.asarray(embedding, dtype=np.float16).tobytes()
+                ).decode("ascii")
+            ids.append(item["chapter_id"])
+            documents.append(item["chapter_text"])
+            metadatas.append(entry)
+        collection = self._style_collection(project_id)
+        # Ids are deterministic per chapter and dialogue, and add() ignores
+        # existing ids, so revised chapters would keep their stale entries
+        collection.upsert(
+            documents=documents,
+            ids=ids,
+            metadatas=metadatas,
         )
 
     def retrieve_style_memory(self, project_id: str, query: str, top_k: int = 3) -> List[str]:
         if not self.chroma_client:
             return []
-        collection_name = f"{settings.CHROMA_COLLECTION_PREFIX}-{project_id}"
-        collection = self.chroma_client.get_or_create_collection(collection_name)
+        collection = self._style_collection(project_id)
         results = collection.query(query_texts=[query], n_results=top_k)
         return results.get("documents", [[]])[0]
 
+    def retrieve_style_embeddings(
+        self, project_id: str, query: str, top_k: int = 3
+    ) -> Tuple[List[str], Optional[np.ndarray]]:
+        """
+        Retrieve style memory documents with their stored FP16 embeddings.
+
+        The embeddings are None unless every returned document carries one.
+        """
+        return self.retrieve_style_embeddings_batch(project_id, [query], top_k)[0]
+
+    def retrieve_style_embeddings_batch(
+        self, project_id: str, queries: List[str], top_k: int = 3
+    ) -> List[Tuple[List[str], Optional[np.ndarray]]]:
+        """Run several style memory queries in one Chroma round trip."""
+        if not self.chroma_client or not queries:
+            return [([], None) for _ in queries]
+        collection = self._style_collection(project_id)
+        results = collection.query(
+            query_texts=queries,
+            n_results=top_k,
+            include=["documents", "metadatas"],
+        )
+        documents = results.get("documents") or []
+        metadatas = results.get("metadatas") or []
+        return [
+            self._decode_style_embeddings(
+                documents[i] if i < len(documents) else [],
+                (metadatas[i] if i < len(metadatas) else None) or [],
+            )
+            for i in range(len(queries))
+        ]
+
+    def _style_collection(self, project_id: str) -> Any:
+        """Return the project's style collection, looked up once per service."""
+        collection = self._collections.get(project_id)
+        if collection is None:
+            collection_name = f"{settings.CHROMA_COLLECTION_PREFIX}-{project_id}"
+            collection = self.chroma_client.get_or_create_collection(collection_name)
+            self._collections[project_id] = collection
+        return collection
+
+    def _decode_style_embeddings(
+        self, documents: List[str], metadatas: List[Optional[Dict[str, Any]]]
+    ) -> Tuple[List[str], Optional[np.ndarray]]:
+        encoded = [(item or {}).get("embedding_f16") for item in metadatas]
+        if not documents or len(encoded) != len(documents) or not all(encoded):
+            return documents, None
+        embeddings = np.stack(
+            [np.frombuffer(base64.b64decode(value), dtype=np.float16) for value in encoded]
+        )
+        return documents, embeddings
+
     def _safe_json(self, text: str) -> Dict[str, Any]:
+        facts = self._parse_facts(text)
+        return facts if facts is not None else self._empty_facts()
+
+    def _parse_facts(self, text: str) -> Optional[Dict[str, Any]]:
+        """Normalized facts of a JSON object reply, or None when it does not parse."""
         try:
-            payload = json.loads(text)
-            if isinstance(payload, dict):
-                return self._normalize_facts_payload(payload)
-        except json.JSONDecodeError:
-            pass
-        return self._empty_facts()
+            payload = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        return self._normalize_facts_payload(payload)
 
     def _empty_facts(self) -> Dict[str, Any]:
-        return {
-            "summary": "", 
-            "characters": [], 
-            "locations": [], 
-            "relations": [], 
-            "events": [], 
-            "objects": [], 
-            "character_locations": []
-        }
+        facts: Dict[str, Any] = {key: [] for key in _FACT_LIST_KEYS}
+        return {"summary": "", **facts}
 
     def _normalize_facts_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "summary": payload.get("summary") or "",
-            "characters": self._ensure_list(payload.get("characters")),
-            "locations": self._ensure_list(payload.get("locations")),
-            "relations": self._ensure_list(payload.get("relations")),
-            "events": self._ensure_list(payload.get("events")),
-            "objects": self._ensure_list(payload.get("objects")),
-            "character_locations": self._ensure_list(payload.get("character_locations")),
-        }
+        normalized: Dict[str, Any] = {"summary": payload.get("summary") or ""}
+        for key in _FACT_LIST_KEYS:
+            value = payload.get(key)
+            # Sections the model left out or sent empty skip the item filter
+            normalized[key] = self._ensure_list(value) if value else []
+        return normalized
 
     def _ensure_list(self, value: Any) -> List[Dict[str, Any]]:
         if isinstance(value, list):
             return [item for item in value if isinstance(item, dict)]
         return []
 
-    def _select_extraction_chunks(self, chapter_text: str, max_chars: int) -> List[str]:
+    def _select_extraction_chunks(
+        self,
+        chapter_text: str,
+        max_chars: int,
+        max_tokens: Optional[int] = None,
+    ) -> List[str]:
+        encoding = _get_token_encoding() if max_tokens else None
+        if encoding is not None:
+            tokens = encoding.encode(chapter_text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return [chapter_text]
+            # A token cut can split a multi-byte character, which decodes to
+            # U+FFFD; strip it and cut the original text on the character offset
+            head = len(encoding.decode(tokens[:max_tokens]).rstrip("\ufffd"))
+            tail = len(encoding.decode(tokens[-max_tokens:]).lstrip("\ufffd"))
+            return [chapter_text[:head], chapter_text[-tail:] if tail else ""]
         if len(chapter_text) <= max_chars:
-            return [chapter_text[:max_chars]]
-        start = chapter_text[:max_chars]
-        end = chapter_text[-max_chars:]
-        return [start, end]
+            return [chapter_text]
+        return [chapter_text[:max_chars], chapter_text[-max_chars:]]
 
     async def _extract_facts_chunk(self, chapter_text: str) -> Dict[str, Any]:
+        key = hashlib.blake2b(chapter_text.encode("utf-8"), digest_size=16).digest()
+        with _EXTRACTION_CACHE_LOCK:
+            cached = _EXTRACTION_CACHE.get(key)
+        # The merge helpers update fact entries in place, so callers always
+        # get a copy and the cached payload stays untouched
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         prompt = self._build_extraction_prompt(chapter_text)
         response = await self.llm_client.chat(
             messages=[{"role": "user", "content": prompt}],
@@ -1005,30 +1712,19 @@ class MemoryService:
             max_tokens=1200,
             response_format={"type": "json_object"},
         )
-        facts = self._safe_json(response)
+        facts = self._parse_facts(response)
+        if facts is None:
+            # Empty, truncated or non-JSON replies are retried on the next call
+            facts = self._empty_facts()
+        else:
+            with _EXTRACTION_CACHE_LOCK:
+                _EXTRACTION_CACHE[key] = copy.deepcopy(facts)
         if not facts.get("characters") and not facts.get("locations"):
             logger.debug("Memory extraction returned minimal data.")
         return facts
 
     def _build_extraction_prompt(self, chapter_text: str) -> str:
-        return (
-            "Tu es un assistant de coherence narrative. Reponds en francais uniquement.\n"
-            "Extrait les faits de continuite en JSON strict avec les cles: summary, characters, locations, "
-            "relations, events, objects, character_locations.\n"
-            "Utilise des cles snake_case ASCII. Si une info manque, laisse le champ vide.\n\n"
-            "characters: liste de {name, role, status, current_state, motivations, traits, goals, arc_stage, "
-            "last_seen_chapter, relationships}\n"
-            "locations: liste de {name, description, rules, timeline_markers, atmosphere, last_mentioned_chapter}\n"
-            "relations: liste de {from, to, type, detail, start_chapter, current_state, evolution}\n"
-            "events: liste de {name, summary, chapter_index, time_reference, impact, unresolved_threads}\n"
-            "objects: liste de {name, description, status, current_holder, location, "
-            "lost_at_chapter, found_at_chapter, importance, magical_properties}\n"
-            "character_locations: liste de {character_name, location, chapter_index, "
-            "travel_from, travel_to, arrival_confirmed}\n\n"
-            "status pour objects: possessed, lost, destroyed, hidden, transferred\n"
-            "Retourne uniquement le JSON.\n\n"
-            f"Chapitre:\n{chapter_text}"
-        )
+        return _EXTRACTION_PROMPT_HEADER + chapter_text
 
     def _merge_fact_payloads(self, current: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
         merged = self._empty_facts()
@@ -1045,9 +1741,15 @@ class MemoryService:
         merged["events"] = self._merge_events(
             current.get("events", []), incoming.get("events", [])
         )
-        # Note: objects and character_locations are currently not merged deeply in memory context 
-        # but are tracked in Neo4j. We can simply extend the list or pick the latest for context block if needed.
-        # For now, we mainly rely on Neo4j for these.
+        # Objects and character locations are only tracked in Neo4j, so the
+        # per-chunk lists are carried through for the graph writes
+        merged["objects"] = self._merge_named(
+            current.get("objects", []), incoming.get("objects", [])
+        )
+        merged["character_locations"] = [
+            *current.get("character_locations", []),
+            *incoming.get("character_locations", []),
+        ]
         return merged
 
     def _merge_summary(self, current: Optional[str], incoming: Optional[str]) -> str:
@@ -1057,34 +1759,45 @@ class MemoryService:
             return f"{current} / {incoming}"
         return incoming or current
 
-    def _merge_characters(self, existing: List[Dict[str, Any]], incoming: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _merge_characters(
+        self,
+        existing: List[Dict[str, Any]],
+        incoming: List[Dict[str, Any]],
+        timestamp: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat()
         by_name = {item.get("name"): item for item in existing if item.get("name")}
         for item in incoming:
             name = item.get("name")
             if not name:
                 continue
-            current = by_name.get(name, {})
-            merged = {**current, **item}
-            merged["motivations"] = self._merge_unique_list(
-                current.get("motivations"), item.get("motivations")
-            )
-            merged["traits"] = self._merge_unique_list(current.get("traits"), item.get("traits"))
-            merged["goals"] = self._merge_unique_list(current.get("goals"), item.get("goals"))
-            merged["relationships"] = self._merge_unique_list(
-                current.get("relationships"), item.get("relationships")
-            )
-            merged["last_seen_chapter"] = self._merge_numeric_max(
-                current.get("last_seen_chapter"), item.get("last_seen_chapter")
-            )
-            merged = self._merge_with_temporal_tracking(
-                merged,
+            current = by_name.setdefault(name, {})
+            # Derived fields read the previous values, so compute them before
+            # updating the entity in place
+            derived = {
+                "motivations": self._merge_unique_list(
+                    current.get("motivations"), item.get("motivations")
+                ),
+                "traits": self._merge_unique_list(current.get("traits"), item.get("traits")),
+                "goals": self._merge_unique_list(current.get("goals"), item.get("goals")),
+                "relationships": self._merge_unique_list(
+                    current.get("relationships"), item.get("relationships")
+                ),
+                "last_seen_chapter": self._merge_numeric_max(
+                    current.get("last_seen_chapter"), item.get("last_seen_chapter")
+                ),
+            }
+            self._merge_with_temporal_tracking(
+                derived,
                 current,
                 item,
                 field="status",
                 history_field="status_history",
                 chapter_field="last_seen_chapter",
+                timestamp=timestamp,
             )
-            by_name[name] = merged
+            current.update(item)
+            current.update(derived)
         return list(by_name.values())
 
     def _merge_locations(self, existing: List[Dict[str, Any]], incoming: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1093,16 +1806,18 @@ class MemoryService:
             name = item.get("name")
             if not name:
                 continue
-            current = by_name.get(name, {})
-            merged = {**current, **item}
-            merged["rules"] = self._merge_unique_list(current.get("rules"), item.get("rules"))
-            merged["timeline_markers"] = self._merge_unique_list(
+            current = by_name.setdefault(name, {})
+            rules = self._merge_unique_list(current.get("rules"), item.get("rules"))
+            markers = self._merge_unique_list(
                 current.get("timeline_markers"), item.get("timeline_markers")
             )
-            merged["last_mentioned_chapter"] = self._merge_numeric_max(
+            last_mentioned = self._merge_numeric_max(
                 current.get("last_mentioned_chapter"), item.get("last_mentioned_chapter")
             )
-            by_name[name] = merged
+            current.update(item)
+            current["rules"] = rules
+            current["timeline_markers"] = markers
+            current["last_mentioned_chapter"] = last_mentioned
         return list(by_name.values())
 
     def _merge_events(self, existing: List[Dict[str, Any]], incoming: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1111,26 +1826,33 @@ class MemoryService:
             name = item.get("name")
             if not name:
                 continue
-            current = by_name.get(name, {})
-            merged = {**current, **item}
-            merged["unresolved_threads"] = self._merge_unique_list(
+            current = by_name.setdefault(name, {})
+            threads = self._merge_unique_list(
                 current.get("unresolved_threads"), item.get("unresolved_threads")
             )
-            merged["chapter_index"] = self._merge_numeric_max(
+            chapter_index = self._merge_numeric_max(
                 current.get("chapter_index"), item.get("chapter_index")
             )
-            by_name[name] = merged
+            current.update(item)
+            current["unresolved_threads"] = threads
+            current["chapter_index"] = chapter_index
         return list(by_name.values())
 
     def _merge_named(self, existing: List[Dict[str, Any]], incoming: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        by_name = {item.get("name"): item for item in existing if item.get("name")}
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for item in existing:
+            name = item.get("name")
+            if name:
+                by_name[name] = item
         for item in incoming:
             name = item.get("name")
             if not name:
                 continue
-            current = by_name.get(name, {})
-            merged = {**current, **item}
-            by_name[name] = merged
+            current = by_name.get(name)
+            if current is None:
+                by_name[name] = dict(item)
+            else:
+                current.update(item)
         return list(by_name.values())
 
     def _merge_relations(self, existing: List[Dict[str, Any]], incoming: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1140,30 +1862,26 @@ class MemoryService:
         by_key = {key(rel): rel for rel in existing}
         for rel in incoming:
             rel_key = key(rel)
-            if rel_key in by_key:
-                current = by_key[rel_key]
-                merged = {**current, **rel}
-                merged["start_chapter"] = self._merge_numeric_min(
-                    current.get("start_chapter"), rel.get("start_chapter")
-                )
-                by_key[rel_key] = merged
-            else:
-                by_key[rel_key] = rel
+            current = by_key.get(rel_key)
+            if current is None:
+                by_key[rel_key] = dict(rel)
+                continue
+            start_chapter = self._merge_numeric_min(
+                current.get("start_chapter"), rel.get("start_chapter")
+            )
+            current.update(rel)
+            current["start_chapter"] = start_chapter
         return list(by_key.values())
 
     def _stringify_items(self, items: List[Dict[str, Any]]) -> str:
-        names = [str(item.get("name")) for item in items if item.get("name")]
-        return ", ".join(names) if names else "none"
+        return ", ".join(str(name) for item in items if (name := item.get("name"))) or "none"
 
     def _stringify_relations(self, relations: List[Dict[str, Any]]) -> str:
-        parts = []
-        for rel in relations:
-            source = rel.get("from")
-            target = rel.get("to")
-            rel_type = rel.get("type")
-            if source and target and rel_type:
-                parts.append(f"{source} -[{rel_type}]-> {target}")
-        return "; ".join(parts) if parts else "none"
+        return "; ".join(
+            f"{source} -[{rel_type}]-> {target}"
+            for rel in relations
+            if (source := rel.get("from")) and (target := rel.get("to")) and (rel_type := rel.get("type"))
+        ) or "none"
 
     def _merge_with_temporal_tracking(
         self,
@@ -1173,50 +1891,43 @@ class MemoryService:
         field: str,
         history_field: str,
         chapter_field: str,
+        timestamp: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Track changes to a field over time by storing a history list."""
         previous = existing.get(field)
         new_value = incoming.get(field)
-        history = list(existing.get(history_field) or [])
-        if new_value and new_value != previous:
-            history.append(
-                {
-                    "value": new_value,
-                    "chapter_index": incoming.get(chapter_field),
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
-            )
-        if history:
-            merged[history_field] = history
+        existing_history = existing.get(history_field)
+        if not new_value or new_value == previous:
+            # Nothing to append; the history is never mutated, so share it
+            if existing_history:
+                merged[history_field] = existing_history
+            return merged
+        history = list(existing_history or [])
+        history.append(
+            {
+                "value": new_value,
+                "chapter_index": incoming.get(chapter_field),
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        merged[history_field] = history
         return merged
 
     def _merge_unique_list(self, current: Any, incoming: Any) -> List[str]:
-        items = []
-        items.extend(self._normalize_list(current))
-        items.extend(self._normalize_list(incoming))
-        seen = set()
-        unique = []
-        for item in items:
-            if item not in seen:
-                seen.add(item)
-                unique.append(item)
-        return unique
+        # dict.fromkeys keeps first-seen order while dropping duplicates
+        return list(dict.fromkeys(
+            chain(self._normalize_list(current), self._normalize_list(incoming))
+        ))
 
     def _normalize_list(self, value: Any) -> List[str]:
         if value is None:
             return []
         raw_items = value if isinstance(value, list) else [value]
-        cleaned = []
-        for item in raw_items:
-            if item is None:
-                continue
-            if isinstance(item, str):
-                text = item.strip()
-            else:
-                text = str(item).strip()
-            if text:
-                cleaned.append(text)
-        return cleaned
+        # str() returns str items unchanged, so one comprehension covers both
+        return [
+            text for item in raw_items
+            if item is not None and (text := str(item).strip())
+        ]
 
     def _resolve_chapter_index(self, *values: Any) -> Optional[int]:
         for value in values:
@@ -1310,6 +2021,3 @@ class MemoryService:
             "non resolus pour entretenir la tension et eviter les contradictions. Si un element est ambigu, "
             "privilegie une formulation prudente ou une transition explicative pour conserver la coherence globale."
         )
-
-    def _word_count(self, text: str) -> int:
-        return len(text.split())
@@ -4,17 +4,22 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
-import json
+import asyncio
 import math
 
+import orjson
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.project import Project
+from app.services._genre_labels import genre_label
 from app.services.llm_client import DeepSeekClient
 from app.core.config import settings
 
+# Concept previews requested at once, so a recent-title collision needs no retry
+_CONCEPT_CANDIDATES = 3
+
 
 class NovellaForgeService:
     """Generate concept and planning assets for serial novels."""
@@ -25,22 +30,7 @@ class NovellaForgeService:
 
     def _genre_label(self, genre: str) -> str:
         key = (genre or "fiction").strip().lower()
-        labels = {
-            "werewolf": "loup-garou",
-            "billionaire": "milliardaire",
-            "mafia": "mafia",
-            "fantasy": "fantasy",
-            "vengeance": "vengeance",
-            "romance": "romance",
-            "thriller": "thriller",
-            "fiction": "fiction",
-            "scifi": "science-fiction",
-            "mystery": "mystere",
-            "horror": "horreur",
-            "historical": "historique",
-            "other": "autre",
-        }
-        return labels.get(key, key.replace("_", " "))
+        return genre_label(key)
 
     def _concept_fallback(self, genre: str) -> Dict[str, Any]:
         genre_label = self._genre_label(genre)
@@ -103,44 +93,53 @@ class NovellaForgeService:
         avoid_set = {title.casefold() for title in avoid_titles if isinstance(title, str)}
         fallback = self._concept_fallback(genre)
 
-        for _ in range(3):
-            prompt = self._build_concept_prompt(
-                genre,
-                notes,
-                avoid_titles=avoid_titles,
-                variation_seed=str(uuid4()),
-            )
-            response = await self.llm_client.chat(
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.8,
-                max_tokens=700,
-                response_format={"type": "json_object"},
-            )
-            concept = self._parse_json(response, fallback=fallback)
-            if not isinstance(concept, dict):
-                concept = fallback
-            for key, value in fallback.items():
-                if concept.get(key) in (None, "", []):
-                    concept[key] = value
-            tropes = concept.get("tropes")
-            if isinstance(tropes, str):
-                concept["tropes"] = [item.strip() for item in tropes.split(",") if item.strip()]
-            elif not isinstance(tropes, list):
-                concept["tropes"] = fallback["tropes"]
-            for key in ("title", "premise", "tone", "emotional_orientation"):
-                if not isinstance(concept.get(key), str):
-                    concept[key] = str(concept.get(key) or fallback[key])
+        # The first candidate in request order with an unused title wins
+        responses = await asyncio.gather(
+            *(
+                self.llm_client.chat(
+                    messages=[{
+                        "role": "user",
+                        "content": self._build_concept_prompt(
+                            genre,
+                            notes,
+                            avoid_titles=avoid_titles,
+                            variation_seed=str(uuid4()),
+                        ),
+                    }],
+                    temperature=0.8,
+                    max_tokens=700,
+                    response_format={"type": "json_object"},
+                )
+                for _ in range(_CONCEPT_CANDIDATES)
+            ),
+            return_exceptions=True,
+        )
+        successful = [response for response in responses if not isinstance(response, BaseException)]
+        if not successful:
+            raise responses[0]
 
+        for response in successful:
+            concept = self._normalize_concept(response, fallback)
             title = (concept.get("title") or "").strip()
-            if not title:
+            if not title or title.casefold() not in avoid_set:
                 return concept
-            normalized = title.casefold()
-            if normalized in avoid_set:
-                avoid_titles.append(title)
-                avoid_set.add(normalized)
-                continue
-            return concept
+        return concept
 
+    def _normalize_concept(self, response: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+        concept = self._parse_json(response, fallback=fallback)
+        if not isinstance(concept, dict):
+            concept = fallback
+        for key, value in fallback.items():
+            if concept.get(key) in (None, "", []):
+                concept[key] = value
+        tropes = concept.get("tropes")
+        if isinstance(tropes, str):
+            concept["tropes"] = [item.strip() for item in tropes.split(",") if item.strip()]
+        elif not isinstance(tropes, list):
+            concept["tropes"] = fallback["tropes"]
+        for key in ("title", "premise", "tone", "emotional_orientation"):
+            if not isinstance(concept.get(key), str):
+                concept[key] = str(concept.get(key) or fallback[key])
         return concept
 
     async def _get_recent_titles(self, user_id: Optional[UUID], genre: str, limit: int = 8) -> List[str]:
@@ -338,10 +337,10 @@ class NovellaForgeService:
 
     def _parse_json(self, text: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            payload = json.loads(text)
+            payload = orjson.loads(text)
             if isinstance(payload, dict):
                 return payload
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
         return fallback
 
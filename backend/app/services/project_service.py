@@ -7,6 +7,7 @@ from fastapi import HTTPException, status
 
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services._genre_labels import genre_label
 from app.core.config import settings
 
 
@@ -84,22 +85,7 @@ class ProjectService:
         title = project_data.title
         if not title:
             genre_key = project_data.genre.value if hasattr(project_data.genre, 'value') else project_data.genre
-            genre_label = {
-                "werewolf": "loup-garou",
-                "billionaire": "milliardaire",
-                "mafia": "mafia",
-                "fantasy": "fantasy",
-                "vengeance": "vengeance",
-                "romance": "romance",
-                "thriller": "thriller",
-                "fiction": "fiction",
-                "scifi": "science-fiction",
-                "mystery": "mystere",
-                "horror": "horreur",
-                "historical": "historique",
-                "other": "autre",
-            }.get(genre_key, genre_key.replace("_", " "))
-            title = f"Projet {genre_label} sans titre"
+            title = f"Projet {genre_label(genre_key)} sans titre"
 
         target_word_count = project_data.target_word_count or 200000
         project_metadata: Dict[str, Any] = {
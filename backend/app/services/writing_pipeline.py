@@ -6,6 +6,7 @@ from uuid import UUID, uuid4
 from datetime import datetime, timezone
 from collections import OrderedDict
 import asyncio
+import copy
 import hashlib
 import json
 import logging
@@ -217,17 +218,16 @@ class WritingPipeline:
     async def retrieve_context(self, state: NovelState) -> Dict[str, Any]:
         start = time.perf_counter()
         try:
-            metadata = state.get("project_context", {}).get("project", {}).get("metadata", {})
+            continuity = state.get("project_context", {}).get("project", {}).get("continuity") or {}
             chapter_index = state.get("chapter_index") or 1
             
             # Composite key for cache (integrity + relevance)
-            cache_identity = {"metadata": metadata, "chapter_index": chapter_index}
+            cache_identity = {"continuity": continuity, "chapter_index": chapter_index}
             
             # 1. Try to get cached memory context
             memory_context = await self.cache_service.get_memory_context(cache_identity)
             if not memory_context:
                 # Use Smart Truncation
-                continuity = metadata.get("continuity", {})
                 memory_context = SmartContextTruncator.truncate_memory_context(
                     continuity,
                     max_chars=settings.MEMORY_CONTEXT_MAX_CHARS,
@@ -491,7 +491,7 @@ class WritingPipeline:
             previous_block = self._build_previous_beats_block(
                 beat_texts[:-1], settings.WRITE_PREVIOUS_BEATS_MAX_CHARS
             )
-            current_words = self._count_words("\n\n".join(beat_texts[:-1]))
+            current_words = sum(self._count_words(text) for text in beat_texts[:-1])
             remaining_target = max(target_word_count - current_words, 0)
             beat_target = max(min_beat_words, remaining_target or per_beat_target)
             continuation_hint = (
@@ -627,7 +627,8 @@ class WritingPipeline:
                 break
             beat_texts.append(part)
             content = f"{content}\n\n{part}" if content else part
-            current_words = self._count_words(content)
+            # Beats are joined on whitespace, so counts add up without rescanning
+            current_words += self._count_words(part)
             if current_words >= int(target_word_count * settings.WRITE_EARLY_STOP_RATIO):
                 break
 
@@ -658,10 +659,7 @@ class WritingPipeline:
         memory_context = self._truncate_text(state.get("memory_context", ""), settings.MEMORY_CONTEXT_MAX_CHARS)
 
         project_context = state.get("project_context") or {}
-        project_meta = project_context.get("project", {}).get("metadata", {})
         story_bible = project_context.get("story_bible")
-        if not isinstance(story_bible, dict) or not story_bible:
-            story_bible = project_meta.get("story_bible") if isinstance(project_meta, dict) else {}
         if not isinstance(story_bible, dict):
             story_bible = {}
 
@@ -1300,7 +1298,7 @@ class WritingPipeline:
 
             beat_texts.append(part)
             content = f"{content}\n\n{part}" if content else part
-            current_words = self._count_words(content)
+            current_words += self._count_words(part)
 
             # Yield each beat as a chunk
             yield {"type": "chunk", "content": part, "beat_index": idx}
@@ -1339,8 +1337,7 @@ class WritingPipeline:
         facts = await self.memory_service.extract_facts(chapter_text)
         summary = facts.get("summary") or metadata.get("summary")
 
-        project_context = await self.context_service.build_project_context(document.project_id, user_id)
-        project_metadata = project_context.get("project", {}).get("metadata", {})
+        project_metadata = await self._get_project_metadata(document.project_id)
         project_metadata = self.memory_service.merge_facts(project_metadata, facts)
 
         recent = project_metadata.get("recent_chapter_summaries") or []
@@ -1384,17 +1381,14 @@ class WritingPipeline:
             user_id,
         )
 
-        self.memory_service.update_neo4j(
+        await self.memory_service.persist_facts(
             facts,
             project_id=str(document.project_id),
+            chapter_id=str(document.id),
+            chapter_text=chapter_text,
+            summary=summary,
             chapter_index=chapter_index,
         )
-        self.memory_service.store_style_memory(
-            str(document.project_id),
-            str(document.id),
-            chapter_text,
-            summary,
-        )
 
         rag_updated = False
         rag_error = None
@@ -1561,6 +1555,13 @@ class WritingPipeline:
         )
         return list(result.scalars().all())
 
+    async def _get_project_metadata(self, project_id: UUID) -> Dict[str, Any]:
+        project = await self.db.get(Project, project_id)
+        if not project or not isinstance(project.project_metadata, dict):
+            return {}
+        # Work on a copy so reassigning it marks the JSON column as changed
+        return copy.deepcopy(project.project_metadata)
+
     async def _update_project_metadata(self, project_id: UUID, metadata: Dict[str, Any]) -> None:
         project = await self.db.get(Project, project_id)
         if not project:
@@ -1900,15 +1901,15 @@ class WritingPipeline:
 
         mentioned_chars = self._extract_mentioned_characters(chapter_text, project_context)
         issues: List[Dict[str, Any]] = []
-        for char_name in mentioned_chars:
-            try:
-                contradictions = memory_service.detect_character_contradictions(
-                    char_name,
-                    project_id=project_id_value,
-                )
-            except Exception:
-                logger.exception("Graph validation failed for character %s", char_name)
-                continue
+        try:
+            contradictions_by_char = memory_service.detect_character_contradictions_batch(
+                mentioned_chars,
+                project_id=project_id_value,
+            )
+        except Exception:
+            logger.exception("Graph validation failed for characters %s", mentioned_chars)
+            contradictions_by_char = {}
+        for char_name, contradictions in contradictions_by_char.items():
             for contradiction in contradictions:
                 issues.append(
                     {
@@ -1,9 +1,19 @@
 """
 Celery tasks module
 """
+from celery.signals import worker_process_init
+
 from app.core.celery_app import celery_app
 from app.tasks import coherence_maintenance
 from app.tasks import generation_tasks
 from app.tasks import coherence_tasks
 
 __all__ = ["celery_app", "coherence_maintenance", "generation_tasks", "coherence_tasks"]
+
+
+@worker_process_init.connect
+def _warm_worker_process(**kwargs) -> None:
+    # Load the extraction tokenizer before the first task runs its event loop
+    from app.services.memory_service import warm_token_encoding
+
+    warm_token_encoding()
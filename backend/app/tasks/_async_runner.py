@@ -0,0 +1,28 @@
+"""Run async task bodies on a fresh event loop from sync Celery tasks."""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run ``coro`` with ``asyncio.run`` and close loop-bound pools before exit.
+
+    Pooled clients are cached per event loop and each task gets a new loop,
+    so they are closed here rather than left open until garbage collection.
+    """
+    return asyncio.run(_run_and_close(coro))
+
+
+async def _run_and_close(coro: Awaitable[T]) -> T:
+    try:
+        return await coro
+    finally:
+        from app.services.llm_client import close_http_clients
+        from app.services.memory_service import close_graph_clients
+
+        await close_http_clients()
+        await close_graph_clients()
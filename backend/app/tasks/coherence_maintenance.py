@@ -1,7 +1,6 @@
 """Maintenance tasks for coherence data."""
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timedelta, timezone
 import logging
 from typing import Any, Dict, Optional
@@ -15,6 +14,7 @@ from app.models.document import Document, DocumentType
 from app.models.project import Project, ProjectStatus
 from app.services.memory_service import MemoryService
 from app.services.rag_service import RagService
+from app.tasks._async_runner import run_async
 
 
 logger = logging.getLogger(__name__)
@@ -105,10 +105,10 @@ async def _reconcile_project_memory(project_id: str) -> Dict[str, Any]:
             }
         }
 
-        for chapter in approved:
-            if not chapter.content:
-                continue
-            facts = await memory.extract_facts(chapter.content)
+        chapter_facts = await memory.extract_facts_many(
+            [chapter.content for chapter in approved if chapter.content]
+        )
+        for facts in chapter_facts:
             fresh_metadata = memory.merge_facts(fresh_metadata, facts)
 
         new_continuity = fresh_metadata.get("continuity") or {}
@@ -218,24 +218,24 @@ async def _rebuild_all_project_rags() -> Dict[str, Any]:
 
 @celery_app.task(name="reconcile_project_memory")
 def reconcile_project_memory(project_id: str) -> Dict[str, Any]:
-    return asyncio.run(_reconcile_project_memory(project_id))
+    return run_async(_reconcile_project_memory(project_id))
 
 
 @celery_app.task(name="rebuild_project_rag")
 def rebuild_project_rag(project_id: str) -> Dict[str, Any]:
-    return asyncio.run(_rebuild_project_rag(project_id))
+    return run_async(_rebuild_project_rag(project_id))
 
 
 @celery_app.task(name="cleanup_old_drafts")
 def cleanup_old_drafts(project_id: str, days_threshold: int = 30) -> Dict[str, Any]:
-    return asyncio.run(_cleanup_old_drafts(project_id, days_threshold))
+    return run_async(_cleanup_old_drafts(project_id, days_threshold))
 
 
 @celery_app.task(name="reconcile_all_active_projects")
 def reconcile_all_active_projects() -> Dict[str, Any]:
-    return asyncio.run(_reconcile_all_active_projects())
+    return run_async(_reconcile_all_active_projects())
 
 
 @celery_app.task(name="rebuild_all_project_rags")
 def rebuild_all_project_rags() -> Dict[str, Any]:
-    return asyncio.run(_rebuild_all_project_rags())
+    return run_async(_rebuild_all_project_rags())
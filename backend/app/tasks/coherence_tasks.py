@@ -1,7 +1,6 @@
 """Celery tasks for coherence maintenance."""
 from __future__ import annotations
 
-import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
@@ -13,15 +12,11 @@ from app.core.celery_app import celery_app
 from app.core.config import settings
 from app.db.session import AsyncSessionLocal
 from app.models.project import Project, ProjectStatus
+from app.tasks._async_runner import run_async
 
 logger = logging.getLogger(__name__)
 
 
-def _run_async(coro):
-    """Helper to run async code in sync Celery tasks."""
-    return asyncio.run(coro)
-
-
 @celery_app.task(
     name="promote_facts_to_bible",
     queue="maintenance_low",
@@ -35,7 +30,7 @@ def promote_facts_to_bible(project_id: str) -> Dict[str, Any]:
     This task examines facts extracted from chapters and promotes
     frequently occurring patterns to permanent story rules.
     """
-    return _run_async(_promote_facts_to_bible_async(project_id))
+    return run_async(_promote_facts_to_bible_async(project_id))
 
 
 async def _promote_facts_to_bible_async(project_id: str) -> Dict[str, Any]:
@@ -318,7 +313,7 @@ celery_app.conf.beat_schedule["daily-fact-promotion"] = {
 @celery_app.task(name="promote_all_project_facts", queue="maintenance_low")
 def promote_all_project_facts() -> Dict[str, Any]:
     """Promote facts for all active projects."""
-    return _run_async(_promote_all_project_facts_async())
+    return run_async(_promote_all_project_facts_async())
 
 
 async def _promote_all_project_facts_async() -> Dict[str, Any]:
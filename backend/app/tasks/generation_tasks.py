@@ -4,7 +4,6 @@ Celery tasks for distributed chapter generation.
 These tasks allow parallel beat generation across multiple workers,
 significantly reducing chapter generation time.
 """
-import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from uuid import UUID
@@ -14,15 +13,11 @@ from celery.exceptions import SoftTimeLimitExceeded
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
+from app.tasks._async_runner import run_async
 
 logger = logging.getLogger(__name__)
 
 
-def _run_async(coro):
-    """Helper to run async code in sync Celery tasks."""
-    return asyncio.run(coro)
-
-
 @celery_app.task(
     bind=True,
     name="generate_beat",
@@ -79,7 +74,7 @@ def generate_beat_task(
                 max_tokens=_max_tokens_for_words(beat_target),
             )
 
-        content = _run_async(_generate())
+        content = run_async(_generate())
         content = (content or "").strip()
         word_count = len(content.split())
 
@@ -254,7 +249,7 @@ def generate_chapter_async_task(
                 }
                 return await pipeline.generate_chapter(state)
 
-        result = _run_async(_generate())
+        result = run_async(_generate())
 
         return {
             "success": True,
@@ -355,7 +350,7 @@ def pregenerate_plans_async_task(
 
                 return {"success": True, "plans_generated": plans_generated}
 
-        return _run_async(_pregenerate())
+        return run_async(_pregenerate())
 
     except Exception as e:
         logger.exception(f"Plan pregeneration failed for project {project_id}: {e}")
@@ -1,3 +1,5 @@
+import pytest
+
 from app.core.celery_app import celery_app
 
 
@@ -12,3 +14,27 @@ def test_tasks_module_exports_celery_app():
     from app import tasks
 
     assert tasks.celery_app is celery_app
+
+
+def test_run_async_closes_loop_pools_after_failure(monkeypatch):
+    from app.services import llm_client, memory_service
+    from app.tasks._async_runner import run_async
+
+    closed = []
+
+    async def fake_close_http():
+        closed.append("http")
+
+    async def fake_close_graph():
+        closed.append("graph")
+
+    async def failing_task():
+        raise ValueError("boom")
+
+    monkeypatch.setattr(llm_client, "close_http_clients", fake_close_http)
+    monkeypatch.setattr(memory_service, "close_graph_clients", fake_close_graph)
+
+    with pytest.raises(ValueError):
+        run_async(failing_task())
+
+    assert closed == ["http", "graph"]
@@ -103,7 +103,7 @@ async def test_generate_main_characters_requires_summary(monkeypatch):
         def __init__(self, db):
             self.db = db
 
-        async def build_project_context(self, project_id, user_id):
+        async def build_project_context(self, project_id, user_id, sections=None):
             return {"project": {"description": ""}, "characters": [], "constraints": {}}
 
     monkeypatch.setattr(characters_module, "ProjectContextService", DummyContextService)
@@ -124,7 +124,7 @@ async def test_generate_main_characters_handles_parse_error(monkeypatch):
         def __init__(self, db):
             self.db = db
 
-        async def build_project_context(self, project_id, user_id):
+        async def build_project_context(self, project_id, user_id, sections=None):
             return {"project": {"description": "Summary"}, "characters": [], "constraints": {}}
 
     class DummyLLM:
@@ -150,7 +150,7 @@ async def test_generate_main_characters_no_characters(monkeypatch):
         def __init__(self, db):
             self.db = db
 
-        async def build_project_context(self, project_id, user_id):
+        async def build_project_context(self, project_id, user_id, sections=None):
             return {"project": {"description": "Summary"}, "characters": [], "constraints": {}}
 
     class DummyLLM:
@@ -177,7 +177,7 @@ async def test_generate_main_characters_creates_unique(monkeypatch):
         def __init__(self, db):
             self.db = db
 
-        async def build_project_context(self, project_id, user_id):
+        async def build_project_context(self, project_id, user_id, sections=None):
             return {
                 "project": {"description": "Summary", "title": "Proj", "genre": None},
                 "characters": [{"name": "Alice"}],
@@ -59,6 +59,9 @@ class DummyMemoryService:
             "events": [],
         }
 
+    async def extract_facts_many(self, chapter_texts, concurrency=8):
+        return [await self.extract_facts(text) for text in chapter_texts]
+
     def merge_facts(self, metadata, facts):
         continuity = metadata.get("continuity") if isinstance(metadata, dict) else None
         if not isinstance(continuity, dict):
@@ -77,10 +77,9 @@ async def test_update_document_refreshes_memory_and_rag(monkeypatch):
             metadata["continuity"] = {"characters": facts.get("characters", [])}
             return metadata
 
-        def update_neo4j(self, facts, project_id=None, chapter_index=None):
-            return None
-
-        def store_style_memory(self, project_id, chapter_id, chapter_text, summary):
+        async def persist_facts(
+            self, facts, project_id, chapter_id, chapter_text, summary, chapter_index=None
+        ):
             self.store_called = True
 
     class DummyRagService:
@@ -306,10 +305,9 @@ async def test_update_document_reports_coherence_errors(monkeypatch):
         def merge_facts(self, metadata, facts):
             return {}
 
-        def update_neo4j(self, facts, project_id=None, chapter_index=None):
-            return None
-
-        def store_style_memory(self, project_id, chapter_id, chapter_text, summary):
+        async def persist_facts(
+            self, facts, project_id, chapter_id, chapter_text, summary, chapter_index=None
+        ):
             return None
 
     class DummyRagService:
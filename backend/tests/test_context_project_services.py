@@ -8,7 +8,7 @@ from app.core.config import settings
 from app.models.document import DocumentType
 from app.models.project import ProjectStatus
 from app.schemas.project import ProjectCreate, ProjectUpdate
-from app.services.context_service import ProjectContextService
+from app.services.context_service import ProjectContextService, SmartContextTruncator
 from app.services.project_service import ProjectService
 
 
@@ -21,9 +21,13 @@ class DummyScalars:
 
 
 class DummyResult:
-    def __init__(self, scalar=None, scalars=None):
+    def __init__(self, scalar=None, scalars=None, row=None):
         self._scalar = scalar
         self._scalars = scalars or []
+        self._row = row
+
+    def one_or_none(self):
+        return self._row
 
     def scalar_one_or_none(self):
         return self._scalar
@@ -81,6 +85,7 @@ async def test_build_project_context_includes_metadata_and_instructions():
             {"title": "", "detail": "ignore"},
         ],
         "constraints": {"max_chapters": 30},
+        "tracked_contradictions": [{"description": "x", "status": "resolved"}],
     }
     project = SimpleNamespace(
         id=project_id,
@@ -113,11 +118,19 @@ async def test_build_project_context_includes_metadata_and_instructions():
         character_metadata={"role": "hero"},
     )
 
-    results = [
-        DummyResult(scalar=project),
-        DummyResult(scalars=[document]),
-        DummyResult(scalars=[character]),
-    ]
+    later_document = SimpleNamespace(
+        id=uuid4(),
+        title="Chapitre 2",
+        document_type=DocumentType.CHAPTER,
+        order_index=1,
+        word_count=10,
+        document_metadata={},
+        content="",
+    )
+    project.documents = [later_document, document]
+    project.characters = [character]
+
+    results = [DummyResult(row=(None, 0, None, 0, None)), DummyResult(scalar=project)]
     db = DummyDB(results)
     service = ProjectContextService(db)
 
@@ -133,21 +146,109 @@ async def test_build_project_context_includes_metadata_and_instructions():
     assert context["project"]["recent_chapter_summaries"] == ["Resume 1"]
     assert context["story_bible"]["world_rules"][0]["rule"] == "No magic"
     assert context["constraints"] == {"max_chapters": 30}
+    assert context["project"]["metadata"] == {
+        "tracked_contradictions": [{"description": "x", "status": "resolved"}]
+    }
     assert len(context["instructions"]) == 1
     assert context["instructions"][0]["title"] == "Regle"
     assert context["documents"][0]["content_preview"] == "abcde"
+    assert [doc["title"] for doc in context["documents"]] == ["Chapitre 1", "Chapitre 2"]
+    assert context["characters"][0]["name"] == "Alice"
     assert context["documents"][0]["document_type"] == DocumentType.CHAPTER.value
 
 
 @pytest.mark.asyncio
 async def test_build_project_context_raises_on_missing_project():
-    db = DummyDB([DummyResult(scalar=None)])
+    db = DummyDB([DummyResult(row=None)])
     service = ProjectContextService(db)
 
     with pytest.raises(HTTPException):
         await service.build_project_context(project_id=uuid4(), user_id=uuid4())
 
 
+@pytest.mark.asyncio
+async def test_build_project_context_is_cached_per_version():
+    project_id = uuid4()
+    user_id = uuid4()
+    project = SimpleNamespace(
+        id=project_id,
+        owner_id=user_id,
+        title="Project",
+        description="Desc",
+        genre="fantasy",
+        status=ProjectStatus.DRAFT,
+        target_word_count=10000,
+        current_word_count=0,
+        structure_template=None,
+        project_metadata={"constraints": {"max_chapters": 3}},
+        documents=[],
+        characters=[],
+    )
+    version = ("2024-01-01T00:00:00", 0, None, 0, None)
+    db = DummyDB([DummyResult(row=version), DummyResult(scalar=project)])
+    service = ProjectContextService(db)
+
+    first = await service.build_project_context(project_id, user_id)
+    first["constraints"]["max_chapters"] = 99
+    db._results = [DummyResult(row=version)]
+    second = await service.build_project_context(project_id, user_id)
+
+    assert second["constraints"] == {"max_chapters": 3}
+    assert second["project"]["id"] == str(project_id)
+
+    project.title = "Renamed"
+    db._results = [
+        DummyResult(row=("2024-01-02T00:00:00", 0, None, 0, None)),
+        DummyResult(scalar=project),
+    ]
+    third = await service.build_project_context(project_id, user_id)
+
+    assert third["project"]["title"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_build_project_context_skips_unrequested_sections():
+    project_id = uuid4()
+    user_id = uuid4()
+
+    class Unloaded:
+        @property
+        def documents(self):
+            raise AssertionError("documents should not be loaded")
+
+    project = Unloaded()
+    project.id = project_id
+    project.title = "Project"
+    project.description = "Desc"
+    project.genre = "fantasy"
+    project.status = ProjectStatus.DRAFT
+    project.target_word_count = 10000
+    project.current_word_count = 0
+    project.structure_template = None
+    project.project_metadata = {}
+    project.characters = [
+        SimpleNamespace(
+            id=uuid4(),
+            name="Alice",
+            description=None,
+            personality=None,
+            backstory=None,
+            character_metadata={},
+        )
+    ]
+    version = ("2024-01-03T00:00:00", 0, None, 1, None)
+    db = DummyDB([DummyResult(row=version), DummyResult(scalar=project)])
+    service = ProjectContextService(db)
+
+    context = await service.build_project_context(
+        project_id, user_id, sections={"characters"}
+    )
+
+    assert context["documents"] == []
+    assert [char["name"] for char in context["characters"]] == ["Alice"]
+    assert context["project"]["title"] == "Project"
+
+
 @pytest.mark.asyncio
 async def test_project_service_create_sets_defaults():
     db = DummyDB()
@@ -196,13 +297,11 @@ async def test_build_project_context_handles_flat_concept_and_plan():
         current_word_count=1200,
         structure_template=None,
         project_metadata=project_metadata,
+        documents=[],
+        characters=[],
     )
 
-    results = [
-        DummyResult(scalar=project),
-        DummyResult(scalars=[]),
-        DummyResult(scalars=[]),
-    ]
+    results = [DummyResult(row=(None, 0, None, 0, None)), DummyResult(scalar=project)]
     db = DummyDB(results)
     service = ProjectContextService(db)
 
@@ -232,13 +331,11 @@ async def test_build_project_context_handles_non_dict_metadata():
         current_word_count=1200,
         structure_template=None,
         project_metadata="invalid",
+        documents=[],
+        characters=[],
     )
 
-    results = [
-        DummyResult(scalar=project),
-        DummyResult(scalars=[]),
-        DummyResult(scalars=[]),
-    ]
+    results = [DummyResult(row=(None, 0, None, 0, None)), DummyResult(scalar=project)]
     db = DummyDB(results)
     service = ProjectContextService(db)
 
@@ -306,3 +403,32 @@ async def test_project_service_delete_returns_true(monkeypatch):
     assert deleted is True
     assert db.deleted == [project]
     assert db.commits == 1
+
+
+def test_smart_context_truncator_build_output_respects_budget():
+    sections = [("A", "x" * 10), ("B", ""), ("C", "y" * 50)]
+
+    full = SmartContextTruncator._build_output(sections, 1000)
+    cut = SmartContextTruncator._build_output(sections, 30)
+
+    assert full == "### A\n" + "x" * 10 + "\n\n### C\n" + "y" * 50 + "\n"
+    assert cut == "### A\n" + "x" * 10 + "\n\n" + ("### C\n" + "y" * 50)[:10] + "..."
+
+
+def test_truncate_memory_context_filters_mentioned_characters():
+    memory = {
+        "characters": [
+            {"name": "Alice", "current_state": "blessee"},
+            {"name": "Bob", "current_state": "absent"},
+        ],
+        "events": [],
+        "relations": [],
+    }
+
+    output = SmartContextTruncator.truncate_memory_context(
+        memory, mentioned_characters=["Alice"]
+    )
+
+    assert "Alice: blessee" in output
+    assert "Bob" not in output
+    assert SmartContextTruncator.truncate_memory_context({}, mentioned_characters=["Alice"]) == ""
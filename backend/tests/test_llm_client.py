@@ -1,7 +1,9 @@
+import orjson
 import pytest
 import httpx
 
-from app.services.llm_client import DeepSeekClient
+from app.services import llm_client as llm_client_module
+from app.services.llm_client import DeepSeekClient, get_llm_client
 
 
 class DummyResponse:
@@ -13,6 +15,10 @@ class DummyResponse:
     def json(self):
         return self._json_data
 
+    @property
+    def content(self):
+        return orjson.dumps(self._json_data)
+
 
 class DummyClient:
     def __init__(self, response=None, exc=None):
@@ -26,8 +32,8 @@ class DummyClient:
     async def __aexit__(self, exc_type, exc, tb):
         return None
 
-    async def post(self, url, headers=None, json=None):
-        self.captured = {"url": url, "headers": headers, "json": json}
+    async def post(self, url, headers=None, json=None, timeout=None):
+        self.captured = {"url": url, "headers": headers, "json": json, "timeout": timeout}
         if self.exc:
             raise self.exc
         return self.response
@@ -40,9 +46,7 @@ async def test_llm_client_returns_message_content(monkeypatch):
         json_data={"choices": [{"message": {"content": "Hello", "role": "assistant"}}]},
     )
     client = DummyClient(response=response)
-    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout: client)
-
-    llm = DeepSeekClient()
+    llm = DeepSeekClient(client=client)
     result = await llm.chat(messages=[{"role": "user", "content": "hi"}])
 
     assert result == "Hello"
@@ -55,9 +59,7 @@ async def test_llm_client_returns_full_message(monkeypatch):
         json_data={"choices": [{"message": {"content": "Hello", "role": "assistant"}}]},
     )
     client = DummyClient(response=response)
-    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout: client)
-
-    llm = DeepSeekClient()
+    llm = DeepSeekClient(client=client)
     result = await llm.chat(messages=[{"role": "user", "content": "hi"}], return_full=True)
 
     assert result["content"] == "Hello"
@@ -70,9 +72,7 @@ async def test_llm_client_includes_response_format(monkeypatch):
         json_data={"choices": [{"message": {"content": "{}", "role": "assistant"}}]},
     )
     client = DummyClient(response=response)
-    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout: client)
-
-    llm = DeepSeekClient()
+    llm = DeepSeekClient(client=client)
     await llm.chat(
         messages=[{"role": "user", "content": "hi"}],
         response_format={"type": "json_object"},
@@ -81,13 +81,25 @@ async def test_llm_client_includes_response_format(monkeypatch):
     assert client.captured["json"]["response_format"] == {"type": "json_object"}
 
 
+@pytest.mark.asyncio
+async def test_llm_client_includes_stop_and_top_p(monkeypatch):
+    response = DummyResponse(
+        status_code=200,
+        json_data={"choices": [{"message": {"content": "ok", "role": "assistant"}}]},
+    )
+    client = DummyClient(response=response)
+    llm = DeepSeekClient(client=client)
+    await llm.chat(messages=[{"role": "user", "content": "hi"}], stop=["\n\n\n"], top_p=0.9)
+
+    assert client.captured["json"]["stop"] == ["\n\n\n"]
+    assert client.captured["json"]["top_p"] == 0.9
+
+
 @pytest.mark.asyncio
 async def test_llm_client_raises_on_bad_status(monkeypatch):
     response = DummyResponse(status_code=500, json_data={}, text="fail")
     client = DummyClient(response=response)
-    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout: client)
-
-    llm = DeepSeekClient()
+    llm = DeepSeekClient(client=client)
 
     with pytest.raises(RuntimeError):
         await llm.chat(messages=[{"role": "user", "content": "hi"}])
@@ -96,9 +108,7 @@ async def test_llm_client_raises_on_bad_status(monkeypatch):
 @pytest.mark.asyncio
 async def test_llm_client_raises_on_http_error(monkeypatch):
     client = DummyClient(exc=httpx.HTTPError("fail"))
-    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout: client)
-
-    llm = DeepSeekClient()
+    llm = DeepSeekClient(client=client)
 
     with pytest.raises(RuntimeError):
         await llm.chat(messages=[{"role": "user", "content": "hi"}])
@@ -107,9 +117,64 @@ async def test_llm_client_raises_on_http_error(monkeypatch):
 @pytest.mark.asyncio
 async def test_llm_client_propagates_timeout(monkeypatch):
     client = DummyClient(exc=httpx.ReadTimeout("timeout"))
-    monkeypatch.setattr(httpx, "AsyncClient", lambda timeout: client)
-
-    llm = DeepSeekClient()
+    llm = DeepSeekClient(client=client)
 
     with pytest.raises(httpx.ReadTimeout):
         await llm.chat(messages=[{"role": "user", "content": "hi"}])
+
+
+@pytest.mark.asyncio
+async def test_get_llm_client_returns_shared_pooled_instance(monkeypatch):
+    monkeypatch.setattr(llm_client_module, "_shared_client", None)
+
+    first = get_llm_client()
+    second = get_llm_client()
+
+    assert first is second
+    assert first._http() is second._http()
+    assert isinstance(first._http(), httpx.AsyncClient)
+    await llm_client_module.close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_llm_client_reuses_pooled_http_client(monkeypatch):
+    response = DummyResponse(
+        status_code=200,
+        json_data={"choices": [{"message": {"content": "Hello", "role": "assistant"}}]},
+    )
+    created = []
+
+    def factory(**kwargs):
+        client = DummyClient(response=response)
+        client.is_closed = False
+        created.append(kwargs)
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    llm = DeepSeekClient()
+
+    await llm.chat(messages=[{"role": "user", "content": "hi"}])
+    await DeepSeekClient().chat(messages=[{"role": "user", "content": "hi"}])
+
+    assert len(created) == 1
+    assert created[0]["http2"] is True
+    llm_client_module._http_clients.clear()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_full_collects_content(monkeypatch):
+    async def fake_stream(self, messages, temperature, max_tokens, model):
+        for chunk in ("Il ", "etait ", "une fois"):
+            yield chunk
+
+    monkeypatch.setattr(DeepSeekClient, "chat_stream", fake_stream)
+    collector = DeepSeekClient(client=DummyClient()).chat_stream_full(
+        [{"role": "user", "content": "hi"}]
+    )
+
+    async for chunk in collector:
+        assert chunk == "Il "
+        break
+
+    assert await collector.full() == "Il etait une fois"
+    assert collector.full_content == "Il etait une fois"
@@ -1,7 +1,11 @@
+import asyncio
 import json
+from types import SimpleNamespace
 
+import numpy as np
 import pytest
 
+from app.services import memory_service as memory_service_module
 from app.services.memory_service import MemoryService
 from app.core.config import settings
 
@@ -130,6 +134,32 @@ def test_merge_facts_temporal_tracking():
     assert alice["status_history"][-1]["value"] == "injured"
 
 
+def test_merge_relations_keeps_earliest_start_chapter():
+    service = MemoryService.__new__(MemoryService)
+    existing = [{"from": "Alice", "to": "Bob", "type": "ally", "detail": "trust", "start_chapter": 2}]
+    incoming = [
+        {"from": "Alice", "to": "Bob", "type": "ally", "detail": "doubt", "start_chapter": 6},
+        {"from": "Bob", "to": "Eve", "type": "rival", "start_chapter": 6},
+    ]
+
+    merged = service._merge_relations(existing, incoming)
+
+    assert len(merged) == 2
+    assert merged[0]["detail"] == "doubt"
+    assert merged[0]["start_chapter"] == 2
+    assert merged[1] is not incoming[1]
+
+
+def test_merge_named_updates_existing_items():
+    service = MemoryService.__new__(MemoryService)
+    existing = [{"name": "Sword", "owner": "Alice"}, {"owner": "nobody"}]
+    incoming = [{"name": "Sword", "status": "lost"}, {"name": "Map"}, {"status": "ignored"}]
+
+    merged = service._merge_named(existing, incoming)
+
+    assert merged == [{"name": "Sword", "owner": "Alice", "status": "lost"}, {"name": "Map"}]
+
+
 def test_build_context_block_detailed():
     service = MemoryService.__new__(MemoryService)
     metadata = {
@@ -200,6 +230,56 @@ def test_select_extraction_chunks_dual_pass():
     assert len(chunks[1]) == 10000
 
 
+def test_select_extraction_chunks_truncates_by_tokens(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+
+    class WordEncoding:
+        def encode(self, text, disallowed_special=()):
+            return text.split()
+
+        def decode(self, tokens):
+            return " ".join(tokens)
+
+    monkeypatch.setattr(memory_service_module, "_get_token_encoding", lambda: WordEncoding())
+    text = " ".join(f"mot{i}" for i in range(10))
+
+    assert service._select_extraction_chunks(text, max_chars=5, max_tokens=10) == [text]
+    chunks = service._select_extraction_chunks(text, max_chars=5, max_tokens=3)
+    assert chunks == ["mot0 mot1 mot2", "mot7 mot8 mot9"]
+
+
+def test_select_extraction_chunks_does_not_split_characters(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+
+    class ByteEncoding:
+        def encode(self, text, disallowed_special=()):
+            return list(text.encode("utf-8"))
+
+        def decode(self, tokens):
+            return bytes(tokens).decode("utf-8", errors="replace")
+
+    monkeypatch.setattr(memory_service_module, "_get_token_encoding", lambda: ByteEncoding())
+    text = "été" * 4
+
+    head, tail = service._select_extraction_chunks(text, max_chars=5, max_tokens=4)
+
+    # "été" is five bytes; four tokens stop inside the final "é" at either end
+    assert head == "ét"
+    assert tail == "té"
+    assert "\ufffd" not in head + tail
+
+
+def test_stringify_items_and_relations():
+    service = MemoryService.__new__(MemoryService)
+
+    assert service._stringify_items([{"name": "Alice"}, {}, {"name": "Bob"}]) == "Alice, Bob"
+    assert service._stringify_items([]) == "none"
+    assert service._stringify_relations(
+        [{"from": "Alice", "to": "Bob", "type": "ally"}, {"from": "Alice", "type": "rival"}]
+    ) == "Alice -[ally]-> Bob"
+    assert service._stringify_relations([]) == "none"
+
+
 def test_merge_unique_list_deduplicates_and_strips():
     service = MemoryService.__new__(MemoryService)
     merged = service._merge_unique_list(["Alpha", " ", None], ["Alpha", "Beta", "beta"])
@@ -273,12 +353,18 @@ def test_update_neo4j_runs_queries():
         def run(self, *args, **kwargs):
             calls.append((args, kwargs))
 
+        def execute_write(self, work):
+            transactions.append(work)
+            return work(self)
+
         def __enter__(self):
             return self
 
         def __exit__(self, exc_type, exc, tb):
             return False
 
+    transactions = []
+
     class DummyDriver:
         def session(self, database=None):
             return DummySession()
@@ -286,7 +372,11 @@ def test_update_neo4j_runs_queries():
     service.neo4j_driver = DummyDriver()
 
     facts = {
-        "characters": [{"name": "Alice", "role": "hero", "status": "alive"}],
+        "characters": [
+            {"name": "Alice", "role": "hero", "status": "alive"},
+            {"name": "Bob", "role": "ally"},
+            {"role": "nameless"},
+        ],
         "locations": [{"name": "Dock", "description": "Foggy"}],
         "relations": [{"from": "Alice", "to": "Bob", "type": "ally", "detail": "trust"}],
         "events": [{"name": "Ambush", "summary": "Night attack"}],
@@ -294,7 +384,197 @@ def test_update_neo4j_runs_queries():
 
     service.update_neo4j(facts)
 
+    assert len(transactions) == 1
     assert len(calls) == 4
+    assert all(args[0].startswith("UNWIND $rows") for args, _ in calls)
+    assert [row["name"] for row in calls[0][1]["rows"]] == ["Alice", "Bob"]
+
+
+def test_update_neo4j_objects_and_locations_batch_rows():
+    service = MemoryService.__new__(MemoryService)
+    calls = []
+
+    class DummySession:
+        def run(self, *args, **kwargs):
+            calls.append((args, kwargs))
+
+        def execute_write(self, work):
+            return work(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    class DummyDriver:
+        def session(self, database=None):
+            return DummySession()
+
+    service.neo4j_driver = DummyDriver()
+    facts = {
+        "objects": [
+            {"name": "Sword", "current_holder": "Alice"},
+            {"name": "Map"},
+            {"description": "nameless"},
+        ],
+        "character_locations": [
+            {"character_name": "Alice", "location": "Dock"},
+            {"character_name": "Bob", "location": "Tower"},
+        ],
+    }
+
+    service.update_neo4j_objects(facts, project_id="p1", chapter_index=4)
+    service.update_character_locations(facts, project_id="p1", chapter_index=4)
+
+    assert len(calls) == 3
+    assert [row["name"] for row in calls[0][1]["rows"]] == ["Sword", "Map"]
+    assert calls[1][1]["rows"] == [{"obj_name": "Sword", "holder_name": "Alice", "chapter_index": 4}]
+    assert [row["current_location"] for row in calls[2][1]["rows"]] == ["Dock", "Tower"]
+
+
+def test_update_neo4j_skips_empty_facts():
+    service = MemoryService.__new__(MemoryService)
+
+    class DummyDriver:
+        def session(self, database=None):
+            raise AssertionError("session should not be opened")
+
+    service.neo4j_driver = DummyDriver()
+
+    service.update_neo4j({"characters": [{"role": "nameless"}], "events": []})
+
+
+@pytest.mark.asyncio
+async def test_update_neo4j_async_uses_async_client():
+    service = MemoryService.__new__(MemoryService)
+    service.neo4j_driver = None
+    calls = []
+
+    class DummyTx:
+        async def run(self, *args, **kwargs):
+            calls.append((args, kwargs))
+
+    class DummySession:
+        async def execute_write(self, work):
+            return await work(DummyTx())
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    class DummyAsyncClient:
+        def session(self):
+            return DummySession()
+
+    service.neo4j_async_client = DummyAsyncClient()
+
+    await service.update_neo4j_async(
+        {"characters": [{"name": "Alice"}], "events": [{"name": "Ambush"}]},
+        project_id="p1",
+        chapter_index=2,
+    )
+
+    assert len(calls) == 2
+    assert calls[0][1]["project_id"] == "p1"
+    assert calls[0][1]["rows"][0]["chapter_index"] == 2
+
+
+@pytest.mark.asyncio
+async def test_persist_facts_writes_graph_and_style_memory(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+    service.neo4j_driver = object()
+    service.neo4j_async_client = None
+    calls = []
+
+    async def fake_write(batches, timestamp, project_id):
+        calls.append(("neo4j", project_id, [query for query, _ in batches]))
+
+    def fake_store(project_id, chapter_id, chapter_text, summary):
+        calls.append(("chroma", chapter_id, summary))
+
+    monkeypatch.setattr(service, "_write_graph_batches_async", fake_write)
+    monkeypatch.setattr(service, "store_style_memory", fake_store, raising=False)
+
+    facts = {
+        "characters": [{"name": "Alice"}],
+        "objects": [{"name": "Epee", "current_holder": "Alice"}],
+        "character_locations": [{"character_name": "Alice", "location": "Port"}],
+    }
+    await service.persist_facts(facts, "p1", "c1", "Texte", "Resume", chapter_index=3)
+
+    assert len(calls) == 2
+    assert ("chroma", "c1", "Resume") in calls
+    _, project_id, queries = next(call for call in calls if call[0] == "neo4j")
+    assert project_id == "p1"
+    # Location and POSSESSES statements MATCH characters, so they follow the MERGE
+    merge_index = queries.index(memory_service_module._CYPHER_MERGE_CHARACTER_PROJECT)
+    assert merge_index < queries.index(memory_service_module._CYPHER_MERGE_POSSESSES)
+    assert merge_index < queries.index(
+        memory_service_module._CYPHER_SET_CHARACTER_LOCATION_PROJECT
+    )
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_many_bounds_concurrency_and_keeps_order(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+    active = 0
+    peak = 0
+
+    async def fake_extract(chapter_text):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+        return {"summary": chapter_text}
+
+    monkeypatch.setattr(service, "extract_facts", fake_extract, raising=False)
+
+    results = await service.extract_facts_many(["a", "b", "c", "d", "e"], concurrency=2)
+
+    assert [item["summary"] for item in results] == ["a", "b", "c", "d", "e"]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_check_object_availability_async_uses_async_client():
+    service = MemoryService.__new__(MemoryService)
+    service.neo4j_driver = None
+    queries = []
+
+    class DummyResult:
+        async def single(self):
+            return {"o": {"status": "destroyed"}}
+
+    class DummySession:
+        async def run(self, query, **params):
+            queries.append((query, params))
+            return DummyResult()
+
+        async def execute_read(self, func):
+            return await func(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    class DummyAsyncClient:
+        def session(self):
+            return DummySession()
+
+    service.neo4j_async_client = DummyAsyncClient()
+    memory_service_module._NEO4J_CACHE.clear()
+
+    result = await service.check_object_availability_async("Sword", 5, project_id="p1")
+
+    assert result["available"] is False
+    assert result["status"] == "destroyed"
+    assert queries[0][1] == {"name": "Sword", "project_id": "p1"}
 
 
 def test_graph_queries_return_empty_without_driver():
@@ -313,10 +593,10 @@ def test_store_and_retrieve_style_memory():
 
     class DummyCollection:
         def __init__(self):
-            self.add_called = False
+            self.upsert_called = False
 
-        def add(self, documents, ids, metadatas):
-            self.add_called = True
+        def upsert(self, documents, ids, metadatas):
+            self.upsert_called = True
 
         def query(self, query_texts, n_results):
             return {"documents": [["one", "two"]]}
@@ -324,16 +604,121 @@ def test_store_and_retrieve_style_memory():
     class DummyChroma:
         def __init__(self):
             self.collection = DummyCollection()
+            self.lookups = []
 
         def get_or_create_collection(self, name):
+            self.lookups.append(name)
             return self.collection
 
     service.chroma_client = DummyChroma()
+    service._collections = {}
 
     service.store_style_memory("proj", "chap", "text", "summary")
     results = service.retrieve_style_memory("proj", "query", top_k=2)
 
     assert results == ["one", "two"]
+    assert service.chroma_client.lookups == [f"{settings.CHROMA_COLLECTION_PREFIX}-proj"]
+
+
+def test_style_memory_roundtrips_fp16_embeddings():
+    service = MemoryService.__new__(MemoryService)
+
+    class DummyCollection:
+        def __init__(self):
+            self.documents = []
+            self.metadatas = []
+
+        def upsert(self, documents, ids, metadatas):
+            self.documents.extend(documents)
+            self.metadatas.extend(metadatas)
+
+        def query(self, query_texts, n_results, include=None):
+            return {"documents": [self.documents], "metadatas": [self.metadatas]}
+
+    class DummyChroma:
+        def __init__(self):
+            self.collection = DummyCollection()
+
+        def get_or_create_collection(self, name):
+            return self.collection
+
+    service.chroma_client = DummyChroma()
+    service._collections = {}
+    vectors = np.array([[0.6, 0.8], [1.0, 0.0]], dtype=np.float32)
+
+    for i, vector in enumerate(vectors):
+        service.store_style_memory(
+            "proj", f"d{i}", f"text {i}", None,
+            metadata={"type": "dialogue"}, embedding=vector,
+        )
+    documents, embeddings = service.retrieve_style_embeddings("proj", "query")
+
+    assert documents == ["text 0", "text 1"]
+    assert embeddings.dtype == np.float16
+    assert np.allclose(embeddings, vectors, atol=1e-3)
+    assert service.chroma_client.collection.metadatas[0]["type"] == "dialogue"
+
+
+def test_store_style_memory_batch_upserts_once():
+    service = MemoryService.__new__(MemoryService)
+    upserts = []
+
+    class DummyCollection:
+        def upsert(self, documents, ids, metadatas):
+            upserts.append((documents, ids, metadatas))
+
+    class DummyChroma:
+        def get_or_create_collection(self, name):
+            return DummyCollection()
+
+    service.chroma_client = DummyChroma()
+    service._collections = {}
+
+    service.store_style_memory_batch(
+        "proj",
+        [
+            {"chapter_id": "c1", "chapter_text": "un", "summary": "s1"},
+            {"chapter_id": "c2", "chapter_text": "deux", "summary": None, "metadata": {"type": "dialogue"}},
+        ],
+    )
+    service.store_style_memory_batch("proj", [])
+
+    assert len(upserts) == 1
+    documents, ids, metadatas = upserts[0]
+    assert documents == ["un", "deux"]
+    assert ids == ["c1", "c2"]
+    assert metadatas[0] == {"summary": "s1", "project_id": "proj"}
+    assert metadatas[1]["type"] == "dialogue"
+
+
+def test_retrieve_style_embeddings_batch_queries_once():
+    service = MemoryService.__new__(MemoryService)
+
+    class DummyCollection:
+        def __init__(self):
+            self.calls = []
+
+        def query(self, query_texts, n_results, include=None):
+            self.calls.append(list(query_texts))
+            return {
+                "documents": [[f"{text} 1"] for text in query_texts],
+                "metadatas": [[{}] for _ in query_texts],
+            }
+
+    class DummyChroma:
+        def __init__(self):
+            self.collection = DummyCollection()
+
+        def get_or_create_collection(self, name):
+            return self.collection
+
+    service.chroma_client = DummyChroma()
+    service._collections = {}
+
+    results = service.retrieve_style_embeddings_batch("proj", ["a", "b"], top_k=1)
+
+    assert results == [(["a 1"], None), (["b 1"], None)]
+    assert service.chroma_client.collection.calls == [["a", "b"]]
 
 
 def test_build_extraction_prompt_and_merge_summary():
@@ -347,3 +732,274 @@ def test_build_extraction_prompt_and_merge_summary():
 
     merged = service._merge_summary("A", "B")
     assert merged == "A / B"
+
+
+def test_check_object_availability_caches_node_until_graph_write(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+    service.neo4j_driver = object()
+    memory_service_module._NEO4J_CACHE.clear()
+    fetches = []
+
+    def fake_fetch(query, params, key):
+        fetches.append(params)
+        return {"status": "destroyed"}
+
+    monkeypatch.setattr(service, "_fetch_graph_node", fake_fetch)
+
+    first = service.check_object_availability("Axe", 3, project_id="p-cache")
+    second = service.check_object_availability("Axe", 4, project_id="p-cache")
+    assert first["available"] is False and second["available"] is False
+    assert len(fetches) == 1
+
+    # A graph write for the project bumps its version and misses the cache
+    memory_service_module._GRAPH_VERSIONS["p-cache"] = (
+        memory_service_module._GRAPH_VERSIONS.get("p-cache", 0) + 1
+    )
+    service.check_object_availability("Axe", 5, project_id="p-cache")
+    assert len(fetches) == 2
+
+
+def test_object_availability_reports_unresolved_loss():
+    service = MemoryService.__new__(MemoryService)
+    obj = {
+        "status": "possessed",
+        "status_history": [
+            {"status": "lost", "chapter": 2},
+            {"status": "found", "chapter": 4},
+            {"status": "lost", "chapter": 6},
+        ],
+    }
+
+    assert service._object_availability(obj, "Ring", 3)["status"] == "lost"
+    assert service._object_availability(obj, "Ring", 5)["available"] is True
+    late = service._object_availability(obj, "Ring", 8)
+    assert late["available"] is False
+    assert "chapitre 6" in late["issue"]
+
+
+def test_preload_fills_node_cache_for_checks(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+    memory_service_module._NEO4J_CACHE.clear()
+    queries = []
+
+    class DummyDriver:
+        def execute_query(self, query, params, database_=None, routing_=None):
+            queries.append((query, params))
+            if "Object" in query:
+                records = [{"name": "Sword", "o": {"status": "destroyed"}}]
+            else:
+                records = [{"name": "Lena", "c": {"current_location": "Dock"}}]
+            return SimpleNamespace(records=records)
+
+    service.neo4j_driver = DummyDriver()
+    service.preload("p-pre", ["Sword", "Map", "Sword"], ["Lena"])
+
+    assert len(queries) == 2
+    assert queries[0][1] == {"names": ["Sword", "Map"], "project_id": "p-pre"}
+
+    def fail_fetch(*args):
+        raise AssertionError("check should be served from the preload cache")
+
+    monkeypatch.setattr(service, "_fetch_graph_node", fail_fetch)
+    assert service.check_object_availability("Sword", 2, project_id="p-pre")["available"] is False
+    assert service.check_object_availability("Map", 2, project_id="p-pre")["status"] == "unknown"
+    location = service.check_character_location_consistency("Lena", "Dock", 2, project_id="p-pre")
+    assert location["consistent"] is True
+
+    service.preload("p-pre", ["Sword"], ["Lena"])
+    assert len(queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_runs_chunks_concurrently_in_order(monkeypatch):
+    service = MemoryService.__new__(MemoryService)
+    monkeypatch.setattr(memory_service_module, "_get_token_encoding", lambda: None)
+    started = []
+
+    async def fake_chunk(chunk):
+        started.append(chunk[0])
+        # The head finishes last; the merge must still keep text order
+        await asyncio.sleep(0.01 if chunk[0] == "H" else 0)
+        return {"summary": chunk[0], "events": [{"name": chunk[0]}]}
+
+    monkeypatch.setattr(service, "_extract_facts_chunk", fake_chunk)
+    text = "H" + "x" * 30000
+
+    facts = await service.extract_facts(text)
+
+    assert started == ["H", "x"]
+    assert [event["name"] for event in facts["events"]] == ["H", "x"]
+
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_chunk_reuses_response_for_identical_text():
+    memory_service_module._EXTRACTION_CACHE.clear()
+    calls = []
+
+    class DummyClient:
+        async def chat(self, **kwargs):
+            calls.append(kwargs)
+            return '{"summary": "s", "events": [{"name": "E"}]}'
+
+    service = MemoryService.__new__(MemoryService)
+    service.llm_client = DummyClient()
+
+    first = await service._extract_facts_chunk("Chapitre identique")
+    first["events"][0]["name"] = "mutated"
+    second = await service._extract_facts_chunk("Chapitre identique")
+
+    assert len(calls) == 1
+    assert second["events"][0]["name"] == "E"
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_chunk_does_not_cache_unparseable_reply():
+    memory_service_module._EXTRACTION_CACHE.clear()
+    replies = ['{"summary": "tronque', '{"summary": "s", "events": [{"name": "E"}]}']
+
+    class DummyClient:
+        async def chat(self, **kwargs):
+            return replies.pop(0)
+
+    service = MemoryService.__new__(MemoryService)
+    service.llm_client = DummyClient()
+
+    first = await service._extract_facts_chunk("Chapitre retente")
+    second = await service._extract_facts_chunk("Chapitre retente")
+
+    assert first == service._empty_facts()
+    assert second["events"] == [{"name": "E"}]
+    assert replies == []
+
+
+def test_ensure_neo4j_schema_runs_once_per_driver():
+    statements = []
+    writes = []
+
+    class DummyTx:
+        def run(self, query, **params):
+            statements.append(query)
+
+    class DummySession:
+        def execute_write(self, func):
+            writes.append(func)
+            return func(DummyTx())
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    class DummyDriver:
+        def session(self, database=None):
+            return DummySession()
+
+    driver = DummyDriver()
+    for _ in range(2):
+        service = MemoryService.__new__(MemoryService)
+        service.neo4j_driver = driver
+        service._ensure_neo4j_schema()
+
+    assert len(writes) == 1
+    assert statements == list(memory_service_module._NEO4J_SCHEMA_STATEMENTS)
+
+
+def test_location_consistency_uses_earliest_travel_entry():
+    service = MemoryService.__new__(MemoryService)
+    char = {
+        "current_location": "Dock",
+        "location_updated_chapter": 0,
+        "location_history": [
+            {"travel_to": "Castle", "chapter": 7},
+            {"travel_to": "castle", "chapter": 4},
+        ],
+    }
+
+    early = service._location_consistency(char, "Lena", "Castle", 3)
+    reached = service._location_consistency(char, "Lena", "CASTLE", 5)
+
+    assert early["consistent"] is False
+    assert reached["consistent"] is True
+    assert char["_travel_chapters"] == {"castle": 4}
+
+
+@pytest.mark.asyncio
+async def test_async_graph_client_is_shared_per_loop_for_settings_driver(monkeypatch):
+    created = []
+
+    class DummyAsyncClient:
+        def __init__(self, uri, user, password, database=None):
+            created.append(uri)
+
+        async def close(self):
+            return None
+
+    monkeypatch.setattr(memory_service_module, "AsyncNeo4jClient", DummyAsyncClient)
+    monkeypatch.setattr(settings, "NEO4J_URI", "bolt://graph:7687")
+    monkeypatch.setattr(settings, "NEO4J_USER", "neo4j")
+    monkeypatch.setattr(settings, "NEO4J_PASSWORD", "secret")
+
+    owned = MemoryService.__new__(MemoryService)
+    owned.neo4j_driver = object()
+    owned.neo4j_async_client = None
+    owned._graph_client_from_settings = True
+    injected = MemoryService.__new__(MemoryService)
+    injected.neo4j_driver = object()
+    injected.neo4j_async_client = None
+    injected._graph_client_from_settings = False
+
+    first = owned._async_graph_client()
+    assert owned._async_graph_client() is first
+    assert injected._async_graph_client() is None
+    assert created == ["bolt://graph:7687"]
+
+    await memory_service_module.close_graph_clients()
+
+
+def test_detect_character_contradictions_batch_uses_one_query():
+    service = MemoryService.__new__(MemoryService)
+    memory_service_module._NEO4J_CACHE.clear()
+    queries = []
+
+    class DummyDriver:
+        def execute_query(self, query, params, database_=None, routing_=None):
+            queries.append((query, params))
+            issue = {"character": "Lena", "contradiction": "resurrection", "from_chapter": 2}
+            return SimpleNamespace(records=[{"issue": issue}])
+
+    service.neo4j_driver = DummyDriver()
+
+    result = service.detect_character_contradictions_batch(["Lena", "Mark"], project_id="p-batch")
+
+    assert len(queries) == 1
+    assert queries[0][1] == {"names": ["Lena", "Mark"], "project_id": "p-batch"}
+    assert result["Lena"][0]["from_chapter"] == 2
+    assert result["Mark"] == []
+    assert service.detect_character_contradictions("Mark", project_id="p-batch") == []
+    assert len(queries) == 1
+
+
+def test_export_graph_for_visualization_uses_one_query():
+    service = MemoryService.__new__(MemoryService)
+    queries = []
+
+    class DummyDriver:
+        def execute_query(self, query, params, database_=None, routing_=None):
+            queries.append(params)
+            graph = {
+                "nodes": [{"id": 1, "labels": ["Character"], "props": {"name": "Lena"}}],
+                "edges": [{"source": 1, "target": 2, "type": "RELATION", "props": {}}],
+            }
+            return SimpleNamespace(records=[graph])
+
+    service.neo4j_driver = DummyDriver()
+
+    graph = service.export_graph_for_visualization("p1")
+
+    assert queries == [{"project_id": "p1", "limit": 500}]
+    assert graph["nodes"] == [
+        {"id": "1", "label": "Lena", "type": "Character", "properties": {"name": "Lena"}}
+    ]
+    assert graph["edges"][0]["target"] == "2"
@@ -103,6 +103,36 @@ async def test_generate_concept_sets_description(monkeypatch):
     assert db.refreshes == 1
 
 
+
+@pytest.mark.asyncio
+async def test_generate_concept_preview_picks_first_unused_title(monkeypatch):
+    class SequenceLLM:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def chat(self, *args, **kwargs) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                return '{"title": "Deja Vu"}'
+            if self.calls == 2:
+                raise RuntimeError("boom")
+            return '{"title": "Nouveau"}'
+
+    service = NovellaForgeService(DummyDB())
+    service.llm_client = SequenceLLM()
+
+    async def fake_recent_titles(user_id, genre, limit=8):
+        return ["deja vu"]
+
+    monkeypatch.setattr(service, "_get_recent_titles", fake_recent_titles)
+
+    concept = await service.generate_concept_preview("romance", user_id=uuid4())
+
+    assert service.llm_client.calls == 3
+    assert concept["title"] == "Nouveau"
+    assert concept["tropes"]
+
+
 @pytest.mark.asyncio
 async def test_generate_plan_normalizes_fallback(monkeypatch):
     project_id = uuid4()
@@ -0,0 +1,408 @@
+import numpy as np
+import pytest
+
+from app.services.coherence import _embedder, _similarity
+from app.services.coherence._embedder import encode_cached, encode_sorted
+from app.services.coherence._similarity import cosine_similarity_matrix, thresholded_similarity_matrix
+from app.services.coherence.semantic_validator import SemanticValidator
+from app.services.coherence.voice_analyzer import VoiceConsistencyAnalyzer
+
+
+class DummyModel:
+    """Deterministic bag-of-letters encoder standing in for a sentence transformer."""
+
+    def encode(self, texts, **kwargs):
+        vectors = np.array(
+            [[text.lower().count(letter) + 0.01 for letter in "aeiourstnlm"] for text in texts],
+            dtype=np.float32,
+        )
+        if kwargs.get("normalize_embeddings"):
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+def _validator() -> SemanticValidator:
+    validator = SemanticValidator.__new__(SemanticValidator)
+    validator.model = DummyModel()
+    validator.model_name = "dummy"
+    validator.enabled = True
+    return validator
+
+
+def test_cosine_similarity_matrix_matches_numpy():
+    left = np.array([[1.0, 0.0], [1.0, 1.0]], dtype=np.float32)
+    right = np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 3.0]], dtype=np.float32)
+
+    sims = cosine_similarity_matrix(left, right)
+
+    assert sims.shape == (2, 3)
+    assert sims[0, 0] == pytest.approx(1.0, abs=1e-5)
+    assert sims[0, 1] == pytest.approx(0.0, abs=1e-5)
+    assert sims[1, 2] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_cosine_similarity_matrix_numpy_fallback(monkeypatch):
+    monkeypatch.setattr(_similarity, "SIMSIMD_AVAILABLE", False)
+    left = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+    right = np.array([[4.0, 3.0], [0.0, 5.0]], dtype=np.float32)
+
+    sims = cosine_similarity_matrix(left, right)
+
+    assert sims[0] == pytest.approx([0.96, 0.8], abs=1e-6)
+    assert sims[1] == pytest.approx([0.0, 0.0])
+
+
+def test_cosine_similarity_matrix_normalized_inputs_use_dot_product():
+    left = np.array([[0.6, 0.8]], dtype=np.float32)
+    right = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+    sims = cosine_similarity_matrix(left, right, normalized=True)
+
+    assert sims[0] == pytest.approx([0.6, 0.8], abs=1e-6)
+
+
+def test_thresholded_similarity_matrix_is_exact_above_threshold(monkeypatch):
+    monkeypatch.setattr(_similarity, "_INT8_MIN_PAIRS", 0)
+    rng = np.random.default_rng(0)
+    left = rng.normal(size=(20, 64)).astype(np.float32)
+    right = np.vstack([left[:5] + 0.05 * rng.normal(size=(5, 64)), rng.normal(size=(30, 64))])
+    left /= np.linalg.norm(left, axis=1, keepdims=True)
+    right = (right / np.linalg.norm(right, axis=1, keepdims=True)).astype(np.float32)
+
+    exact = left @ right.T
+    sims = thresholded_similarity_matrix(left, right, 0.8)
+
+    above = exact >= 0.8
+    assert above.any()
+    assert np.array_equal(sims >= 0.8, above)
+    assert np.allclose(sims[above], exact[above], atol=1e-6)
+
+
+def test_encode_sorted_restores_input_order():
+    class RecordingModel(DummyModel):
+        def encode(self, texts, **kwargs):
+            self.seen = list(texts)
+            return super().encode(texts, **kwargs)
+
+    model = RecordingModel()
+    texts = ["une phrase assez longue", "court", "moyenne phrase"]
+
+    embeddings = encode_sorted(model, texts)
+
+    assert model.seen == ["court", "moyenne phrase", "une phrase assez longue"]
+    assert np.allclose(embeddings, DummyModel().encode(texts, normalize_embeddings=True))
+
+
+def test_encode_cached_only_encodes_unseen_texts():
+    class RecordingModel(DummyModel):
+        def encode(self, texts, **kwargs):
+            self.seen = list(texts)
+            return super().encode(texts, **kwargs)
+
+    model = RecordingModel()
+    encode_cached(model, ["Marie est morte", "Paul aime Marie"])
+
+    embeddings = encode_cached(model, ["Paul aime Marie", "La tour", "Paul aime Marie"])
+
+    assert model.seen == ["La tour"]
+    expected = DummyModel().encode(
+        ["Paul aime Marie", "La tour", "Paul aime Marie"], normalize_embeddings=True
+    )
+    assert np.allclose(embeddings, expected)
+
+
+def test_detect_contradictions_flags_pattern_pairs():
+    validator = _validator()
+
+    contradictions = validator.detect_contradictions(
+        new_facts=["Marie est vivante et aime Paul"],
+        established_facts=["Marie est morte et aime Paul", "La tour domine la ville"],
+        similarity_threshold=0.8,
+    )
+
+    assert len(contradictions) == 1
+    assert contradictions[0]["established_fact"] == "Marie est morte et aime Paul"
+    assert contradictions[0]["contradiction_type"] == "pattern_match"
+    assert contradictions[0]["pattern"] == ("vivant", "mort")
+
+
+def test_detect_contradictions_orders_matches_by_similarity():
+    validator = _validator()
+
+    contradictions = validator.detect_contradictions(
+        new_facts=["Marie est vivante"],
+        established_facts=["Le vieux roi est mort hier soir", "Marie est morte"],
+        similarity_threshold=0.0,
+    )
+
+    scores = [item["similarity_score"] for item in contradictions]
+    assert [item["established_fact"] for item in contradictions][0] == "Marie est morte"
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_detect_contradictions_skips_encoding_disjoint_facts():
+    class CountingModel(DummyModel):
+        calls = 0
+
+        def encode(self, texts, **kwargs):
+            CountingModel.calls += 1
+            return super().encode(texts, **kwargs)
+
+    validator = _validator()
+    validator.model = CountingModel()
+
+    contradictions = validator.detect_contradictions(
+        new_facts=["Marie traverse la forêt"],
+        established_facts=["Paul garde la tour"],
+        similarity_threshold=0.0,
+    )
+
+    assert contradictions == []
+    assert CountingModel.calls == 0
+
+
+def test_detect_contradictions_without_overlap_returns_empty():
+    validator = _validator()
+
+    assert validator.detect_contradictions(new_facts=[], established_facts=["x"]) == []
+
+
+@pytest.mark.asyncio
+async def test_voice_consistency_scores_dialogues():
+    class DummyMemory:
+        def retrieve_style_embeddings(self, project_id, query, top_k=5):
+            return ["Je reste ici, mon ami.", "Mon ami, reste ici avec moi."] * 3, None
+
+    analyzer = VoiceConsistencyAnalyzer.__new__(VoiceConsistencyAnalyzer)
+    analyzer.memory_service = DummyMemory()
+    analyzer.model = DummyModel()
+    analyzer.enabled = True
+    analyzer.threshold = 0.5
+    analyzer.min_dialogues = 3
+
+    result = await analyzer.analyze_voice_consistency(
+        character_name="Lena",
+        new_dialogues=["Je reste ici, mon ami."],
+        project_id="p1",
+    )
+
+    assert result["analysis_available"] is True
+    assert result["voice_consistency_score"] > 0.9
+    assert result["outlier_dialogues"] == []
+
+
+@pytest.mark.asyncio
+async def test_analyze_chapter_voices_encodes_chapter_once():
+    class CountingModel(DummyModel):
+        calls = 0
+
+        def encode(self, texts, **kwargs):
+            CountingModel.calls += 1
+            return super().encode(texts, **kwargs)
+
+    class DummyMemory:
+        queries = []
+
+        def retrieve_style_embeddings_batch(self, project_id, queries, top_k=5):
+            DummyMemory.queries.append(list(queries))
+            reference = ["Je reste ici, mon ami.", "Mon ami, reste ici avec moi.", "Reste donc ici."]
+            return [(reference, None) for _ in queries]
+
+    analyzer = VoiceConsistencyAnalyzer.__new__(VoiceConsistencyAnalyzer)
+    analyzer.memory_service = DummyMemory()
+    analyzer.model = CountingModel()
+    analyzer.enabled = True
+    analyzer.threshold = 0.5
+    analyzer.min_dialogues = 3
+
+    chapter = (
+        'Lena dit "Je reste ici, mon ami."\n'
+        + "La pluie tombait sans relache sur les toits de la vieille ville endormie. " * 2
+        + '\nMarc murmura "Nous partirons demain matin."'
+    )
+    results = await analyzer.analyze_chapter_voices(chapter, "p1", ["Lena", "Marc"])
+
+    assert set(results) == {"Lena", "Marc"}
+    assert all(result["analysis_available"] for result in results.values())
+    assert CountingModel.calls == 1
+    assert DummyMemory.queries == [["dialogues de Lena", "dialogues de Marc"]]
+
+
+@pytest.mark.asyncio
+async def test_voice_consistency_reuses_stored_fp16_embeddings():
+    references = ["Je reste ici, mon ami.", "Mon ami, reste ici avec moi.", "Reste donc ici."]
+    stored = DummyModel().encode(references, normalize_embeddings=True).astype(np.float16)
+
+    class RecordingModel(DummyModel):
+        def encode(self, texts, **kwargs):
+            self.seen = list(texts)
+            return super().encode(texts, **kwargs)
+
+    class DummyMemory:
+        def retrieve_style_embeddings(self, project_id, query, top_k=5):
+            return references, stored
+
+    analyzer = VoiceConsistencyAnalyzer.__new__(VoiceConsistencyAnalyzer)
+    analyzer.memory_service = DummyMemory()
+    analyzer.model = RecordingModel()
+    analyzer.enabled = True
+    analyzer.threshold = 0.5
+    analyzer.min_dialogues = 3
+
+    result = await analyzer.analyze_voice_consistency(
+        character_name="Lena",
+        new_dialogues=["Je reste ici, mon ami."],
+        project_id="p1",
+    )
+
+    assert analyzer.model.seen == ["Je reste ici, mon ami."]
+    assert result["voice_consistency_score"] > 0.9
+
+
+def test_contradiction_pattern_masks_match_substring_scan(monkeypatch):
+    import app.services.coherence.semantic_validator as module
+
+    validator = _validator()
+    patterns = [("vivant", "mort"), ("aime", "déteste"), ("possède", "a perdu")]
+    pairs = [
+        ("Marie déteste Paul", "Marie aime Paul"),
+        ("Il a perdu l'épée", "Il possède l'épée"),
+        ("Jean est mort", "Jean est mort"),
+        ("Le roi est vivant", "Le roi aime la reine"),
+    ]
+    expected = [(True, ("aime", "déteste")), (True, ("possède", "a perdu")), (False, None), (False, None)]
+
+    for available in {module.AHOCORASICK_AVAILABLE, False}:
+        monkeypatch.setattr(module, "AHOCORASICK_AVAILABLE", available)
+        results = [validator._check_contradiction_patterns(a, b, patterns) for a, b in pairs]
+        assert results == expected
+
+
+def test_extract_dialogues_returns_parallel_sequences():
+    analyzer = VoiceConsistencyAnalyzer.__new__(VoiceConsistencyAnalyzer)
+    text = 'Lena dit "Je reste ici." Puis, plus loin, « Nous verrons bien. »'
+
+    dialogues, speakers, positions = analyzer.extract_dialogues(text)
+
+    assert dialogues == ["Je reste ici.", "Nous verrons bien."]
+    assert speakers == ["Lena", "Lena"]
+    assert positions.tolist() == [text.index('"'), text.index("«")]
+    assert analyzer.extract_dialogues(text, "Marc")[0] == []
+
+
+def test_onnx_encoder_mean_pools_and_normalizes():
+    from types import SimpleNamespace
+
+    from app.services.coherence._onnx_encoder import OnnxSentenceEncoder
+
+    class DummyTokenizer:
+        def __call__(self, texts, **kwargs):
+            mask = np.array([[1, 1, 0], [1, 1, 1]][:len(texts)])
+            return {"input_ids": mask, "attention_mask": mask}
+
+    class DummySession:
+        def __call__(self, input_ids, attention_mask):
+            hidden = np.array([[[1.0, 0.0], [3.0, 0.0], [9.0, 9.0]]] * len(input_ids))
+            return SimpleNamespace(last_hidden_state=hidden)
+
+    encoder = OnnxSentenceEncoder.__new__(OnnxSentenceEncoder)
+    encoder.tokenizer = DummyTokenizer()
+    encoder.model = DummySession()
+
+    raw = encoder.encode(["a", "b"])
+    unit = encoder.encode(["a", "b"], normalize_embeddings=True)
+
+    assert raw[0] == pytest.approx([2.0, 0.0])
+    assert raw[1] == pytest.approx([13.0 / 3, 3.0])
+    assert np.linalg.norm(unit, axis=1) == pytest.approx([1.0, 1.0])
+
+
+
+def test_encode_worker_loads_onnx_model_single_threaded(monkeypatch):
+    created = []
+
+    class DummyEncoder:
+        def __init__(self, model_name, cache_dir, intra_op_num_threads=None):
+            created.append(intra_op_num_threads)
+
+    monkeypatch.setattr(_embedder, "_SINGLE_THREADED", False)
+    monkeypatch.setattr(_embedder, "TORCH_AVAILABLE", False)
+    monkeypatch.setattr(_embedder, "ONNX_AVAILABLE", True)
+    monkeypatch.setattr(_embedder, "OnnxSentenceEncoder", DummyEncoder)
+    monkeypatch.setattr(_embedder.settings, "SEMANTIC_ONNX_ENABLED", True)
+
+    _embedder._load_model("model")
+    _embedder._init_encode_worker()
+    _embedder._load_model("model")
+
+    assert created == [None, 1]
+
+
+def test_onnx_export_moves_complete_model_into_place(monkeypatch, tmp_path):
+    from types import SimpleNamespace
+
+    from app.services.coherence import _onnx_encoder
+
+    fail = {"quantize": True}
+
+    class DummyQuantizer:
+        def quantize(self, save_dir, quantization_config):
+            if fail["quantize"]:
+                raise RuntimeError("crash mid-export")
+            (save_dir / _onnx_encoder._QUANTIZED_FILE).write_bytes(b"onnx")
+
+    class DummyTokenizer:
+        def save_pretrained(self, save_dir):
+            (save_dir / "tokenizer.json").write_text("{}")
+
+    fakes = {
+        "ORTModelForFeatureExtraction": SimpleNamespace(from_pretrained=lambda *a, **k: object()),
+        "ORTQuantizer": SimpleNamespace(from_pretrained=lambda exported: DummyQuantizer()),
+        "AutoQuantizationConfig": SimpleNamespace(avx512_vnni=lambda **k: None),
+        "AutoTokenizer": SimpleNamespace(from_pretrained=lambda model_id: DummyTokenizer()),
+    }
+    for name, fake in fakes.items():
+        monkeypatch.setattr(_onnx_encoder, name, fake, raising=False)
+    target = tmp_path / "model"
+
+    with pytest.raises(RuntimeError):
+        _onnx_encoder._export_quantized("org/model", target)
+    assert list(tmp_path.iterdir()) == []
+
+    fail["quantize"] = False
+    _onnx_encoder._export_quantized("org/model", target)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["model"]
+    assert (target / _onnx_encoder._QUANTIZED_FILE).exists()
+    assert (target / "tokenizer.json").exists()
+
+
+def test_analyze_dialogue_patterns_counts_long_words():
+    analyzer = VoiceConsistencyAnalyzer.__new__(VoiceConsistencyAnalyzer)
+
+    patterns = analyzer.analyze_dialogue_patterns(
+        ["Reste ici, mon ami !", "Pourquoi rester ici ?", "Reste, reste."]
+    )
+
+    assert patterns["total_dialogues"] == 3
+    assert patterns["avg_word_count"] == pytest.approx(11 / 3)
+    assert patterns["question_ratio"] == pytest.approx(1 / 3)
+    assert patterns["exclamation_ratio"] == pytest.approx(1 / 3)
+    assert patterns["characteristic_words"] == {"reste": 3, "pourquoi": 1, "rester": 1}
+
+
+def test_pattern_hit_matrix_supports_more_than_32_patterns():
+    validator = _validator()
+    patterns = [(f"x{i:03d}", f"y{i:03d}") for i in range(40)]
+
+    assert validator._check_contradiction_patterns("x039 et", "puis y039", patterns) == (
+        True, ("x039", "y039")
+    )
+    assert validator._check_contradiction_patterns("x039", "x039", patterns) == (False, None)
+
+
+def test_extract_facts_keeps_long_factual_sentences():
+    validator = _validator()
+    text = "Oui. Marie est vivante! Le vent souffle fort?  Ils partent toujours tôt.  Court."
+
+    assert validator.extract_facts(text) == ["Marie est vivante", "Ils partent toujours tôt"]
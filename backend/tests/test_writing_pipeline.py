@@ -70,7 +70,7 @@ async def test_validate_continuity_detects_contradictions():
     state = {
         "chapter_text": "Bob enters the room.",
         "project_context": {
-            "project": {"metadata": {"continuity": {"characters": [{"name": "Bob", "status": "dead"}]}}}
+            "project": {"continuity": {"characters": [{"name": "Bob", "status": "dead"}]}}
         },
         "memory_context": "Characters: Bob (dead).",
         "retrieved_chunks": [],
@@ -143,14 +143,17 @@ async def test_validate_continuity_includes_graph_issues():
     class DummyMemoryService:
         neo4j_driver = True
 
-        def detect_character_contradictions(self, name, project_id=None):
-            return [
-                {
-                    "contradiction": "resurrection",
-                    "from_chapter": 10,
-                    "to_chapter": 12,
-                }
-            ]
+        def detect_character_contradictions_batch(self, names, project_id=None):
+            return {
+                name: [
+                    {
+                        "contradiction": "resurrection",
+                        "from_chapter": 10,
+                        "to_chapter": 12,
+                    }
+                ]
+                for name in names
+            }
 
         def find_orphaned_plot_threads(self, chapter_index, project_id=None):
             return [{"event": "Mystere", "last_mentioned": 1}]
@@ -378,16 +381,11 @@ async def test_approve_chapter_updates_rag(monkeypatch):
             metadata["continuity"] = {"updated_at": "now"}
             return metadata
 
-        def update_neo4j(self, facts, project_id=None, chapter_index=None):
-            return None
-
-        def store_style_memory(self, project_id, chapter_id, chapter_text, summary):
+        async def persist_facts(
+            self, facts, project_id, chapter_id, chapter_text, summary, chapter_index=None
+        ):
             return None
 
-    class DummyContextService:
-        async def build_project_context(self, project_id, user_id):
-            return {"project": {"metadata": {}}}
-
     class DummyRagService:
         def __init__(self):
             self.calls = []
@@ -403,13 +401,17 @@ async def test_approve_chapter_updates_rag(monkeypatch):
     pipeline = WritingPipeline.__new__(WritingPipeline)
     pipeline.db = SimpleNamespace()
     pipeline.memory_service = DummyMemoryService()
-    pipeline.context_service = DummyContextService()
     pipeline.rag_service = DummyRagService()
+    updates = []
+
+    async def fake_metadata(project_id):
+        return {"chapter_word_range": {"min": 1500, "max": 1800}}
 
-    async def noop_update(project_id, metadata):
-        return None
+    async def record_update(project_id, metadata):
+        updates.append(metadata)
 
-    pipeline._update_project_metadata = noop_update
+    pipeline._get_project_metadata = fake_metadata
+    pipeline._update_project_metadata = record_update
 
     monkeypatch.setattr(writing_pipeline, "DocumentService", DummyDocumentService)
 
@@ -423,6 +425,8 @@ async def test_approve_chapter_updates_rag(monkeypatch):
     assert call_type == "update"
     assert project_id == doc.project_id
     assert document == doc
+    assert updates[0]["chapter_word_range"] == {"min": 1500, "max": 1800}
+    assert updates[0]["recent_chapter_summaries"] == ["Alice avance."]
 
 
 @pytest.mark.asyncio